@@ -0,0 +1,193 @@
+import click
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from benchmarks.stage_benchmarks import BENCHMARKS
+
+
+def _git(*args):
+    try:
+        return subprocess.run(
+            ["git", *args], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _environment() -> dict:
+    import matplotlib
+    import numpy as np
+    import pandas as pd
+    import sklearn
+
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "versions": {
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "scikit-learn": sklearn.__version__,
+            "matplotlib": matplotlib.__version__,
+        },
+    }
+
+
+def measure(benchmark, n, repeat=3) -> dict:
+    """
+    Time a benchmark at one size and measure its peak traced memory.
+
+    The setup runs once, outside the timed region, in a temporary
+    directory. The benchmark is then timed ``repeat`` times; the minimum
+    is the most stable estimate, as the first run also pays for imports.
+    A last run under ``tracemalloc`` gives the peak memory allocated by
+    Python and NumPy during the call.
+    """
+    from src.profile_utils import enable_profiling, finish_profiling
+    from src.profile_utils import timer, trace_spans
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        inputs = benchmark.setup(n, work_dir)
+        times = []
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(
+            devnull
+        ), warnings.catch_warnings():
+            # Stage output and figure layout warnings would drown the results
+            warnings.simplefilter("ignore")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                benchmark.run(*inputs)
+                times.append(time.perf_counter() - start)
+
+            enable_profiling(capture=("memory",))
+            try:
+                with timer("benchmark"):
+                    benchmark.run(*inputs)
+                (span,) = [s for s in trace_spans() if s["name"] == "benchmark"]
+            finally:
+                finish_profiling()
+
+    return {
+        "benchmark": benchmark.name,
+        "n": n,
+        "repeat": repeat,
+        "time_min": min(times),
+        "time_median": statistics.median(times),
+        "peak_memory": span["args"]["memory_peak"],
+    }
+
+
+@click.group()
+def cli():
+    """Benchmark the pipeline stages on synthetic data and compare runs."""
+
+
+@cli.command()
+@click.option(
+    "--bench",
+    "names",
+    type=click.Choice(sorted(BENCHMARKS)),
+    multiple=True,
+    help="Benchmark to run; repeat the option for several (default: all)",
+)
+@click.option(
+    "--sizes",
+    type=int,
+    multiple=True,
+    help="Data sizes in rows to run instead of the defaults, e.g. --sizes 100000000",
+)
+@click.option("--repeat", default=3, show_default=True, help="Timed runs per size")
+@click.option(
+    "--output-dir",
+    default="benchmarks/results",
+    show_default=True,
+    help="Directory of the results file",
+)
+def run(names, sizes, repeat, output_dir):
+    """Run benchmarks and save the results as JSON."""
+    import pandas as pd
+
+    results = []
+    for name in names or sorted(BENCHMARKS):
+        benchmark = BENCHMARKS[name]
+        # Table benchmarks keep their own sizes
+        use_sizes = sizes if sizes and benchmark.unit == "rows" else benchmark.sizes
+        for n in use_sizes:
+            if benchmark.max_size is not None and n > benchmark.max_size:
+                # The in-memory stages cannot hold the larger sizes; the
+                # *_chunked benchmarks time the streaming paths instead
+                print(
+                    f"{name:<24} n={n:<11,} skipped, holds the data in memory "
+                    f"(at most {benchmark.max_size:,} rows)"
+                )
+                continue
+            result = measure(benchmark, n, repeat)
+            print(
+                f"{name:<24} n={n:<11,} {result['time_min']:9.3f} s "
+                f"{result['peak_memory'] / 2**20:10.1f} MiB"
+            )
+            results.append(result)
+
+    env = _environment()
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = env["timestamp"].replace(":", "")
+    path = os.path.join(output_dir, f"{stamp}_{(env['commit'] or 'nogit')[:8]}.json")
+    with open(path, "w") as f:
+        json.dump(dict(env, results=results), f, indent=2)
+    print(f"Results saved to '{path}'")
+    print(pd.DataFrame(results).to_string(index=False))
+
+
+@cli.command()
+@click.argument("baseline", type=click.Path(exists=True))
+@click.argument("contender", type=click.Path(exists=True))
+@click.option(
+    "--threshold",
+    default=0.2,
+    show_default=True,
+    help="Relative slowdown or memory growth reported as a regression",
+)
+def compare(baseline, contender, threshold):
+    """Compare two results files, e.g. from two commits."""
+    import pandas as pd
+
+    def load(path):
+        with open(path) as f:
+            payload = json.load(f)
+        df = pd.DataFrame(payload["results"]).set_index(["benchmark", "n"])
+        return payload, df[["time_min", "peak_memory"]]
+
+    old_env, old = load(baseline)
+    new_env, new = load(contender)
+    table = old.join(new, lsuffix="_old", rsuffix="_new", how="inner")
+    table["time_ratio"] = table["time_min_new"] / table["time_min_old"]
+    table["memory_ratio"] = table["peak_memory_new"] / table["peak_memory_old"]
+    regressed = (table["time_ratio"] > 1 + threshold) | (
+        table["memory_ratio"] > 1 + threshold
+    )
+    table["status"] = regressed.map({True: "REGRESSION", False: "ok"})
+
+    print(f"{old_env['commit']} -> {new_env['commit']}")
+    print(table.round(3).to_string())
+    if regressed.any():
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,205 @@
+"""
+Benchmarks of the pipeline stages on synthetic data.
+
+Each benchmark has a ``setup(n, work_dir)`` that prepares its inputs for
+size ``n`` outside of the timed region, and a ``run(*inputs)`` that is
+timed. Sizes are in the benchmark's ``unit``: rows of raw data, except
+for ``save_df_as_png`` where they are rows of the rendered table.
+
+The in-memory benchmarks hold the whole DataFrame and stop at
+``MAX_IN_MEMORY_ROWS``. The ``*_chunked`` benchmarks write the raw data to
+disk once in their setup and time the streaming paths the pipeline uses
+on large files, so they scale to 10^8 rows and more.
+"""
+
+import os
+from collections import namedtuple
+
+Benchmark = namedtuple(
+    "Benchmark", ["name", "setup", "run", "sizes", "unit", "max_size"]
+)
+Benchmark.__new__.__defaults__ = (None,)
+
+DATA_SIZES = (10_000, 100_000, 1_000_000)
+
+# Largest size of the benchmarks that hold the whole data in memory
+MAX_IN_MEMORY_ROWS = 10_000_000
+
+# Rows per chunk of the streaming benchmarks
+STREAM_CHUNKSIZE = 100_000
+
+
+def _clean_frame(n):
+    from src.clean_utils import clean_sleep_data
+    from src.synth_utils import generate_sleep_data
+
+    return clean_sleep_data(generate_sleep_data(n))
+
+
+def _raw_file(n, work_dir):
+    from src.synth_utils import write_sleep_data
+
+    source = os.path.join(work_dir, "raw.csv")
+    write_sleep_data(source, n)
+    return source
+
+
+def setup_download_csv(n, work_dir):
+    from src.synth_utils import write_sleep_data
+
+    source = os.path.join(work_dir, "raw.csv")
+    write_sleep_data(source, n)
+    return source, os.path.join(work_dir, "copy.csv")
+
+
+def run_download_csv(source, dest):
+    from src.download_utils import download_csv
+
+    download_csv(source, dest)
+
+
+def setup_clean_sleep_data(n, work_dir):
+    from src.synth_utils import generate_sleep_data
+
+    return (generate_sleep_data(n),)
+
+
+def run_clean_sleep_data(df):
+    from src.clean_utils import clean_sleep_data
+
+    clean_sleep_data(df)
+
+
+def setup_clean_sleep_data_chunked(n, work_dir):
+    return _raw_file(n, work_dir), os.path.join(work_dir, "clean.csv")
+
+
+def run_clean_sleep_data_chunked(source, dest):
+    from src.clean_utils import clean_sleep_data_chunked
+
+    clean_sleep_data_chunked(source, dest, chunksize=STREAM_CHUNKSIZE)
+
+
+def setup_perform_eda_chunked(n, work_dir):
+    from src.clean_utils import clean_sleep_data_chunked
+
+    clean_path = os.path.join(work_dir, "clean.csv")
+    clean_sleep_data_chunked(_raw_file(n, work_dir), clean_path)
+    return clean_path, os.path.join(work_dir, "eda")
+
+
+def run_perform_eda_chunked(clean_path, output_dir):
+    from src.eda_utils import perform_eda
+
+    perform_eda(clean_path, output_dir, chunksize=STREAM_CHUNKSIZE)
+
+
+def setup_build_feature_matrix(n, work_dir):
+    return (_raw_file(n, work_dir),)
+
+
+def run_build_feature_matrix(source):
+    from src.feature_utils import build_feature_matrix
+
+    build_feature_matrix(source, chunksize=STREAM_CHUNKSIZE)
+
+
+def setup_perform_eda(n, work_dir):
+    return _clean_frame(n), os.path.join(work_dir, "eda")
+
+
+def run_perform_eda(clean_df, output_dir):
+    from src.eda_utils import perform_eda
+
+    perform_eda(clean_df, output_dir)
+
+
+def setup_run_model(n, work_dir):
+    from src.pipeline_utils import split_model_data
+
+    train_df, test_df = split_model_data(_clean_frame(n))
+    return train_df, test_df, os.path.join(work_dir, "model", "model_analysis")
+
+
+def run_run_model(train_df, test_df, output_prefix):
+    from src.model_utils import run_model_analysis
+    from src.render_utils import render_figures
+
+    render_figures(run_model_analysis(train_df, test_df, output_prefix))
+
+
+def setup_save_df_as_png(n, work_dir):
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(n, 6)), columns=list("abcdef")).round(4)
+    return df, os.path.join(work_dir, "table.png")
+
+
+def run_save_df_as_png(df, filename):
+    from src.model_utils import save_df_as_png
+
+    save_df_as_png(df, filename)
+
+
+BENCHMARKS = {
+    b.name: b
+    for b in [
+        Benchmark(
+            "download_csv", setup_download_csv, run_download_csv, DATA_SIZES, "rows"
+        ),
+        Benchmark(
+            "clean_sleep_data",
+            setup_clean_sleep_data,
+            run_clean_sleep_data,
+            DATA_SIZES,
+            "rows",
+            MAX_IN_MEMORY_ROWS,
+        ),
+        Benchmark(
+            "clean_sleep_data_chunked",
+            setup_clean_sleep_data_chunked,
+            run_clean_sleep_data_chunked,
+            DATA_SIZES,
+            "rows",
+        ),
+        Benchmark(
+            "perform_eda",
+            setup_perform_eda,
+            run_perform_eda,
+            DATA_SIZES,
+            "rows",
+            MAX_IN_MEMORY_ROWS,
+        ),
+        Benchmark(
+            "perform_eda_chunked",
+            setup_perform_eda_chunked,
+            run_perform_eda_chunked,
+            DATA_SIZES,
+            "rows",
+        ),
+        Benchmark(
+            "build_feature_matrix",
+            setup_build_feature_matrix,
+            run_build_feature_matrix,
+            DATA_SIZES,
+            "rows",
+        ),
+        Benchmark(
+            "run_model",
+            setup_run_model,
+            run_run_model,
+            DATA_SIZES,
+            "rows",
+            MAX_IN_MEMORY_ROWS,
+        ),
+        Benchmark(
+            "save_df_as_png",
+            setup_save_df_as_png,
+            run_save_df_as_png,
+            (5, 25, 100),
+            "table rows",
+        ),
+    ]
+}
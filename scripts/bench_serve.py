@@ -0,0 +1,115 @@
+import click
+import http.client
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.artifact_utils import load_model_artifact
+
+# Example request body, one record per request
+SAMPLE_RECORD = {
+    "sleep_duration": 6.5,
+    "sleep_quality": 6,
+    "sleep_disorder": "Insomnia",
+}
+
+
+def _worker(host, port, n_requests, latencies, errors):
+    body = json.dumps({"instances": [SAMPLE_RECORD]}).encode()
+    headers = {"Content-Type": "application/json"}
+    conn = http.client.HTTPConnection(host, port)
+    try:
+        for _ in range(n_requests):
+            start = time.perf_counter()
+            conn.request("POST", "/predict", body=body, headers=headers)
+            response = conn.getresponse()
+            payload = response.read()
+            if response.status != 200:
+                raise RuntimeError(f"HTTP {response.status}: {payload.decode()}")
+            latencies.append(time.perf_counter() - start)
+    except Exception as e:
+        # Threads drop their exceptions; keep them for the summary
+        errors.append(e)
+    finally:
+        conn.close()
+
+
+@click.command()
+@click.option(
+    "--url",
+    default=None,
+    help="Prediction server to load (default: start a local one from --model-file)",
+)
+@click.option(
+    "--model-file",
+    default="results/model_analysis_model.joblib",
+    help="Model artifact used when starting a local server",
+)
+@click.option("--requests", "n_requests", default=2000, show_default=True)
+@click.option("--concurrency", default=16, show_default=True)
+@click.option("--batch-window-ms", default=2.0, show_default=True)
+def main(url, model_file, n_requests, concurrency, batch_window_ms):
+    """Load-test the prediction server and report latency percentiles."""
+    import numpy as np
+
+    from src.serve_utils import LinearScorer, make_server
+
+    server = None
+    if url is None:
+        model, _ = load_model_artifact(model_file)
+        server = make_server(
+            LinearScorer.from_pipeline(model), port=0, max_latency_ms=batch_window_ms
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host, port = "127.0.0.1", server.server_port
+    else:
+        parsed = urlparse(url)
+        host, port = parsed.hostname, parsed.port or 80
+
+    # Spread the remainder so that exactly n_requests are sent
+    counts = [
+        n_requests // concurrency + (i < n_requests % concurrency)
+        for i in range(concurrency)
+    ]
+    latencies, errors = [], []
+    threads = [
+        threading.Thread(target=_worker, args=(host, port, n, latencies, errors))
+        for n in counts
+        if n > 0
+    ]
+    try:
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        if server is not None:
+            batches = server.batcher.batches
+            server.shutdown()
+            server.server_close()
+            server.batcher.close()
+
+    if errors:
+        print(f"Error: {len(errors)} of {len(threads)} workers failed: {errors[0]}")
+        sys.exit(1)
+
+    latencies_ms = np.array(latencies) * 1000
+    print(f"Requests:    {len(latencies)} ({len(threads)} concurrent)")
+    print(f"Throughput:  {len(latencies) / elapsed:,.0f} requests/s")
+    print(f"Latency p50: {np.percentile(latencies_ms, 50):.2f} ms")
+    print(f"Latency p99: {np.percentile(latencies_ms, 99):.2f} ms")
+    if server is not None:
+        print(f"Micro-batches: {batches}")
+
+
+if __name__ == "__main__":
+    main()
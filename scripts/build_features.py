@@ -0,0 +1,130 @@
+import click
+import os
+import sys
+
+# Add the project root to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from src.cache_utils import run_cached, source_files
+from src.profile_utils import CAPTURE_MODES, TRACE_FORMATS, profile_run
+
+
+@click.command()
+@click.option(
+    "--source",
+    default="data/raw/sleep_data_raw.csv",
+    help="The path to the raw data file",
+)
+@click.option(
+    "--dest",
+    default="data/processed/sleep_features.npz",
+    help="The path to save the sparse feature matrix (.npz)",
+)
+@click.option(
+    "--chunksize",
+    type=int,
+    default=100_000,
+    show_default=True,
+    help="Rows of the raw file read and encoded at a time",
+)
+@click.option(
+    "--split",
+    type=click.Choice(["random", "hash", "stratified", "group"]),
+    default="random",
+    help="Train/test assignment, as in clean_data.py",
+)
+@click.option(
+    "--group-column",
+    "group_columns",
+    multiple=True,
+    help="Raw column of the group split key; repeat for several "
+    "(default: all columns but Person ID)",
+)
+@click.option(
+    "--random-state", type=int, default=522, help="Random state for the split"
+)
+@click.option(
+    "--profile",
+    "profile_path",
+    default=None,
+    help="Write a timing trace of the run to this file (or set SLEEP_PROFILE)",
+)
+@click.option(
+    "--profile-format",
+    type=click.Choice(TRACE_FORMATS),
+    default=None,
+    help="Trace layout: a JSON list of spans, or chrome for chrome://tracing and Perfetto",
+)
+@click.option(
+    "--profile-capture",
+    type=click.Choice(CAPTURE_MODES),
+    multiple=True,
+    help="Also write a cProfile dump, or record tracemalloc memory per span",
+)
+@click.option(
+    "--no-cache", is_flag=True, help="Always recompute instead of using the stage cache"
+)
+def build_features(
+    source,
+    dest,
+    chunksize,
+    split,
+    group_columns,
+    random_state,
+    profile_path,
+    profile_format,
+    profile_capture,
+    no_cache,
+):
+    """
+    Parses every raw column (gender, occupation, BMI category, blood pressure,
+    heart rate, daily steps, ...) chunk by chunk into a sparse CSR feature
+    matrix with one-hot categories, and saves it with the target and the
+    'train' split for sparse_model.py.
+    """
+    group_columns = list(group_columns) or None
+    with profile_run(profile_path, profile_format, profile_capture):
+        run_cached(
+            "build-features",
+            lambda: _build(source, dest, chunksize, split, group_columns, random_state),
+            inputs=[source],
+            outputs=[dest],
+            params={
+                "dest": dest,
+                "split": split,
+                "group_columns": group_columns,
+                "random_state": random_state,
+            },
+            sources=source_files(__file__),
+            enabled=not no_cache,
+        )
+
+
+def _build(source, dest, chunksize, split, group_columns, random_state):
+    # Imported here so that --help and cache hits skip loading pandas and scipy
+    from src.feature_utils import build_feature_matrix, save_feature_matrix
+
+    try:
+        features = build_feature_matrix(
+            source,
+            split=split,
+            random_state=random_state,
+            chunksize=chunksize,
+            group_columns=group_columns,
+        )
+    except FileNotFoundError:
+        print(f"Error: The file '{source}' was not found.")
+        return
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+
+    save_feature_matrix(features, dest)
+    X = features["X"]
+    print(
+        f"Built a {X.shape[0]} x {X.shape[1]} sparse feature matrix "
+        f"({X.nnz} non-zeros) and saved it to '{dest}'"
+    )
+
+
+if __name__ == "__main__":
+    build_features()
@@ -1,11 +1,11 @@
-import pandas as pd
 import click
 import os
 import sys
 
 # Add the project root to sys.path
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
-from src.clean_utils import clean_sleep_data
+from src.cache_utils import run_cached, source_files
+from src.profile_utils import CAPTURE_MODES, TRACE_FORMATS, profile_run
 
 
 @click.command()
@@ -17,31 +17,154 @@ from src.clean_utils import clean_sleep_data
 @click.option(
     "--dest",
     default="data/processed/sleep_data_clean.csv",
-    help="The path to save the cleaned data file",
+    help="The path to save the cleaned data file (.csv, or .parquet for columnar output)",
 )
-def cleaning_preprocess(source, dest):
+@click.option(
+    "--chunksize",
+    type=int,
+    default=None,
+    help="Stream the raw file in chunks of this many rows instead of loading it whole",
+)
+@click.option(
+    "--split",
+    type=click.Choice(["random", "hash", "stratified", "group"]),
+    default="random",
+    help="Assign train/test with a global shuffle (random), a stable hash of person_id "
+    "(hash), a shuffle stratified on sleep_disorder (stratified), or a hash of each "
+    "row's profile so that identical profiles stay together (group)",
+)
+@click.option(
+    "--group-column",
+    "group_columns",
+    multiple=True,
+    help="Raw column of the group split key; repeat for several "
+    "(default: all columns but Person ID)",
+)
+@click.option(
+    "--random-state", type=int, default=522, help="Random state for the split"
+)
+@click.option(
+    "--memory-report",
+    "show_memory",
+    is_flag=True,
+    help="Print the memory usage of the cleaned data with default vs compact dtypes "
+    "(not with --chunksize)",
+)
+@click.option(
+    "--profile",
+    "profile_path",
+    default=None,
+    help="Write a timing trace of the run to this file (or set SLEEP_PROFILE)",
+)
+@click.option(
+    "--profile-format",
+    type=click.Choice(TRACE_FORMATS),
+    default=None,
+    help="Trace layout: a JSON list of spans, or chrome for chrome://tracing and Perfetto",
+)
+@click.option(
+    "--profile-capture",
+    type=click.Choice(CAPTURE_MODES),
+    multiple=True,
+    help="Also write a cProfile dump, or record tracemalloc memory per span",
+)
+@click.option(
+    "--no-cache", is_flag=True, help="Always recompute instead of using the stage cache"
+)
+def cleaning_preprocess(
+    source,
+    dest,
+    chunksize,
+    split,
+    group_columns,
+    random_state,
+    show_memory,
+    profile_path,
+    profile_format,
+    profile_capture,
+    no_cache,
+):
     """
     Reads data from the source path, processes it, adds a 'train' column indicating
     split (1 for train, 0 for test), and saves the result to the destination path.
     """
+    if show_memory and chunksize:
+        # Chunks are written out as they are cleaned, so there is no whole frame
+        raise click.UsageError("--memory-report cannot be combined with --chunksize")
+    group_columns = list(group_columns) or None
+    with profile_run(profile_path, profile_format, profile_capture):
+        run_cached(
+            "clean-data",
+            lambda: _clean(
+                source, dest, chunksize, split, group_columns, random_state, show_memory
+            ),
+            inputs=[source],
+            outputs=[dest],
+            params={
+                "dest": dest,
+                "split": split,
+                "group_columns": group_columns,
+                "random_state": random_state,
+            },
+            sources=source_files(__file__),
+            # The memory report is only printed when the stage actually runs
+            enabled=not (no_cache or show_memory),
+        )
+
+
+def _clean(source, dest, chunksize, split, group_columns, random_state, show_memory):
+    # Imported here so that --help and cache hits skip loading pandas
+    import pandas as pd
+
+    from src.clean_utils import clean_sleep_data, clean_sleep_data_chunked
+    from src.io_utils import write_clean_data
+    from src.profile_utils import timer
+    from src.schema_utils import memory_report
+
+    if chunksize:
+        try:
+            n_rows = clean_sleep_data_chunked(
+                source,
+                dest,
+                random_state=random_state,
+                chunksize=chunksize,
+                split=split,
+                group_columns=group_columns,
+            )
+        except FileNotFoundError:
+            print(f"Error: The file '{source}' was not found.")
+            return
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        print(
+            f"Successfully cleaned {n_rows} rows in chunks of {chunksize}, "
+            f"added split column, and saved to '{dest}'"
+        )
+        return
+
     try:
-        df = pd.read_csv(source)
+        with timer("read_csv", path=source):
+            df = pd.read_csv(source)
     except FileNotFoundError:
         print(f"Error: The file '{source}' was not found.")
         return
 
     try:
-        df_clean = clean_sleep_data(df)
+        df_clean = clean_sleep_data(
+            df, random_state=random_state, split=split, group_columns=group_columns
+        )
     except ValueError as e:
         print(f"Error: {e}")
         return
 
-    # Ensure destination directory exists
-    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    if show_memory:
+        print(memory_report(df_clean).to_string())
 
     try:
         # Save full cleaned data with split info
-        df_clean.to_csv(dest, index=False)
+        with timer("write_clean_data", path=dest):
+            write_clean_data(df_clean, dest)
         print(f"Successfully cleaned data, added split column, and saved to '{dest}'")
 
     except Exception as e:
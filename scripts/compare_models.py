@@ -0,0 +1,149 @@
+import click
+import sys
+from pathlib import Path
+import warnings
+
+warnings.filterwarnings("ignore")
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# Only light modules are imported here, so that --help and cache hits do not
+# pay for pandas or scikit-learn; _compare_stage imports the rest
+from src.cache_utils import run_cached, source_files
+from src.compare_utils import MODEL_NAMES
+from src.metrics_utils import METRICS_FORMATS
+from src.profile_utils import CAPTURE_MODES, TRACE_FORMATS, profile_run
+
+
+@click.command()
+@click.option(
+    "--input-file",
+    default="data/processed/sleep_data_clean.csv",
+    help="Path to the cleaned data file (.csv or .parquet)",
+)
+@click.option(
+    "--output-prefix",
+    default="results/model_comparison",
+    help="Prefix for output files (e.g. results/this_comparison)",
+)
+@click.option(
+    "--model",
+    "models",
+    multiple=True,
+    type=click.Choice(MODEL_NAMES),
+    default=MODEL_NAMES,
+    show_default=True,
+    help="Candidate model; repeat the option for several",
+)
+@click.option("--cv-folds", default=5, show_default=True, help="Number of CV folds")
+@click.option(
+    "--cv-repeats",
+    default=1,
+    show_default=True,
+    help="Number of repeats of the k-fold split (repeated k-fold when > 1)",
+)
+@click.option(
+    "--n-jobs",
+    default=-1,
+    show_default=True,
+    help="Number of processes fitting the model x fold jobs (-1 uses all cores)",
+)
+@click.option(
+    "--table-format",
+    multiple=True,
+    type=click.Choice(METRICS_FORMATS),
+    default=METRICS_FORMATS,
+    show_default=True,
+    help="Formats of the fold and leaderboard tables; repeat for several",
+)
+@click.option(
+    "--profile",
+    "profile_path",
+    default=None,
+    help="Write a timing trace of the run to this file (or set SLEEP_PROFILE)",
+)
+@click.option(
+    "--profile-format",
+    type=click.Choice(TRACE_FORMATS),
+    default=None,
+    help="Trace layout: a JSON list of spans, or chrome for chrome://tracing and Perfetto",
+)
+@click.option(
+    "--profile-capture",
+    type=click.Choice(CAPTURE_MODES),
+    multiple=True,
+    help="Also write a cProfile dump, or record tracemalloc memory per span",
+)
+@click.option(
+    "--no-cache", is_flag=True, help="Always recompute instead of using the stage cache"
+)
+def compare_models(
+    input_file,
+    output_prefix,
+    models,
+    cv_folds,
+    cv_repeats,
+    n_jobs,
+    table_format,
+    profile_path,
+    profile_format,
+    profile_capture,
+    no_cache,
+):
+    """
+    Compares candidate models on the training split:
+    1. Loads the training rows of the cleaned data.
+    2. Cross-validates every model on the same folds, fitting the
+       preprocessing once per fold.
+    3. Writes the per-fold scores and a leaderboard (CSV/JSON/Markdown).
+
+    Skipped, with outputs restored from the stage cache, when the input data,
+    options and code are unchanged since a previous run.
+    """
+    outputs = [
+        f"{output_prefix}_{t}.{fmt}"
+        for t in ("folds", "leaderboard")
+        for fmt in table_format
+    ]
+    options = dict(
+        input_file=input_file,
+        output_prefix=output_prefix,
+        models=models,
+        cv_folds=cv_folds,
+        cv_repeats=cv_repeats,
+        n_jobs=n_jobs,
+        table_format=table_format,
+    )
+    # The number of workers only changes how fast the stage runs
+    params = {k: v for k, v in options.items() if k != "n_jobs"}
+    with profile_run(profile_path, profile_format, profile_capture):
+        run_cached(
+            "compare-models",
+            lambda: _compare_stage(**options),
+            inputs=[input_file],
+            outputs=outputs,
+            params=params,
+            sources=source_files(__file__),
+            enabled=not no_cache,
+        )
+
+
+def _compare_stage(input_file, **options):
+    """Runs the comparison of compare_models without the stage cache."""
+    from src.compare_utils import run_model_comparison
+    from src.io_utils import read_clean_data
+    from src.model_utils import MODEL_COLUMNS
+
+    try:
+        train_df = read_clean_data(input_file, columns=MODEL_COLUMNS, train=1)
+    except FileNotFoundError:
+        print(f"Error: Input file '{input_file}' not found.")
+        return
+
+    run_model_comparison(train_df, **options)
+
+
+if __name__ == "__main__":
+    compare_models()
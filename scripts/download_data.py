@@ -4,14 +4,16 @@
 
 import sys
 from pathlib import Path
+from urllib.parse import urlparse
 import click
 
-
 ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
+from src.cache_utils import run_cached, source_files
 from src.download_utils import download_csv
+from src.pipeline_utils import DATA_URL
 
 
 @click.command()
@@ -19,7 +21,7 @@ from src.download_utils import download_csv
     "--input-path",
     type=str,
     required=True,
-    default="https://raw.githubusercontent.com/Muhanad-husn/Sleep-Health-and-Lifestyle/main/data.csv",
+    default=DATA_URL,
     help="URL or local path to the raw CSV data.",
 )
 @click.option(
@@ -29,10 +31,33 @@ from src.download_utils import download_csv
     default="data/raw/sleep_data_raw.csv",
     help="Where to save the downloaded data, e.g. data/raw/sleep_data_raw.csv",
 )
-def main(input_path, output_path):
+@click.option(
+    "--sha256",
+    default=None,
+    help="Expected SHA-256 digest of the file; the download fails on mismatch.",
+)
+@click.option(
+    "--no-cache", is_flag=True, help="Always recompute instead of using the stage cache"
+)
+def main(input_path, output_path, sha256, no_cache):
     """Download CSV data from a URL or local path and save it to the specified output path."""
+    # Remote files are revalidated with conditional requests by download_csv,
+    # so only copies of local files go through the stage cache
+    is_local = urlparse(input_path).scheme not in {"http", "https"}
+    run_cached(
+        "download-data",
+        lambda: _download(input_path, output_path, sha256),
+        inputs=[input_path] if is_local else [],
+        outputs=[output_path],
+        params={"output_path": output_path, "sha256": sha256},
+        sources=source_files(__file__),
+        enabled=is_local and not no_cache,
+    )
+
+
+def _download(input_path, output_path, sha256):
     try:
-        saved_path = download_csv(input_path, output_path)
+        saved_path = download_csv(input_path, output_path, sha256=sha256)
         print(f"Data successfully downloaded and saved to: {saved_path}")
     except Exception as e:
         print(f"An error occurred while downloading the data: {e}")
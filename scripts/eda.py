@@ -1,4 +1,5 @@
 import click
+import os
 import sys
 from pathlib import Path
 
@@ -6,7 +7,10 @@ ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
-from src.eda_utils import perform_eda
+from src.cache_utils import run_cached, source_files
+from src.profile_utils import CAPTURE_MODES, TRACE_FORMATS, profile_run
+from src.plot_utils import DENSITY_THRESHOLD
+from src.render_utils import FIGURE_FORMATS, figure_path
 
 
 @click.command()
@@ -18,9 +22,145 @@ from src.eda_utils import perform_eda
 @click.option(
     "--output-dir", default="../results", help="Directory to save the figures"
 )
-def main(input_file, output_dir):
+@click.option(
+    "--chunksize",
+    type=int,
+    default=None,
+    help="Stream the input in chunks of this many rows instead of loading it whole",
+)
+@click.option(
+    "--kde",
+    type=click.Choice(["exact", "binned"]),
+    default="exact",
+    show_default=True,
+    help="Evaluate densities exactly or by binning and FFT convolution",
+)
+@click.option(
+    "--kde-gridsize",
+    type=int,
+    default=200,
+    show_default=True,
+    help="Number of points each density is evaluated on",
+)
+@click.option(
+    "--scatter",
+    type=click.Choice(["auto", "points", "weighted", "hexbin"]),
+    default="auto",
+    show_default=True,
+    help="Draw every point, count-weighted markers or a hexbin grid",
+)
+@click.option(
+    "--density-threshold",
+    type=int,
+    default=DENSITY_THRESHOLD,
+    show_default=True,
+    help="Row count above which --scatter auto aggregates the points",
+)
+@click.option(
+    "--bootstrap",
+    "n_bootstrap",
+    default=1000,
+    show_default=True,
+    help="Bootstrap replicates of the correlation confidence intervals (0 disables)",
+)
+@click.option(
+    "--bootstrap-jobs",
+    default=1,
+    show_default=True,
+    help="Worker processes drawing the bootstrap replicates (-1 uses all cores)",
+)
+@click.option(
+    "--figure-format",
+    type=click.Choice(FIGURE_FORMATS),
+    default="png",
+    show_default=True,
+    help="Save the figure as PNG or as SVG for quick previews",
+)
+@click.option(
+    "--dpi",
+    type=float,
+    default=None,
+    help="Override the figure resolution, e.g. 50 for quick previews",
+)
+@click.option(
+    "--profile",
+    "profile_path",
+    default=None,
+    help="Write a timing trace of the run to this file (or set SLEEP_PROFILE)",
+)
+@click.option(
+    "--profile-format",
+    type=click.Choice(TRACE_FORMATS),
+    default=None,
+    help="Trace layout: a JSON list of spans, or chrome for chrome://tracing and Perfetto",
+)
+@click.option(
+    "--profile-capture",
+    type=click.Choice(CAPTURE_MODES),
+    multiple=True,
+    help="Also write a cProfile dump, or record tracemalloc memory per span",
+)
+@click.option(
+    "--no-cache", is_flag=True, help="Always recompute instead of using the stage cache"
+)
+def main(
+    input_file,
+    output_dir,
+    chunksize,
+    kde,
+    kde_gridsize,
+    scatter,
+    density_threshold,
+    n_bootstrap,
+    bootstrap_jobs,
+    figure_format,
+    dpi,
+    profile_path,
+    profile_format,
+    profile_capture,
+    no_cache,
+):
     """Perform exploratory data analysis and save visualizations."""
-    perform_eda(input_file, output_dir)
+    # Imported here so that --help and cache hits skip loading matplotlib
+    from src.eda_utils import perform_eda
+
+    with profile_run(profile_path, profile_format, profile_capture):
+        run_cached(
+            "eda",
+            lambda: perform_eda(
+                input_file,
+                output_dir,
+                chunksize,
+                kde,
+                kde_gridsize,
+                scatter,
+                density_threshold,
+                figure_format,
+                dpi,
+                n_bootstrap=n_bootstrap,
+                bootstrap_jobs=bootstrap_jobs,
+            ),
+            inputs=[input_file],
+            outputs=[
+                figure_path(os.path.join(output_dir, "eda_summary"), figure_format)
+            ]
+            + [
+                os.path.join(output_dir, f"eda_correlations.{fmt}")
+                for fmt in ("csv", "json", "md")
+            ],
+            params={
+                "output_dir": output_dir,
+                "kde": kde,
+                "kde_gridsize": kde_gridsize,
+                "scatter": scatter,
+                "density_threshold": density_threshold,
+                "figure_format": figure_format,
+                "dpi": dpi,
+                "n_bootstrap": n_bootstrap,
+            },
+            sources=source_files(__file__),
+            enabled=not no_cache,
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,43 @@
+import click
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+
+@click.command()
+@click.option(
+    "--n-rows", type=int, required=True, help="Number of rows to generate, e.g. 1000000"
+)
+@click.option(
+    "--output-path",
+    default="data/raw/sleep_data_synthetic.csv",
+    show_default=True,
+    help="Where to save the synthetic raw CSV",
+)
+@click.option("--random-state", type=int, default=522, help="Seed of the generator")
+@click.option(
+    "--chunksize",
+    type=int,
+    default=1_000_000,
+    show_default=True,
+    help="Rows generated and written at a time",
+)
+def main(n_rows, output_path, random_state, chunksize):
+    """
+    Generate synthetic raw sleep data with the schema and distributions of
+    the real file, for benchmarks and tests at scale.
+    """
+    # Imported here so that --help skips loading pandas
+    from src.synth_utils import write_sleep_data
+
+    written = write_sleep_data(
+        output_path, n_rows, random_state=random_state, chunksize=chunksize
+    )
+    print(f"Wrote {written} synthetic rows to '{output_path}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,3 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.gridspec as gridspec
-import seaborn as sns
 import click
 import os
 import sys
@@ -10,177 +6,285 @@ import warnings
 
 warnings.filterwarnings("ignore")
 
-from sklearn.model_selection import cross_validate
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
-from sklearn.compose import make_column_transformer
-from sklearn.pipeline import make_pipeline
-from sklearn.linear_model import Ridge
-from sklearn.metrics import mean_squared_error, r2_score
-
-
 ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
-from src.model_utils import save_df_as_png
+# Only light modules are imported here, so that --help and cache hits do not
+# pay for pandas, scikit-learn or matplotlib; _model_stage imports the rest
+from src.cache_utils import run_cached, source_files
+from src.metrics_utils import METRICS_FORMATS
+from src.model_utils import DEFAULT_SCORING, MODEL_COLUMNS
+from src.plot_utils import DENSITY_THRESHOLD
+from src.profile_utils import CAPTURE_MODES, TRACE_FORMATS, profile_run
+from src.render_utils import FIGURE_FORMATS, figure_path
 
 
 @click.command()
 @click.option(
     "--input-file",
     default="data/processed/sleep_data_clean.csv",
-    help="Path to the cleaned data file",
+    help="Path to the cleaned data file (.csv or .parquet)",
 )
 @click.option(
     "--output-prefix",
     default="results/model_analysis",
     help="Prefix for output files (e.g. results/this_analysis)",
 )
-def run_model(input_file, output_prefix):
+@click.option("--cv-folds", default=5, show_default=True, help="Number of CV folds")
+@click.option(
+    "--cv-repeats",
+    default=1,
+    show_default=True,
+    help="Number of repeats of the k-fold split (repeated k-fold when > 1)",
+)
+@click.option(
+    "--scoring",
+    multiple=True,
+    default=DEFAULT_SCORING,
+    show_default=True,
+    help="scikit-learn scorer name; repeat the option for several scorers",
+)
+@click.option(
+    "--n-jobs",
+    default=1,
+    show_default=True,
+    help="Number of parallel CV workers (-1 uses all cores)",
+)
+@click.option(
+    "--cv-backend",
+    type=click.Choice(["process", "thread"]),
+    default="process",
+    show_default=True,
+    help="Pool used to run CV folds when --n-jobs is not 1",
+)
+@click.option(
+    "--alpha", default=1.0, show_default=True, help="Ridge regularization strength"
+)
+@click.option(
+    "--alpha-sweep",
+    default=0,
+    show_default=True,
+    help="Number of log-spaced alphas for a closed-form CV error path (0 disables)",
+)
+@click.option(
+    "--model-file",
+    default=None,
+    help="Where to save the fitted model (default: <output-prefix>_model.joblib)",
+)
+@click.option("--alpha-min", default=1e-3, show_default=True, help="Smallest alpha")
+@click.option("--alpha-max", default=1e3, show_default=True, help="Largest alpha")
+@click.option(
+    "--scatter",
+    type=click.Choice(["auto", "points", "weighted", "hexbin"]),
+    default="auto",
+    show_default=True,
+    help="Draw every prediction, count-weighted markers or a hexbin grid",
+)
+@click.option(
+    "--density-threshold",
+    type=int,
+    default=DENSITY_THRESHOLD,
+    show_default=True,
+    help="Test rows above which --scatter auto aggregates the points",
+)
+@click.option(
+    "--bootstrap",
+    "n_bootstrap",
+    default=1000,
+    show_default=True,
+    help="Bootstrap replicates of the test metric confidence intervals (0 disables)",
+)
+@click.option(
+    "--table-format",
+    multiple=True,
+    type=click.Choice(METRICS_FORMATS + ("png",)),
+    default=METRICS_FORMATS,
+    show_default=True,
+    help="Formats of the CV and test metric tables; repeat for several",
+)
+@click.option(
+    "--metrics-log",
+    default=None,
+    help="JSON Lines file each computed run appends its metrics to; cache hits "
+    "append nothing (default: <output-prefix>_metrics_log.jsonl)",
+)
+@click.option(
+    "--dedup",
+    is_flag=True,
+    help="Fit on weighted unique training rows; same model, faster fits, "
+    "and duplicates no longer straddle CV folds",
+)
+@click.option(
+    "--render-jobs",
+    default=-1,
+    show_default=True,
+    help="Number of processes rendering the figures (-1 uses all cores)",
+)
+@click.option(
+    "--figure-format",
+    type=click.Choice(FIGURE_FORMATS),
+    default="png",
+    show_default=True,
+    help="Save figures as PNG or as SVG for quick previews",
+)
+@click.option(
+    "--dpi",
+    type=float,
+    default=None,
+    help="Override the figure resolution, e.g. 50 for quick previews",
+)
+@click.option(
+    "--profile",
+    "profile_path",
+    default=None,
+    help="Write a timing trace of the run to this file (or set SLEEP_PROFILE)",
+)
+@click.option(
+    "--profile-format",
+    type=click.Choice(TRACE_FORMATS),
+    default=None,
+    help="Trace layout: a JSON list of spans, or chrome for chrome://tracing and Perfetto",
+)
+@click.option(
+    "--profile-capture",
+    type=click.Choice(CAPTURE_MODES),
+    multiple=True,
+    help="Also write a cProfile dump, or record tracemalloc memory per span",
+)
+@click.option(
+    "--no-cache", is_flag=True, help="Always recompute instead of using the stage cache"
+)
+def run_model(
+    input_file,
+    output_prefix,
+    cv_folds,
+    cv_repeats,
+    scoring,
+    n_jobs,
+    cv_backend,
+    alpha,
+    alpha_sweep,
+    alpha_min,
+    alpha_max,
+    model_file,
+    scatter,
+    density_threshold,
+    n_bootstrap,
+    table_format,
+    metrics_log,
+    dedup,
+    render_jobs,
+    figure_format,
+    dpi,
+    profile_path,
+    profile_format,
+    profile_capture,
+    no_cache,
+):
     """
     Performs modeling analysis:
     1. Loads data and splits into train/test based on 'train' column.
     2. Trains a Ridge regression pipeline with CV.
     3. Evaluates on test set.
-    4. Generates tables and plots.
+    4. Writes metric tables (CSV/JSON/Markdown), appends the run to a
+       metrics log and generates plots.
+
+    Skipped, with outputs restored from the stage cache, when the input data,
+    options and code are unchanged since a previous run.
     """
+    if model_file is None:
+        model_file = f"{output_prefix}_model.joblib"
+    tables = ["cv_results", "test_metrics"]
+    figures = ["prediction_plots"]
+    if "png" in table_format:
+        figures += tables
+    if alpha_sweep > 0:
+        figures.append("alpha_path")
+    outputs = [figure_path(f"{output_prefix}_{f}", figure_format) for f in figures]
+    outputs += [
+        f"{output_prefix}_{t}.{fmt}"
+        for t in tables
+        for fmt in METRICS_FORMATS
+        if fmt in table_format
+    ]
+    outputs += [model_file, f"{model_file}.json"]
+
+    options = dict(
+        input_file=input_file,
+        output_prefix=output_prefix,
+        cv_folds=cv_folds,
+        cv_repeats=cv_repeats,
+        scoring=scoring,
+        n_jobs=n_jobs,
+        cv_backend=cv_backend,
+        alpha=alpha,
+        alpha_sweep=alpha_sweep,
+        alpha_min=alpha_min,
+        alpha_max=alpha_max,
+        model_file=model_file,
+        scatter=scatter,
+        density_threshold=density_threshold,
+        table_format=table_format,
+        metrics_log=metrics_log,
+        dedup=dedup,
+        render_jobs=render_jobs,
+        figure_format=figure_format,
+        dpi=dpi,
+        n_bootstrap=n_bootstrap,
+    )
+    # Worker settings only change how fast the stage runs, not its outputs.
+    # The metrics log is left out too: it is an append-only history, not an
+    # output, so a cache hit appends nothing and a new --metrics-log path
+    # does not force a rerun
+    workers = ("n_jobs", "cv_backend", "render_jobs")
+    params = {k: v for k, v in options.items() if k not in workers + ("metrics_log",)}
+    with profile_run(profile_path, profile_format, profile_capture):
+        run_cached(
+            "model",
+            lambda: _model_stage(**options),
+            inputs=[input_file],
+            outputs=outputs,
+            params=params,
+            sources=source_files(__file__),
+            enabled=not no_cache,
+        )
+
+
+def _model_stage(
+    input_file,
+    output_prefix,
+    render_jobs,
+    figure_format,
+    dpi,
+    **options,
+):
+    """Runs the modeling steps of run_model without the stage cache."""
+    from src.io_utils import read_clean_data, read_columns
+    from src.model_utils import run_model_analysis
+    from src.render_utils import render_figures
+
     # 1. Load Data
     try:
-        df = pd.read_csv(input_file)
+        columns = read_columns(input_file)
     except FileNotFoundError:
         print(f"Error: Input file '{input_file}' not found.")
         return
 
-    # Ensure output directory exists
-    output_dir = os.path.dirname(output_prefix)
-    if output_dir:
-        os.makedirs(output_dir, exist_ok=True)
-
     # Split Data
-    if "train" not in df.columns:
+    if "train" not in columns:
         print("Error: 'train' column missing from input file. Cannot split data.")
         return
 
-    train_df = df[df["train"] == 1].copy()
-    test_df = df[df["train"] == 0].copy()
-
-    target_col = "stress_level"
-    drop_cols = [target_col, "train", "person_id"]
-
-    # Drop person_id if it exists, it's not a feature
-    cols_to_drop = [c for c in drop_cols if c in df.columns]
-
-    X_train = train_df.drop(columns=cols_to_drop)
-    y_train = train_df[target_col]
-
-    X_test = test_df.drop(columns=cols_to_drop)
-    y_test = test_df[target_col]
-
-    print(f"Training shapes: X={X_train.shape}, y={y_train.shape}")
-    print(f"Testing shapes: X={X_test.shape}, y={y_test.shape}")
-
-    # 2. Define Pipeline
-    # Note: remainder='passthrough' is crucial to keep sleep_quality which isn't transformed
-    preprocesser = make_column_transformer(
-        (StandardScaler(), ["sleep_duration"]),
-        (OneHotEncoder(), ["sleep_disorder"]),
-        remainder="passthrough",
-    )
-
-    ridge_pipe = make_pipeline(preprocesser, Ridge(alpha=1.0))
-
-    # 3. Cross-Validation
-    print("Running Cross-Validation...")
-    cv_results = cross_validate(
-        ridge_pipe,
-        X_train,
-        y_train,
-        cv=5,
-        scoring=["neg_mean_squared_error", "r2"],
-        return_train_score=True,
-    )
-
-    cv_results_df = pd.DataFrame(cv_results).rename(
-        columns={
-            "test_neg_mean_squared_error": "test_neg_MSE",
-            "train_neg_mean_squared_error": "train_neg_MSE",
-        }
-    )
-
-    # Calculate means for summary
-    cv_summary = cv_results_df.mean().to_frame(name="Mean").T
+    # Only the modeling columns are read, and the split is pushed down to the reader
+    train_df = read_clean_data(input_file, columns=MODEL_COLUMNS, train=1)
+    test_df = read_clean_data(input_file, columns=MODEL_COLUMNS, train=0)
 
-    # Save CV Results Table
-    save_df_as_png(
-        cv_results_df.round(4),
-        f"{output_prefix}_cv_results.png",
+    # 2-5. Cross-validate, evaluate, save the model, tables and figures
+    figures = run_model_analysis(
+        train_df, test_df, output_prefix, input_file=input_file, **options
     )
-
-    # 4. Final Training & Evaluation
-    print("Training final model and evaluating on test set...")
-    ridge_pipe.fit(X_train, y_train)
-    y_pred = ridge_pipe.predict(X_test)
-
-    mse = mean_squared_error(y_test, y_pred)
-    r2 = r2_score(y_test, y_pred)
-
-    results_df = pd.DataFrame({"Metric": ["MSE", "R2 Score"], "Value": [mse, r2]})
-
-    print(f"Test MSE: {mse:.4f}")
-    print(f"Test R2: {r2:.4f}")
-
-    # Save Test Results Table
-    save_df_as_png(results_df.round(4), f"{output_prefix}_test_metrics.png")
-
-    # 5. Visualization (Actual vs Predicted & Residuals)
-    # Set plot style
-    try:
-        import scienceplots
-
-        plt.style.use(["science", "notebook", "grid"])
-    except ImportError:
-        sns.set_theme(style="whitegrid")
-
-    residuals = y_test - y_pred
-
-    fig = plt.figure(figsize=(14, 6))
-    gs = gridspec.GridSpec(1, 2, figure=fig, wspace=0.2)
-
-    # Plot 1: Actual vs Predicted
-    min_val = min(y_test.min(), y_pred.min())
-    max_val = max(y_test.max(), y_pred.max())
-
-    ax1 = fig.add_subplot(gs[0])
-    ax1.scatter(y_test, y_pred, alpha=0.6, edgecolors="k", linewidth=0.5)
-    ax1.plot(
-        [min_val, max_val], [min_val, max_val], "r--", lw=2, label="Perfect Prediction"
-    )
-    ax1.set_xlabel("Actual Stress Level", fontsize=12)
-    ax1.set_ylabel("Predicted Stress Level", fontsize=12)
-    ax1.set_title(
-        "Actual vs Predicted Stress Levels", fontsize=14, fontweight="bold", loc="left"
-    )
-    ax1.legend()
-    ax1.grid(True, alpha=0.3)
-
-    # Plot 2: Residuals
-    ax2 = fig.add_subplot(gs[1])
-    ax2.scatter(y_pred, residuals, alpha=0.6, edgecolors="k", linewidth=0.5)
-    ax2.axhline(y=0, color="r", linestyle="--", lw=2)
-    ax2.set_xlabel("Predicted Stress Level", fontsize=12)
-    ax2.set_ylabel("Residuals (Actual - Predicted)", fontsize=12)
-    ax2.set_title("Residual Plot", fontsize=14, fontweight="bold", loc="left")
-    ax2.grid(True, alpha=0.3)
-
-    plt.tight_layout()
-    plot_filename = f"{output_prefix}_prediction_plots.png"
-    try:
-        plt.savefig(plot_filename, bbox_inches="tight")
-        print(f"Prediction plots saved to '{plot_filename}'")
-    except Exception as e:
-        print(f"Error saving plots: {e}")
-    finally:
-        plt.close(fig)
+    render_figures(figures, n_jobs=render_jobs, fmt=figure_format, dpi=dpi)
 
 
 if __name__ == "__main__":
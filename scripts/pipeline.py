@@ -0,0 +1,202 @@
+import click
+import os
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.pipeline_utils import DATA_URL
+from src.plot_utils import DENSITY_THRESHOLD
+from src.profile_utils import CAPTURE_MODES, TRACE_FORMATS, profile_run
+from src.render_utils import FIGURE_FORMATS
+
+
+@click.command()
+@click.option(
+    "--input-path",
+    default=DATA_URL,
+    help="URL or local path to the raw CSV data",
+)
+@click.option(
+    "--output-dir", default="results", help="Directory of the figures, tables and model"
+)
+@click.option(
+    "--raw-path",
+    default=None,
+    help="Also save the raw data here, e.g. data/raw/sleep_data_raw.csv",
+)
+@click.option(
+    "--clean-path",
+    default=None,
+    help="Also save the cleaned data here (.csv or .parquet), e.g. data/processed/sleep_data_clean.csv",
+)
+@click.option(
+    "--split",
+    type=click.Choice(["random", "hash", "stratified", "group"]),
+    default="random",
+    help="Assign train/test with a global shuffle (random), a stable hash of person_id "
+    "(hash), a shuffle stratified on sleep_disorder (stratified), or a hash of each "
+    "row's profile so that identical profiles stay together (group)",
+)
+@click.option(
+    "--group-column",
+    "group_columns",
+    multiple=True,
+    help="Raw column of the group split key; repeat for several "
+    "(default: all columns but Person ID)",
+)
+@click.option(
+    "--random-state", type=int, default=522, help="Random state for the split"
+)
+@click.option("--alpha", default=1.0, show_default=True, help="Ridge alpha")
+@click.option("--cv-folds", default=5, show_default=True, help="Number of CV folds")
+@click.option(
+    "--dedup",
+    is_flag=True,
+    help="Fit on weighted unique training rows instead of every row",
+)
+@click.option(
+    "--alpha-sweep",
+    default=0,
+    show_default=True,
+    help="Number of log-spaced alphas for a closed-form CV error path (0 disables it)",
+)
+@click.option(
+    "--bootstrap",
+    "n_bootstrap",
+    default=1000,
+    show_default=True,
+    help="Bootstrap replicates of the confidence intervals (0 disables)",
+)
+@click.option(
+    "--kde",
+    type=click.Choice(["exact", "binned"]),
+    default="exact",
+    show_default=True,
+    help="Evaluate the EDA densities exactly or by FFT on a binned grid",
+)
+@click.option(
+    "--scatter",
+    type=click.Choice(["auto", "points", "weighted", "hexbin"]),
+    default="auto",
+    show_default=True,
+    help="How scatter panels are drawn; 'auto' aggregates above --density-threshold rows",
+)
+@click.option(
+    "--density-threshold",
+    default=DENSITY_THRESHOLD,
+    show_default=True,
+    help="Row count above which 'auto' scatter panels are aggregated",
+)
+@click.option(
+    "--render-jobs",
+    default=-1,
+    show_default=True,
+    help="Number of processes rendering the figures (-1 uses all cores)",
+)
+@click.option(
+    "--figure-format",
+    type=click.Choice(FIGURE_FORMATS),
+    default="png",
+    show_default=True,
+    help="Figure file format; svg skips rasterization for quick previews",
+)
+@click.option(
+    "--dpi", type=float, default=None, help="Figure resolution, e.g. 72 for previews"
+)
+@click.option(
+    "--profile",
+    "profile_path",
+    default=None,
+    help="Write a timing trace of the run to this file (or set SLEEP_PROFILE)",
+)
+@click.option(
+    "--profile-format",
+    type=click.Choice(TRACE_FORMATS),
+    default=None,
+    help="Trace layout: a JSON list of spans, or chrome for chrome://tracing and Perfetto",
+)
+@click.option(
+    "--profile-capture",
+    type=click.Choice(CAPTURE_MODES),
+    multiple=True,
+    help="Also write a cProfile dump, or record tracemalloc memory per span",
+)
+@click.option(
+    "--sequential",
+    is_flag=True,
+    help="Run the EDA and model stages one after the other instead of concurrently",
+)
+def main(
+    input_path,
+    output_dir,
+    raw_path,
+    clean_path,
+    split,
+    group_columns,
+    random_state,
+    alpha,
+    cv_folds,
+    dedup,
+    alpha_sweep,
+    n_bootstrap,
+    kde,
+    scatter,
+    density_threshold,
+    render_jobs,
+    figure_format,
+    dpi,
+    profile_path,
+    profile_format,
+    profile_capture,
+    sequential,
+):
+    """
+    Runs download, cleaning, EDA and modeling in one process, keeping the
+    data in memory between the stages.
+    """
+    from src.pipeline_utils import run_pipeline
+
+    with profile_run(profile_path, profile_format, profile_capture):
+        try:
+            timings = run_pipeline(
+                input_path,
+                output_dir=output_dir,
+                raw_path=raw_path,
+                clean_path=clean_path,
+                split=split,
+                random_state=random_state,
+                group_columns=list(group_columns) or None,
+                eda_options=dict(
+                    kde=kde,
+                    scatter=scatter,
+                    density_threshold=density_threshold,
+                    n_bootstrap=n_bootstrap,
+                ),
+                model_options=dict(
+                    alpha=alpha,
+                    cv_folds=cv_folds,
+                    dedup=dedup,
+                    alpha_sweep=alpha_sweep,
+                    n_bootstrap=n_bootstrap,
+                    scatter=scatter,
+                    density_threshold=density_threshold,
+                ),
+                concurrent=not sequential,
+                render_jobs=render_jobs,
+                fmt=figure_format,
+                dpi=dpi,
+            )
+        except (OSError, ValueError) as e:
+            print(f"Error running the pipeline: {e}")
+            sys.exit(1)
+
+    print("Stage timings:")
+    for stage, seconds in timings.items():
+        print(f"  {stage:<12} {seconds:8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import click
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.artifact_utils import load_model_artifact
+
+
+@click.command()
+@click.option(
+    "--model-file",
+    default="results/model_analysis_model.joblib",
+    help="Path to the model artifact saved by model.py",
+)
+@click.option(
+    "--input-file",
+    default="data/processed/sleep_data_clean.csv",
+    help="CSV or Parquet file to score",
+)
+@click.option(
+    "--output-file",
+    default="results/predictions.csv",
+    help="Where to write the predictions (.csv or .parquet)",
+)
+@click.option(
+    "--batch-size", default=100_000, show_default=True, help="Rows scored per batch"
+)
+def main(model_file, input_file, output_file, batch_size):
+    """Score a data file with a saved model, streaming predictions to disk."""
+    from src.score_utils import score_file
+
+    try:
+        model, metadata = load_model_artifact(model_file)
+    except FileNotFoundError:
+        print(f"Error: Model file '{model_file}' not found.")
+        return
+
+    try:
+        stats = score_file(model, metadata, input_file, output_file, batch_size)
+    except FileNotFoundError:
+        print(f"Error: Input file '{input_file}' not found.")
+        return
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+
+    print(
+        f"Scored {stats['rows']} rows in {stats['seconds']:.2f}s "
+        f"({stats['rows_per_s']:,.0f} rows/s), saved to '{output_file}'"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import click
+import sys
+from pathlib import Path
+import warnings
+
+warnings.filterwarnings("ignore")
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# Only light modules are imported here, so that --help does not pay for
+# pandas or scikit-learn; _search_stage imports the rest
+from src.metrics_utils import METRICS_FORMATS
+from src.profile_utils import CAPTURE_MODES, TRACE_FORMATS, profile_run
+from src.search_utils import SEARCH_SPACES
+
+
+@click.command()
+@click.option(
+    "--input-file",
+    default="data/processed/sleep_data_clean.csv",
+    help="Path to the cleaned data file (.csv or .parquet)",
+)
+@click.option(
+    "--output-prefix",
+    default="results/search",
+    help="Prefix for output files (e.g. results/this_search)",
+)
+@click.option(
+    "--model",
+    "models",
+    multiple=True,
+    type=click.Choice(list(SEARCH_SPACES)),
+    default=list(SEARCH_SPACES),
+    show_default=True,
+    help="Model to tune; repeat the option for several",
+)
+@click.option(
+    "--n-candidates",
+    default=27,
+    show_default=True,
+    help="Random hyperparameter candidates per model",
+)
+@click.option(
+    "--factor",
+    default=3,
+    show_default=True,
+    help="Keep 1/factor of the candidates per round, on factor times more rows",
+)
+@click.option(
+    "--min-resources",
+    type=int,
+    default=None,
+    help="Training rows of the first round (default: sized to reach all rows)",
+)
+@click.option("--cv-folds", default=5, show_default=True, help="Number of CV folds")
+@click.option(
+    "--n-jobs",
+    default=-1,
+    show_default=True,
+    help="Number of processes fitting the candidate x fold jobs (-1 uses all cores)",
+)
+@click.option("--random-state", default=522, show_default=True, help="Search seed")
+@click.option(
+    "--trial-log",
+    default=None,
+    help="JSON Lines log of finished trials, resumed on the next run "
+    "(default: <output-prefix>_trials.jsonl)",
+)
+@click.option(
+    "--table-format",
+    multiple=True,
+    type=click.Choice(METRICS_FORMATS),
+    default=METRICS_FORMATS,
+    show_default=True,
+    help="Formats of the trials table; repeat for several",
+)
+@click.option(
+    "--profile",
+    "profile_path",
+    default=None,
+    help="Write a timing trace of the run to this file (or set SLEEP_PROFILE)",
+)
+@click.option(
+    "--profile-format",
+    type=click.Choice(TRACE_FORMATS),
+    default=None,
+    help="Trace layout: a JSON list of spans, or chrome for chrome://tracing and Perfetto",
+)
+@click.option(
+    "--profile-capture",
+    type=click.Choice(CAPTURE_MODES),
+    multiple=True,
+    help="Also write a cProfile dump, or record tracemalloc memory per span",
+)
+def search(
+    input_file,
+    output_prefix,
+    models,
+    n_candidates,
+    factor,
+    min_resources,
+    cv_folds,
+    n_jobs,
+    random_state,
+    trial_log,
+    table_format,
+    profile_path,
+    profile_format,
+    profile_capture,
+):
+    """
+    Tunes the models with successive halving on the training split:
+    1. Draws random hyperparameter candidates per model.
+    2. Cross-validates them on a small row subsample, keeps the best
+       1/factor and repeats on factor times more rows, up to all rows.
+    3. Writes the trials (CSV/JSON/Markdown) and the best candidate (JSON).
+
+    Finished trials are appended to the trial log as they complete; an
+    interrupted search run again with the same options skips them. The
+    trial log takes the place of the stage cache.
+    """
+    with profile_run(profile_path, profile_format, profile_capture):
+        _search_stage(
+            input_file,
+            output_prefix,
+            models=models,
+            n_candidates=n_candidates,
+            factor=factor,
+            min_resources=min_resources,
+            cv_folds=cv_folds,
+            n_jobs=n_jobs,
+            random_state=random_state,
+            log_path=trial_log,
+            table_format=table_format,
+        )
+
+
+def _search_stage(input_file, output_prefix, **options):
+    """Runs the search of the search command."""
+    from src.io_utils import read_clean_data
+    from src.model_utils import MODEL_COLUMNS
+    from src.search_utils import run_search
+
+    try:
+        train_df = read_clean_data(input_file, columns=MODEL_COLUMNS, train=1)
+    except FileNotFoundError:
+        print(f"Error: Input file '{input_file}' not found.")
+        return
+
+    run_search(train_df, output_prefix, **options)
+
+
+if __name__ == "__main__":
+    search()
@@ -0,0 +1,55 @@
+import click
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.artifact_utils import load_model_artifact
+
+
+@click.command()
+@click.option(
+    "--model-file",
+    default="results/model_analysis_model.joblib",
+    help="Path to the model artifact saved by model.py",
+)
+@click.option("--host", default="127.0.0.1", help="Interface to bind")
+@click.option("--port", default=8000, show_default=True, help="Port to listen on")
+@click.option(
+    "--max-batch-size",
+    default=256,
+    show_default=True,
+    help="Maximum number of records predicted together",
+)
+@click.option(
+    "--batch-window-ms",
+    default=2.0,
+    show_default=True,
+    help="How long a request waits for others to join its micro-batch",
+)
+def main(model_file, host, port, max_batch_size, batch_window_ms):
+    """Serve stress-level predictions over HTTP (POST /predict)."""
+    from src.serve_utils import LinearScorer, make_server
+
+    try:
+        model, metadata = load_model_artifact(model_file)
+    except FileNotFoundError:
+        print(f"Error: Model file '{model_file}' not found.")
+        return
+
+    scorer = LinearScorer.from_pipeline(model)
+    server = make_server(scorer, host, port, max_batch_size, batch_window_ms)
+    print(f"Serving '{model_file}' on http://{host}:{server.server_port}/predict")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.batcher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import click
+import sys
+from pathlib import Path
+import warnings
+
+warnings.filterwarnings("ignore")
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# Only light modules are imported here, so that --help and cache hits do not
+# pay for scipy or scikit-learn; _sparse_model_stage imports the rest
+from src.cache_utils import run_cached, source_files
+from src.metrics_utils import METRICS_FORMATS
+from src.model_utils import DEFAULT_SCORING
+from src.profile_utils import CAPTURE_MODES, TRACE_FORMATS, profile_run
+
+
+@click.command()
+@click.option(
+    "--features-file",
+    default="data/processed/sleep_features.npz",
+    help="Sparse feature matrix written by build_features.py",
+)
+@click.option(
+    "--output-prefix",
+    default="results/sparse_model",
+    help="Prefix for output files (e.g. results/this_analysis)",
+)
+@click.option("--cv-folds", default=5, show_default=True, help="Number of CV folds")
+@click.option(
+    "--cv-repeats",
+    default=1,
+    show_default=True,
+    help="Number of repeats of the k-fold split (repeated k-fold when > 1)",
+)
+@click.option(
+    "--scoring",
+    multiple=True,
+    default=DEFAULT_SCORING,
+    show_default=True,
+    help="scikit-learn scorer name; repeat the option for several scorers",
+)
+@click.option(
+    "--n-jobs",
+    default=1,
+    show_default=True,
+    help="Number of parallel CV workers (-1 uses all cores)",
+)
+@click.option(
+    "--cv-backend",
+    type=click.Choice(["process", "thread"]),
+    default="process",
+    show_default=True,
+    help="Pool used to run CV folds when --n-jobs is not 1",
+)
+@click.option(
+    "--alpha", default=1.0, show_default=True, help="Ridge regularization strength"
+)
+@click.option(
+    "--bootstrap",
+    "n_bootstrap",
+    default=1000,
+    show_default=True,
+    help="Bootstrap replicates of the test metric confidence intervals (0 disables)",
+)
+@click.option(
+    "--table-format",
+    multiple=True,
+    type=click.Choice(METRICS_FORMATS),
+    default=METRICS_FORMATS,
+    show_default=True,
+    help="Formats of the CV and test metric tables; repeat for several",
+)
+@click.option(
+    "--profile",
+    "profile_path",
+    default=None,
+    help="Write a timing trace of the run to this file (or set SLEEP_PROFILE)",
+)
+@click.option(
+    "--profile-format",
+    type=click.Choice(TRACE_FORMATS),
+    default=None,
+    help="Trace layout: a JSON list of spans, or chrome for chrome://tracing and Perfetto",
+)
+@click.option(
+    "--profile-capture",
+    type=click.Choice(CAPTURE_MODES),
+    multiple=True,
+    help="Also write a cProfile dump, or record tracemalloc memory per span",
+)
+@click.option(
+    "--no-cache", is_flag=True, help="Always recompute instead of using the stage cache"
+)
+def sparse_model(
+    features_file,
+    output_prefix,
+    cv_folds,
+    cv_repeats,
+    scoring,
+    n_jobs,
+    cv_backend,
+    alpha,
+    n_bootstrap,
+    table_format,
+    profile_path,
+    profile_format,
+    profile_capture,
+    no_cache,
+):
+    """
+    Trains the ridge model on the sparse matrix of all raw features,
+    without densifying it, and writes the CV and test metric tables
+    (CSV/JSON/Markdown).
+
+    Skipped, with outputs restored from the stage cache, when the features,
+    options and code are unchanged since a previous run.
+    """
+    outputs = [
+        f"{output_prefix}_{t}.{fmt}"
+        for t in ("cv_results", "test_metrics")
+        for fmt in table_format
+    ]
+    options = dict(
+        output_prefix=output_prefix,
+        alpha=alpha,
+        cv_folds=cv_folds,
+        cv_repeats=cv_repeats,
+        scoring=scoring,
+        n_jobs=n_jobs,
+        cv_backend=cv_backend,
+        table_format=table_format,
+        n_bootstrap=n_bootstrap,
+    )
+    # Worker settings only change how fast the stage runs, not its outputs
+    params = {k: v for k, v in options.items() if k not in ("n_jobs", "cv_backend")}
+    with profile_run(profile_path, profile_format, profile_capture):
+        run_cached(
+            "sparse-model",
+            lambda: _sparse_model_stage(features_file, **options),
+            inputs=[features_file],
+            outputs=outputs,
+            params=params,
+            sources=source_files(__file__),
+            enabled=not no_cache,
+        )
+
+
+def _sparse_model_stage(features_file, **options):
+    """Runs the sparse model of sparse_model without the stage cache."""
+    from src.feature_utils import load_feature_matrix
+    from src.model_utils import run_sparse_model_analysis
+
+    try:
+        features = load_feature_matrix(features_file)
+    except FileNotFoundError:
+        print(f"Error: Features file '{features_file}' not found.")
+        return
+
+    run_sparse_model_analysis(features, **options)
+
+
+if __name__ == "__main__":
+    sparse_model()
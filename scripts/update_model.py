@@ -0,0 +1,65 @@
+import click
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+
+@click.command()
+@click.option(
+    "--batch-file",
+    required=True,
+    help="Cleaned CSV or Parquet file with the new rows, e.g. one day of data",
+)
+@click.option(
+    "--model-file",
+    default="results/online_model.joblib",
+    show_default=True,
+    help="Incremental model artifact to update (created when missing)",
+)
+@click.option(
+    "--alpha",
+    default=1.0,
+    show_default=True,
+    help="Ridge regularization strength of a new model",
+)
+@click.option(
+    "--reset", is_flag=True, help="Start a new model instead of updating the saved one"
+)
+@click.option(
+    "--chunksize", default=100_000, show_default=True, help="Rows read at a time"
+)
+def main(batch_file, model_file, alpha, reset, chunksize):
+    """
+    Incremental alternative to model.py for data arriving in batches.
+
+    Updates the saved ridge model with the training rows of a new batch in
+    time proportional to the batch, giving the same coefficients as a full
+    refit on every batch so far. The artifact can be used with score.py.
+    """
+    # Imported here so that --help skips loading pandas and scikit-learn
+    from src.online_utils import update_model_file
+
+    try:
+        stats = update_model_file(
+            batch_file, model_file, alpha=alpha, reset=reset, chunksize=chunksize
+        )
+    except FileNotFoundError:
+        print(f"Error: Batch file '{batch_file}' not found.")
+        return
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+
+    if stats["batch_MSE"] is not None:
+        print(f"MSE on the new batch before the update: {stats['batch_MSE']:.4f}")
+    print(
+        f"Added {stats['rows']} rows in {stats['seconds']:.2f}s; the model has "
+        f"seen {stats['n_samples_seen']} rows, saved to '{model_file}'"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import platform
+from datetime import datetime, timezone
+
+from src.metrics_utils import json_safe
+
+# Bumped whenever the layout of the saved artifact changes
+ARTIFACT_VERSION = 1
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Compute the SHA-256 hex digest of a file without loading it whole.
+
+    Parameters
+    ----------
+    path : str
+        Path to the file.
+    chunk_size : int, optional
+        Number of bytes hashed per read, by default 1 MiB.
+
+    Returns
+    -------
+    str
+        The hex digest.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def build_metadata(X, target, input_file=None, metrics=None, params=None) -> dict:
+    """
+    Describe a trained model so that it can be audited and safely reused.
+
+    Parameters
+    ----------
+    X : pd.DataFrame
+        Training features; their names and dtypes form the feature schema.
+    target : str
+        Name of the target column.
+    input_file : str, optional
+        Training data file, hashed to identify the exact data used.
+    metrics : dict, optional
+        Evaluation metrics of the model.
+    params : dict, optional
+        Training parameters such as the ridge alpha.
+
+    Returns
+    -------
+    dict
+        JSON-serializable metadata.
+    """
+    import sklearn
+
+    return {
+        "artifact_version": ARTIFACT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "sklearn_version": sklearn.__version__,
+        "python_version": platform.python_version(),
+        "training_data": input_file,
+        "training_data_sha256": file_sha256(input_file) if input_file else None,
+        "n_training_rows": int(len(X)),
+        "features": [{"name": c, "dtype": str(t)} for c, t in X.dtypes.items()],
+        "target": target,
+        "metrics": {k: float(v) for k, v in (metrics or {}).items()},
+        "params": params or {},
+    }
+
+
+def save_model_artifact(model, path: str, metadata: dict) -> str:
+    """
+    Persist a fitted model together with its metadata.
+
+    The model and metadata are stored in one joblib file, and the metadata
+    is also written to a ``<path>.json`` sidecar for inspection without
+    unpickling.
+
+    Parameters
+    ----------
+    model : estimator object
+        Fitted scikit-learn estimator or pipeline.
+    path : str
+        Destination of the artifact, e.g. results/model_analysis_model.joblib.
+    metadata : dict
+        Metadata as returned by ``build_metadata``.
+
+    Returns
+    -------
+    str
+        The path where the artifact was saved.
+    """
+    out_dir = os.path.dirname(path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+
+    import joblib
+
+    joblib.dump({"model": model, "metadata": metadata}, path)
+    with open(f"{path}.json", "w") as f:
+        json.dump(json_safe(metadata), f, indent=2, allow_nan=False)
+    return path
+
+
+def load_model_artifact(path: str):
+    """
+    Load a model artifact saved by ``save_model_artifact``.
+
+    Parameters
+    ----------
+    path : str
+        Path to the artifact.
+
+    Returns
+    -------
+    tuple
+        The fitted model and its metadata dict.
+
+    Raises
+    ------
+    ValueError
+        If the artifact was written with an unsupported layout version.
+    """
+    import joblib
+    import sklearn
+
+    artifact = joblib.load(path)
+    metadata = artifact["metadata"]
+    version = metadata.get("artifact_version")
+    if version != ARTIFACT_VERSION:
+        raise ValueError(
+            f"Unsupported artifact version {version}, expected {ARTIFACT_VERSION}."
+        )
+    if metadata.get("sklearn_version") != sklearn.__version__:
+        print(
+            f"Warning: model was trained with scikit-learn "
+            f"{metadata.get('sklearn_version')}, running {sklearn.__version__}."
+        )
+    return artifact["model"], metadata
@@ -0,0 +1,310 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.profile_utils import submit, timed
+
+# Ways of drawing the bootstrap weights, see bootstrap_sums
+BOOTSTRAP_METHODS = ("multinomial", "poisson")
+
+# Confidence level of the percentile intervals
+CI_LEVEL = 0.95
+
+# Weight or index cells (replicates x rows) drawn at a time, about 32 MB
+MAX_CHUNK_CELLS = 2**22
+
+# Multinomial weights are binned from drawn row indices when there are at
+# most this many rows per distinct row, and sampled per distinct row above
+INDEX_DRAW_RATIO = 4
+
+# Rows and counts being resampled, set once per worker process by _set_sample
+_SAMPLE = None
+
+
+def _check_method(method: str) -> None:
+    """Raise ValueError for unknown bootstrap methods."""
+    if method not in BOOTSTRAP_METHODS:
+        raise ValueError(
+            f"Unknown bootstrap method '{method}', "
+            f"expected one of {list(BOOTSTRAP_METHODS)}"
+        )
+
+
+def compress_rows(values):
+    """
+    Distinct rows of a 2-D array and how often each occurs.
+
+    Resampling the distinct rows with their counts is the same as
+    resampling the original rows, and much cheaper when values repeat.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) == 0:
+        return values, np.zeros(0, dtype=np.int64)
+    unique, counts = np.unique(values, axis=0, return_counts=True)
+    return unique, counts
+
+
+def _index_weights(rng, counts, n_replicates):
+    """Multinomial weights from a matrix of row indices drawn uniformly."""
+    k, n = len(counts), int(counts.sum())
+    rows = np.repeat(np.arange(k), counts)[rng.integers(0, n, (n_replicates, n))]
+    rows += (np.arange(n_replicates) * k)[:, None]
+    return np.bincount(rows.ravel(), minlength=n_replicates * k).reshape(
+        n_replicates, k
+    )
+
+
+def _index_draw(counts, method) -> bool:
+    """Whether multinomial weights are binned from drawn row indices."""
+    return method == "multinomial" and counts.sum() <= INDEX_DRAW_RATIO * len(counts)
+
+
+def _set_sample(values, counts) -> None:
+    """Pool initializer sending the sample to each worker once."""
+    global _SAMPLE
+    _SAMPLE = (values, counts)
+
+
+def _resampled_sums(n_replicates, seed, method, sample=None):
+    """Weighted column sums of ``n_replicates`` resamples, drawn in one shot."""
+    values, counts = sample or _SAMPLE
+    rng = np.random.default_rng(seed)
+    n = int(counts.sum())
+    if method == "poisson":
+        weights = rng.poisson(counts, size=(n_replicates, len(counts)))
+    elif _index_draw(counts, method):
+        # Few repeated rows: binning drawn indices beats sampling per row
+        weights = _index_weights(rng, counts, n_replicates)
+    else:
+        weights = rng.multinomial(n, counts / n, size=n_replicates)
+    return weights.astype(np.float64) @ values
+
+
+@timed()
+def bootstrap_sums(
+    values,
+    counts=None,
+    n_replicates=1000,
+    method="multinomial",
+    n_jobs=1,
+    random_state=522,
+    max_cells=MAX_CHUNK_CELLS,
+):
+    """
+    Column sums of bootstrap resamples of the rows of ``values``.
+
+    Instead of looping over replicates, each chunk of replicates draws a
+    weight matrix (how often every row is picked) and computes all its
+    sums with one matrix product. "multinomial" weights are the classic
+    bootstrap, with exactly as many rows as the data: they are binned from
+    a matrix of drawn row indices when rows rarely repeat, and sampled
+    per distinct row when ``counts`` compress the data well. "poisson"
+    weights draw each row independently, which is faster on many
+    distinct rows and only makes the resample size vary slightly.
+
+    Chunks hold at most ``max_cells`` weights or indices, which bounds
+    memory, and each chunk has its own seed spawned from ``random_state``,
+    so the result is the same whatever ``n_jobs`` is. Workers receive the
+    sample once, through the pool initializer.
+
+    Parameters
+    ----------
+    values : array-like
+        2-D array of rows to resample; statistics that are functions of
+        column sums (counts, means, moments) follow from the result.
+    counts : array-like, optional
+        Multiplicity of each row, e.g. from ``compress_rows``; by default 1.
+    n_replicates : int, optional
+        Number of bootstrap replicates, by default 1000.
+    method : {"multinomial", "poisson"}, optional
+        How the weights are drawn, by default "multinomial".
+    n_jobs : int, optional
+        Number of worker processes; 1 draws the chunks in-process and -1
+        uses all cores. By default 1.
+    random_state : int, optional
+        Seed of the resampling, by default 522.
+    max_cells : int, optional
+        Largest weight matrix drawn at once, by default ``MAX_CHUNK_CELLS``.
+
+    Returns
+    -------
+    np.ndarray
+        ``(n_replicates, n_columns)`` array of resampled column sums.
+
+    Raises
+    ------
+    ValueError
+        If ``method`` is unknown or there are no rows.
+    """
+    _check_method(method)
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    counts = (
+        np.ones(len(values), dtype=np.int64)
+        if counts is None
+        else np.asarray(counts, dtype=np.int64)
+    )
+    if counts.sum() == 0:
+        raise ValueError("Cannot bootstrap an empty sample.")
+
+    cells = int(counts.sum()) if _index_draw(counts, method) else len(values)
+    chunk = max(1, min(n_replicates, max_cells // max(cells, 1)))
+    sizes = [min(chunk, n_replicates - i) for i in range(0, n_replicates, chunk)]
+    seeds = np.random.SeedSequence(random_state).spawn(len(sizes))
+
+    if n_jobs is None or n_jobs < 1:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = min(n_jobs, len(sizes))
+    if n_jobs <= 1:
+        parts = [
+            _resampled_sums(size, seed, method, (values, counts))
+            for size, seed in zip(sizes, seeds)
+        ]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=n_jobs, initializer=_set_sample, initargs=(values, counts)
+        ) as pool:
+            futures = [
+                submit(pool, _resampled_sums, size, seed, method)
+                for size, seed in zip(sizes, seeds)
+            ]
+            parts = [f.result() for f in futures]
+    if not parts:
+        return np.empty((0, values.shape[1]))
+    return np.vstack(parts)
+
+
+def percentile_interval(replicates, level=CI_LEVEL):
+    """
+    Percentile bootstrap interval of each column of ``replicates``.
+
+    Replicates where the statistic is undefined (NaN, e.g. a resample
+    with a single distinct x) are ignored.
+    """
+    tail = (1 - level) / 2 * 100
+    low, high = np.nanpercentile(replicates, [tail, 100 - tail], axis=0)
+    return low, high
+
+
+def bootstrap_regression_metrics(
+    y_true,
+    y_pred,
+    n_replicates=1000,
+    level=CI_LEVEL,
+    method="multinomial",
+    n_jobs=1,
+    random_state=522,
+):
+    """
+    Test MSE and R2 with percentile bootstrap confidence intervals.
+
+    The (actual, predicted) pairs are compressed to distinct pairs first,
+    then resampled with ``bootstrap_sums``. Each replicate's MSE and R2
+    follow from four sums: the row count, the squared errors, and the
+    target and its square, centered on the full-sample mean for accuracy.
+
+    Returns
+    -------
+    pd.DataFrame
+        'Metric' ("MSE", "R2 Score"), 'Value', 'CI Low' and 'CI High'.
+    """
+    import pandas as pd
+
+    y_true = np.asarray(y_true, dtype=np.float64)
+    y_pred = np.asarray(y_pred, dtype=np.float64)
+    pairs, counts = compress_rows(np.column_stack([y_true, y_pred]))
+    actual, predicted = pairs[:, 0], pairs[:, 1]
+    centered = actual - y_true.mean()
+    columns = np.column_stack(
+        [np.ones(len(pairs)), (actual - predicted) ** 2, centered, centered**2]
+    )
+    sums = bootstrap_sums(
+        columns,
+        counts,
+        n_replicates,
+        method=method,
+        n_jobs=n_jobs,
+        random_state=random_state,
+    )
+    n, sse, sy, syy = sums.T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mse = sse / n
+        total = syy - sy**2 / n
+        r2 = np.where(total > 0, 1 - sse / total, np.nan)
+
+    value_mse = float(np.mean((y_true - y_pred) ** 2))
+    total_ss = float(np.sum((y_true - y_true.mean()) ** 2))
+    value_r2 = 1 - value_mse * len(y_true) / total_ss if total_ss > 0 else np.nan
+    low, high = percentile_interval(np.column_stack([mse, r2]), level)
+    return pd.DataFrame(
+        {
+            "Metric": ["MSE", "R2 Score"],
+            "Value": [value_mse, value_r2],
+            "CI Low": low,
+            "CI High": high,
+        }
+    )
+
+
+def bootstrap_correlation(
+    x,
+    y,
+    counts=None,
+    n_replicates=1000,
+    level=CI_LEVEL,
+    method="multinomial",
+    n_jobs=1,
+    random_state=522,
+) -> dict:
+    """
+    Pearson r and regression slope of y on x with bootstrap intervals.
+
+    ``counts`` gives the multiplicity of each (x, y) pair, so that the
+    distinct pairs accumulated by ``SleepStats`` can be resampled as the
+    full data. Each replicate uses the sums of 1, x, y, x^2, y^2 and xy,
+    centered on the full-sample means for accuracy.
+
+    Returns
+    -------
+    dict
+        'r', 'r_ci_low', 'r_ci_high', 'slope', 'slope_ci_low' and
+        'slope_ci_high'.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    counts = np.ones(len(x)) if counts is None else np.asarray(counts, np.float64)
+    total = counts.sum()
+    xc = x - (counts @ x) / total
+    yc = y - (counts @ y) / total
+    columns = np.column_stack([np.ones(len(x)), xc, yc, xc**2, yc**2, xc * yc])
+
+    def statistics(sums):
+        n, sx, sy, sxx, syy, sxy = np.atleast_2d(sums).T
+        with np.errstate(divide="ignore", invalid="ignore"):
+            vxx = sxx - sx**2 / n
+            vyy = syy - sy**2 / n
+            vxy = sxy - sx * sy / n
+            r = np.where((vxx > 0) & (vyy > 0), vxy / np.sqrt(vxx * vyy), np.nan)
+            slope = np.where(vxx > 0, vxy / vxx, np.nan)
+        return np.column_stack([np.clip(r, -1, 1), slope])
+
+    estimate = statistics(counts @ columns)[0]
+    sums = bootstrap_sums(
+        columns,
+        counts.astype(np.int64),
+        n_replicates,
+        method=method,
+        n_jobs=n_jobs,
+        random_state=random_state,
+    )
+    low, high = percentile_interval(statistics(sums), level)
+    return {
+        "r": estimate[0],
+        "r_ci_low": low[0],
+        "r_ci_high": high[0],
+        "slope": estimate[1],
+        "slope_ci_low": low[1],
+        "slope_ci_high": high[1],
+    }
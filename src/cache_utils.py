@@ -0,0 +1,145 @@
+import glob
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+from src.artifact_utils import file_sha256
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Where stage outputs are cached, overridable with the SLEEP_CACHE_DIR variable
+DEFAULT_CACHE_DIR = os.path.join(ROOT_DIR, ".cache", "stages")
+
+
+def source_files(script: str) -> list:
+    """The stage script plus every module in src/, whose code the key covers."""
+    return [script] + sorted(glob.glob(os.path.join(ROOT_DIR, "src", "*.py")))
+
+
+def stage_key(stage: str, inputs, params: dict, sources) -> str:
+    """
+    Compute the content address of a stage run.
+
+    Parameters
+    ----------
+    stage : str
+        Name of the stage, e.g. "clean-data".
+    inputs : list of str
+        Input files; their contents are hashed.
+    params : dict
+        JSON-serializable stage parameters (CLI options, output paths).
+    sources : list of str
+        Source files whose contents are hashed.
+
+    Returns
+    -------
+    str
+        SHA-256 hex digest identifying the stage run.
+    """
+    manifest = {
+        "stage": stage,
+        "inputs": [file_sha256(p) for p in inputs],
+        "params": params,
+        "sources": [file_sha256(p) for p in sources],
+    }
+    encoded = json.dumps(manifest, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _mtime(path: str):
+    return os.stat(path).st_mtime_ns if os.path.exists(path) else None
+
+
+def _entry_dir(key: str, cache_dir: str) -> str:
+    return os.path.join(cache_dir, key[:2], key)
+
+
+def restore_stage(key: str, outputs, cache_dir: str) -> bool:
+    """Copy cached outputs back into place; return False if there is no entry."""
+    entry = _entry_dir(key, cache_dir)
+    if not os.path.isdir(entry):
+        return False
+    for i, path in enumerate(outputs):
+        out_dir = os.path.dirname(path)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+        shutil.copy2(os.path.join(entry, str(i)), path)
+    return True
+
+
+def store_stage(key: str, outputs, cache_dir: str) -> None:
+    """Copy stage outputs into the cache; the entry appears atomically."""
+    entry = _entry_dir(key, cache_dir)
+    os.makedirs(os.path.dirname(entry), exist_ok=True)
+    staging = tempfile.mkdtemp(dir=os.path.dirname(entry))
+    try:
+        for i, path in enumerate(outputs):
+            shutil.copy2(path, os.path.join(staging, str(i)))
+        with open(os.path.join(staging, "manifest.json"), "w") as f:
+            json.dump({"outputs": list(outputs)}, f, indent=2)
+        os.replace(staging, entry)
+    except OSError:
+        # Another process stored the same entry first
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def run_cached(
+    stage: str,
+    fn,
+    inputs,
+    outputs,
+    params: dict,
+    sources,
+    cache_dir: str = None,
+    enabled: bool = True,
+) -> bool:
+    """
+    Run a pipeline stage unless an identical run is already cached.
+
+    The cache key covers the input file contents, the stage parameters and
+    the source code. On a hit the outputs are restored from the cache and
+    ``fn`` is skipped; on a miss ``fn`` runs and its outputs are stored if
+    all of them were (re)written by it.
+
+    Parameters
+    ----------
+    stage : str
+        Name of the stage.
+    fn : callable
+        Runs the stage and writes ``outputs``.
+    inputs : list of str
+        Input files of the stage.
+    outputs : list of str
+        Files written by the stage.
+    params : dict
+        JSON-serializable stage parameters.
+    sources : list of str
+        Source files the stage depends on.
+    cache_dir : str, optional
+        Cache location, by default $SLEEP_CACHE_DIR or .cache/stages.
+    enabled : bool, optional
+        If False, always run ``fn`` and do not touch the cache.
+
+    Returns
+    -------
+    bool
+        True if the outputs were restored from the cache.
+    """
+    if not enabled or not all(os.path.exists(p) for p in inputs):
+        fn()
+        return False
+
+    cache_dir = cache_dir or os.environ.get("SLEEP_CACHE_DIR", DEFAULT_CACHE_DIR)
+    key = stage_key(stage, inputs, params, sources)
+    if restore_stage(key, outputs, cache_dir):
+        print(f"Cache hit for stage '{stage}': restored {len(outputs)} output(s).")
+        return True
+
+    before = {p: _mtime(p) for p in outputs}
+    fn()
+    # Only cache complete runs, not stale outputs left over from earlier ones
+    if all(_mtime(p) not in (None, before[p]) for p in outputs):
+        store_stage(key, outputs, cache_dir)
+    return False
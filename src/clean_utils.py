@@ -1,8 +1,244 @@
+import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
 
+from src.io_utils import CleanDataWriter
+from src.profile_utils import timed, timer
+from src.schema_utils import apply_clean_schema
 
-def clean_sleep_data(df: pd.DataFrame, random_state: int = 522) -> pd.DataFrame:
+# Columns to keep from the raw data
+TARGET_COLUMNS = [
+    "Person ID",
+    "Sleep Duration",
+    "Quality of Sleep",
+    "Sleep Disorder",
+    "Stress Level",
+]
+
+# renaming columns using the camel_syntax
+NAME_CONVERSION_DICT = {
+    "Person ID": "person_id",
+    "Sleep Duration": "sleep_duration",
+    "Quality of Sleep": "sleep_quality",
+    "Sleep Disorder": "sleep_disorder",
+    "Stress Level": "stress_level",
+}
+
+# Supported ways of assigning the 'train' column
+SPLIT_MODES = ("random", "hash", "stratified", "group")
+
+# Raw columns never used as a group key; by default rows are grouped on all
+# the others, so people with identical profiles land on the same side
+GROUP_EXCLUDED_COLUMNS = ["Person ID"]
+
+
+def _check_columns(columns) -> None:
+    """Raise ValueError if any of the target columns is missing."""
+    if not set(TARGET_COLUMNS).issubset(columns):
+        missing = set(TARGET_COLUMNS) - set(columns)
+        raise ValueError(
+            f"The following required columns are missing from the dataframe: {missing}"
+        )
+
+
+def _check_split(split: str) -> None:
+    """Raise ValueError for unknown split modes."""
+    if split not in SPLIT_MODES:
+        raise ValueError(
+            f"Unknown split mode '{split}', expected one of {list(SPLIT_MODES)}"
+        )
+
+
+def _group_columns(columns, group_columns=None) -> list:
+    """Columns of the group key, raising ValueError if any is missing."""
+    if group_columns is None:
+        return [c for c in columns if c not in GROUP_EXCLUDED_COLUMNS]
+    missing = set(group_columns) - set(columns)
+    if missing:
+        raise ValueError(f"Unknown group columns: {sorted(missing)}")
+    return list(group_columns)
+
+
+def _select_and_rename(df: pd.DataFrame) -> pd.DataFrame:
+    """Keep the target columns, rename them and fill missing disorders."""
+    df_clean = df[TARGET_COLUMNS].rename(columns=NAME_CONVERSION_DICT)
+    df_clean["sleep_disorder"] = df_clean["sleep_disorder"].fillna("No Disorder")
+    return df_clean
+
+
+def random_train_mask(n_rows: int, random_state: int = 522) -> np.ndarray:
+    """
+    Boolean training mask equivalent to ``train_test_split(test_size=0.2)``.
+
+    ``train_test_split`` only depends on the number of rows, so the mask can
+    be computed without holding the data itself.
+
+    Parameters
+    ----------
+    n_rows : int
+        Number of rows in the full dataset.
+    random_state : int, optional
+        Random state for the train-test split, by default 522.
+
+    Returns
+    -------
+    np.ndarray
+        Boolean array of length ``n_rows``, True for training rows.
+    """
+    from sklearn.model_selection import ShuffleSplit
+
+    mask = np.zeros(n_rows, dtype=bool)
+    if n_rows > 1:
+        splitter = ShuffleSplit(n_splits=1, test_size=0.2, random_state=random_state)
+        train_idx, _ = next(splitter.split(np.empty((n_rows, 1))))
+        mask[train_idx] = True
+    else:
+        mask[:] = True
+    return mask
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    """Vectorized splitmix64 finalizer over a uint64 array."""
+    with np.errstate(over="ignore"):
+        z = x + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def hash_train_mask(
+    person_ids, random_state: int = 522, test_size: float = 0.2
+) -> np.ndarray:
+    """
+    Boolean training mask derived from a stable hash of each person ID.
+
+    Every row is assigned independently of the others, so the mask can be
+    computed chunk by chunk or in parallel, and appending new people never
+    changes the assignment of existing ones.
+
+    Parameters
+    ----------
+    person_ids : array-like
+        Person IDs of the rows to assign.
+    random_state : int, optional
+        Seed mixed into the hash, by default 522.
+    test_size : float, optional
+        Expected fraction of rows assigned to the test set, by default 0.2.
+
+    Returns
+    -------
+    np.ndarray
+        Boolean array, True for training rows.
+    """
+    ids = pd.Series(person_ids)
+    if pd.api.types.is_integer_dtype(ids):
+        keys = ids.to_numpy().astype(np.uint64)
+    else:
+        keys = pd.util.hash_array(ids.astype(str).to_numpy())
+
+    seed = np.array([random_state & 0xFFFFFFFFFFFFFFFF], dtype=np.uint64)
+    seed = _splitmix64(seed)
+    hashed = _splitmix64(keys ^ seed)
+
+    # Top 53 bits as a uniform float in [0, 1)
+    uniform = (hashed >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+    return uniform >= test_size
+
+
+def stratified_train_mask(
+    labels, random_state: int = 522, test_size: float = 0.2
+) -> np.ndarray:
+    """
+    Boolean training mask with the same label proportions on both sides.
+
+    Equivalent to ``train_test_split(..., stratify=labels)``. The labels
+    are factorized first, so only an integer code per row is kept.
+
+    Parameters
+    ----------
+    labels : array-like
+        Class of each row, e.g. the sleep disorder.
+    random_state : int, optional
+        Random state for the split, by default 522.
+    test_size : float, optional
+        Fraction of rows assigned to the test set, by default 0.2.
+
+    Returns
+    -------
+    np.ndarray
+        Boolean array, True for training rows.
+
+    Raises
+    ------
+    ValueError
+        If a class has a single row, so that it cannot be stratified.
+    """
+    from sklearn.model_selection import StratifiedShuffleSplit
+
+    codes, _ = pd.factorize(pd.Series(labels), use_na_sentinel=False)
+    mask = np.zeros(len(codes), dtype=bool)
+    if len(codes) > 1:
+        splitter = StratifiedShuffleSplit(
+            n_splits=1, test_size=test_size, random_state=random_state
+        )
+        train_idx, _ = next(splitter.split(np.empty((len(codes), 1)), codes))
+        mask[train_idx] = True
+    else:
+        mask[:] = True
+    return mask
+
+
+def group_train_mask(
+    df: pd.DataFrame,
+    group_columns=None,
+    random_state: int = 522,
+    test_size: float = 0.2,
+) -> np.ndarray:
+    """
+    Boolean training mask keeping rows with the same group key together.
+
+    The key of a row is a hash of its values in ``group_columns``, and the
+    key rather than the person ID is passed to ``hash_train_mask``. Rows
+    with identical profiles therefore never end up on both sides of the
+    split, which would leak test rows into training. Like the hash split,
+    every row is assigned on its own, so the mask can be computed chunk by
+    chunk.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Raw data.
+    group_columns : list, optional
+        Columns forming the group key, by default every column except
+        those in GROUP_EXCLUDED_COLUMNS.
+    random_state : int, optional
+        Seed mixed into the hash, by default 522.
+    test_size : float, optional
+        Expected fraction of groups assigned to the test set, by default 0.2.
+
+    Returns
+    -------
+    np.ndarray
+        Boolean array, True for training rows.
+
+    Raises
+    ------
+    ValueError
+        If a group column is missing.
+    """
+    columns = _group_columns(df.columns, group_columns)
+    # Values are hashed as strings so that chunks with different inferred
+    # dtypes (e.g. a column that is all NaN in one chunk) agree
+    keys = pd.util.hash_pandas_object(df[columns].astype(str), index=False)
+    return hash_train_mask(keys.to_numpy(), random_state, test_size)
+
+
+@timed()
+def clean_sleep_data(
+    df: pd.DataFrame,
+    random_state: int = 522,
+    split: str = "random",
+    group_columns=None,
+) -> pd.DataFrame:
     """
     Cleans the sleep data by selecting specific columns, renaming them,
     filling missing values, and adding a 'train' column for data splitting.
@@ -13,62 +249,193 @@ def clean_sleep_data(df: pd.DataFrame, random_state: int = 522) -> pd.DataFrame:
         The raw dataframe containing sleep data.
     random_state : int, optional
         Random state for the train-test split, by default 522.
+    split : {"random", "hash", "stratified", "group"}, optional
+        How rows are assigned to the training set. "random" uses
+        ``train_test_split`` on the whole frame, "hash" uses
+        ``hash_train_mask`` on the person IDs, "stratified" keeps the
+        proportions of each sleep disorder (``stratified_train_mask``) and
+        "group" keeps identical profiles together (``group_train_mask``).
+        By default "random".
+    group_columns : list, optional
+        Raw columns forming the group key of the "group" split, by default
+        all columns except the person ID.
 
     Returns
     -------
     pd.DataFrame
-        The cleaned dataframe with the new 'train' column.
+        The cleaned dataframe with the new 'train' column, cast to the
+        compact ``CLEAN_SCHEMA`` dtypes.
 
     Raises
     ------
     ValueError
-        If required columns are missing from the input dataframe.
+        If required or group columns are missing from the input dataframe,
+        if ``split`` is not a known split mode, or if a disorder has a
+        single row in a stratified split.
     """
-    df_clean = df.copy()
-
-    # Columns to keep
-    target_columns = [
-        "Person ID",
-        "Sleep Duration",
-        "Quality of Sleep",
-        "Sleep Disorder",
-        "Stress Level",
-    ]
+    _check_split(split)
 
     # Check if all target columns exist
-    if not set(target_columns).issubset(df.columns):
-        missing = set(target_columns) - set(df.columns)
-        raise ValueError(
-            f"The following required columns are missing from the dataframe: {missing}"
-        )
-
-    df_clean = df_clean[target_columns]
-
-    # renaming columns using the camel_syntax
-    name_conversion_dict = {
-        "Person ID": "person_id",
-        "Sleep Duration": "sleep_duration",
-        "Quality of Sleep": "sleep_quality",
-        "Sleep Disorder": "sleep_disorder",
-        "Stress Level": "stress_level",
-    }
+    _check_columns(df.columns)
 
-    df_clean = df_clean.rename(columns=name_conversion_dict)
+    df_clean = _select_and_rename(df)
 
-    df_clean["sleep_disorder"] = df_clean["sleep_disorder"].fillna("No Disorder")
+    if split != "random":
+        with timer("split", mode=split):
+            if split == "hash":
+                mask = hash_train_mask(df_clean["person_id"], random_state)
+            elif split == "stratified":
+                mask = stratified_train_mask(df_clean["sleep_disorder"], random_state)
+            else:
+                mask = group_train_mask(df, group_columns, random_state)
+        df_clean["train"] = mask
+        return apply_clean_schema(df_clean)
 
     # Perform train-test split to identify training indices
     # The split parameters match the notebook: test_size=0.2
     if len(df_clean) > 1:
-        train_df, _ = train_test_split(
-            df_clean, test_size=0.2, random_state=random_state
-        )
+        from sklearn.model_selection import train_test_split
 
-        # Create 'train' column: 1 for train, 0 for test
-        df_clean["train"] = 0
-        df_clean.loc[train_df.index, "train"] = 1
+        with timer("split", mode=split):
+            train_df, _ = train_test_split(
+                df_clean, test_size=0.2, random_state=random_state
+            )
+
+            # Create 'train' column: 1 for train, 0 for test
+            df_clean["train"] = 0
+            df_clean.loc[train_df.index, "train"] = 1
     else:
         # Handle edge case where dataframe is too small to split
         df_clean["train"] = 1
 
-    return df_clean
+    return apply_clean_schema(df_clean)
+
+
+def chunk_splitter(
+    source: str,
+    split: str = "random",
+    random_state: int = 522,
+    chunksize: int = 100_000,
+    group_columns=None,
+):
+    """
+    Prepare the train split of a raw CSV that is read in chunks.
+
+    The random and stratified splits need the whole file, so it is scanned
+    once here, reading a single column; the hash and group splits assign
+    each chunk on its own.
+
+    Returns
+    -------
+    tuple
+        ``(columns, mask)``: the raw columns the chunks must include, and a
+        function ``mask(chunk, offset)`` returning the training mask of a
+        raw chunk starting at row ``offset``.
+    """
+    _check_split(split)
+    columns = ["Person ID"]
+    if split == "random":
+        n_rows = 0
+        for chunk in pd.read_csv(source, usecols=["Person ID"], chunksize=chunksize):
+            n_rows += len(chunk)
+        train_mask = random_train_mask(n_rows, random_state)
+    elif split == "stratified":
+        labels = [
+            chunk["Sleep Disorder"].fillna("No Disorder").astype("category")
+            for chunk in pd.read_csv(
+                source, usecols=["Sleep Disorder"], chunksize=chunksize
+            )
+        ]
+        labels = pd.api.types.union_categoricals(labels) if labels else []
+        train_mask = stratified_train_mask(labels, random_state)
+        del labels
+    elif split == "group":
+        header = pd.read_csv(source, nrows=0)
+        group_columns = _group_columns(header.columns, group_columns)
+        columns = group_columns
+
+    def mask(chunk, offset):
+        if split == "hash":
+            return hash_train_mask(chunk["Person ID"], random_state)
+        if split == "group":
+            return group_train_mask(chunk, group_columns, random_state)
+        return train_mask[offset : offset + len(chunk)]
+
+    return columns, mask
+
+
+def clean_sleep_data_chunked(
+    source: str,
+    dest: str,
+    random_state: int = 522,
+    chunksize: int = 100_000,
+    split: str = "random",
+    group_columns=None,
+) -> int:
+    """
+    Streaming version of ``clean_sleep_data`` for raw files larger than memory.
+
+    The raw CSV is read in chunks restricted to the target columns, and each
+    chunk is renamed, filled and appended to ``dest`` (CSV, or Parquet with
+    one row group per chunk when ``dest`` ends in .parquet). The random split needs
+    the total row count, so the file is scanned twice: once reading only
+    ``Person ID`` to count rows, and once to clean and write. Apart from a
+    one byte per row training mask, peak memory is bounded by ``chunksize``.
+    The stratified split also scans the file twice, the first time reading
+    only ``Sleep Disorder``. The hash and group splits assign each chunk on
+    its own and need a single pass.
+    The output is identical to ``clean_sleep_data`` followed by
+    ``write_clean_data(df, dest)``.
+
+    Parameters
+    ----------
+    source : str
+        Path to the raw CSV file.
+    dest : str
+        Path where the cleaned CSV or Parquet file is written.
+    random_state : int, optional
+        Random state for the train-test split, by default 522.
+    chunksize : int, optional
+        Number of rows read per chunk, by default 100_000.
+    split : {"random", "hash", "stratified", "group"}, optional
+        How rows are assigned to the training set, by default "random".
+    group_columns : list, optional
+        Raw columns forming the group key of the "group" split, by default
+        all columns except the person ID.
+
+    Returns
+    -------
+    int
+        Number of rows written.
+
+    Raises
+    ------
+    ValueError
+        If required columns are missing from the raw file, or if ``split``
+        is not a known split mode.
+    """
+    _check_split(split)
+
+    header = pd.read_csv(source, nrows=0)
+    _check_columns(header.columns)
+
+    split_columns, train_mask = chunk_splitter(
+        source, split, random_state, chunksize, group_columns
+    )
+    usecols = list(dict.fromkeys(TARGET_COLUMNS + split_columns))
+
+    written = 0
+    reader = pd.read_csv(source, usecols=usecols, chunksize=chunksize)
+    with CleanDataWriter(dest) as writer:
+        for chunk in reader:
+            df_clean = _select_and_rename(chunk)
+            df_clean["train"] = train_mask(chunk, written)
+            writer.write(apply_clean_schema(df_clean))
+            written += len(df_clean)
+
+        if written == 0:
+            # Keep the header for empty inputs, like the in-memory path
+            columns = list(NAME_CONVERSION_DICT.values()) + ["train"]
+            writer.write(pd.DataFrame(columns=columns))
+
+    return written
@@ -0,0 +1,274 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from src.metrics_utils import METRICS_FORMATS, markdown_table, write_metrics_table
+from src.model_utils import DEFAULT_SCORING, METRIC_NAMES, make_preprocessor
+from src.profile_utils import submit, timed, timer
+
+# Candidate models of the comparison, see make_model
+MODEL_NAMES = ("dummy", "ridge", "lasso", "knn", "hist_gb")
+
+# Transformed fold matrices, set once per worker process by _set_folds
+_FOLDS = None
+
+
+def _check_models(names) -> None:
+    """Raise ValueError for unknown model names."""
+    unknown = set(names) - set(MODEL_NAMES)
+    if unknown:
+        raise ValueError(
+            f"Unknown models {sorted(unknown)}, expected some of {list(MODEL_NAMES)}"
+        )
+
+
+def make_model(name: str, random_state: int = 522):
+    """
+    Unfitted regressor of the comparison, applied after ``make_preprocessor``.
+
+    "dummy" predicts the training mean, "ridge" and "lasso" are the
+    regularized linear models, "knn" averages the 10 nearest neighbours
+    and "hist_gb" is a histogram gradient boosting ensemble.
+    """
+    if name == "dummy":
+        from sklearn.dummy import DummyRegressor
+
+        return DummyRegressor(strategy="mean")
+    if name == "ridge":
+        from sklearn.linear_model import Ridge
+
+        return Ridge(alpha=1.0)
+    if name == "lasso":
+        from sklearn.linear_model import Lasso
+
+        return Lasso(alpha=0.01)
+    if name == "knn":
+        from sklearn.neighbors import KNeighborsRegressor
+
+        return KNeighborsRegressor(n_neighbors=10)
+    if name == "hist_gb":
+        from sklearn.ensemble import HistGradientBoostingRegressor
+
+        return HistGradientBoostingRegressor(random_state=random_state)
+    _check_models([name])
+
+
+@timed()
+def transform_folds(preprocessor, X, y, splits) -> list:
+    """
+    Fit the preprocessing once per fold and keep the transformed matrices.
+
+    Every candidate model then reuses the same matrices, so the
+    preprocessing cost does not grow with the number of models.
+
+    Returns
+    -------
+    list of tuple
+        ``(X_train, y_train, X_test, y_test)`` NumPy arrays per fold.
+    """
+    from sklearn.base import clone
+
+    folds = []
+    for train_idx, test_idx in splits:
+        with timer("preprocess_fold", n_train=len(train_idx)):
+            fold_preprocessor = clone(preprocessor)
+            X_train = fold_preprocessor.fit_transform(X.iloc[train_idx])
+            X_test = fold_preprocessor.transform(X.iloc[test_idx])
+        folds.append(
+            (X_train, y.iloc[train_idx].to_numpy(), X_test, y.iloc[test_idx].to_numpy())
+        )
+    return folds
+
+
+def _set_folds(folds) -> None:
+    """Pool initializer sending the fold matrices to each worker once."""
+    global _FOLDS
+    _FOLDS = folds
+
+
+def _fit_and_score_model(name, fold, scoring, random_state, folds=None, params=None):
+    """
+    Fit one candidate, with optional hyperparameters, on one cached fold
+    and score it on both sides.
+    """
+    from sklearn.metrics import get_scorer
+
+    X_train, y_train, X_test, y_test = (folds or _FOLDS)[fold]
+    with timer("fit_model", model=name, fold=fold):
+        start = time.perf_counter()
+        model = make_model(name, random_state).set_params(**(params or {}))
+        model.fit(X_train, y_train)
+        result = {"model": name, "fold": fold, "fit_time": time.perf_counter() - start}
+    for metric in scoring:
+        scorer = get_scorer(metric)
+        result[f"test_{metric}"] = scorer(model, X_test, y_test)
+        result[f"train_{metric}"] = scorer(model, X_train, y_train)
+    return result
+
+
+def run_fold_jobs(folds, jobs, scoring=DEFAULT_SCORING, n_jobs=-1, random_state=522):
+    """
+    Fit and score ``(name, fold, params)`` jobs on cached fold matrices.
+
+    With more than one worker the jobs run on a process pool that receives
+    the fold matrices once, through the pool initializer.
+
+    Yields
+    ------
+    tuple
+        ``(index, result)`` as each job finishes, where ``index`` is the
+        position of the job in ``jobs`` and ``result`` is its score dict.
+    """
+    scoring = list(scoring)
+    if n_jobs is None or n_jobs < 1:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = min(n_jobs, len(jobs))
+    if n_jobs <= 1:
+        for i, (name, fold, params) in enumerate(jobs):
+            yield i, _fit_and_score_model(
+                name, fold, scoring, random_state, folds, params
+            )
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=n_jobs, initializer=_set_folds, initargs=(folds,)
+    ) as pool:
+        futures = {
+            submit(
+                pool,
+                _fit_and_score_model,
+                name,
+                fold,
+                scoring,
+                random_state,
+                params=params,
+            ): i
+            for i, (name, fold, params) in enumerate(jobs)
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def compare_models(
+    X,
+    y,
+    models=MODEL_NAMES,
+    n_splits=5,
+    n_repeats=1,
+    scoring=DEFAULT_SCORING,
+    n_jobs=-1,
+    random_state=522,
+):
+    """
+    Cross-validates several models on the same folds.
+
+    The preprocessing is fitted once per fold (``transform_folds``) and the
+    model x fold jobs are scheduled on a process pool (``run_fold_jobs``).
+    Each worker receives the cached fold matrices once, and the jobs only
+    refer to a fold by index.
+
+    Parameters
+    ----------
+    X : pd.DataFrame
+        Feature matrix with the columns used by ``make_preprocessor``.
+    y : pd.Series
+        Target values.
+    models : sequence of str, optional
+        Names from MODEL_NAMES, by default all of them.
+    n_splits, n_repeats : int, optional
+        Folds as in ``run_cross_validation``, by default 5 and 1.
+    scoring : sequence of str, optional
+        Names of scikit-learn scorers, by default MSE and R2.
+    n_jobs : int, optional
+        Number of worker processes; 1 runs the jobs in-process and -1 uses
+        all cores. By default -1.
+    random_state : int, optional
+        Random state for repeated k-fold and the boosting model, by
+        default 522.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per model and fold with 'model', 'fold', 'fit_time' and a
+        'test_<scorer>' and 'train_<scorer>' column per scorer.
+
+    Raises
+    ------
+    ValueError
+        If a model name is unknown.
+    """
+    import pandas as pd
+    from sklearn.model_selection import KFold, RepeatedKFold
+
+    models = list(models)
+    _check_models(models)
+    if n_repeats > 1:
+        cv = RepeatedKFold(
+            n_splits=n_splits, n_repeats=n_repeats, random_state=random_state
+        )
+    else:
+        cv = KFold(n_splits=n_splits)
+    folds = transform_folds(make_preprocessor(), X, y, list(cv.split(X, y)))
+    jobs = [(name, fold, None) for name in models for fold in range(len(folds))]
+    results = dict(run_fold_jobs(folds, jobs, scoring, n_jobs, random_state))
+    return pd.DataFrame([results[i] for i in range(len(jobs))])
+
+
+def leaderboard(fold_results, sort_by="test_neg_mean_squared_error"):
+    """
+    Summarize per-fold results into one row per model, best first.
+
+    Scores are averaged over folds, with the standard deviation of the
+    sort metric. Scikit-learn scorers are "greater is better", so the
+    models are ranked by decreasing mean ``sort_by``.
+    """
+    grouped = fold_results.drop(columns="fold").groupby("model", sort=False)
+    board = grouped.mean()
+    board.insert(
+        list(board.columns).index(sort_by) + 1, f"std_{sort_by}", grouped[sort_by].std()
+    )
+    board = board.sort_values(sort_by, ascending=False).reset_index()
+    board.insert(0, "rank", range(1, len(board) + 1))
+    return board
+
+
+def run_model_comparison(
+    train_df,
+    output_prefix,
+    models=MODEL_NAMES,
+    cv_folds=5,
+    cv_repeats=1,
+    n_jobs=-1,
+    table_format=METRICS_FORMATS,
+):
+    """
+    Compares the candidate models on the training split and saves the
+    per-fold results and the leaderboard as metric tables.
+
+    Returns the leaderboard DataFrame.
+    """
+    target_col = "stress_level"
+    X_train = train_df.drop(columns=[target_col])
+    y_train = train_df[target_col]
+
+    print(f"Comparing {len(models)} models on {len(X_train)} rows...")
+    fold_results = compare_models(
+        X_train,
+        y_train,
+        models=models,
+        n_splits=cv_folds,
+        n_repeats=cv_repeats,
+        n_jobs=n_jobs,
+    ).rename(columns=METRIC_NAMES)
+    board = leaderboard(fold_results, sort_by="test_neg_MSE")
+
+    for name, df, title in [
+        ("folds", fold_results, "Model comparison by fold"),
+        ("leaderboard", board, "Model leaderboard"),
+    ]:
+        for path in write_metrics_table(
+            df, f"{output_prefix}_{name}", table_format, title=title
+        ):
+            print(f"Metrics saved to '{path}'")
+    print(markdown_table(board.round(4), "Model leaderboard"))
+    return board
@@ -1,23 +1,167 @@
+import hashlib
+import json
 import os
+import urllib.error
+import urllib.request
 from urllib.parse import urlparse
-import pandas as pd
 
+# Bytes copied per read when streaming files to disk
+CHUNK_SIZE = 1 << 20
 
-def download_csv(input_path: str, output_path: str) -> str:
+
+def _read_json(path: str) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _write_json(path: str, payload: dict) -> None:
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+
+
+def _copy_stream(src, dst, digest) -> None:
+    """Copy a binary stream in chunks, updating the running hash."""
+    for block in iter(lambda: src.read(CHUNK_SIZE), b""):
+        dst.write(block)
+        digest.update(block)
+
+
+def _check_sha256(actual: str, expected: str, path: str) -> None:
+    if expected and actual != expected.lower():
+        raise ValueError(
+            f"SHA-256 mismatch for {path}: expected {expected}, got {actual}."
+        )
+
+
+def _hash_file(path: str):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest
+
+
+def _copy_local(input_path: str, output_path: str, sha256: str) -> None:
+    """Copy a local file through a temporary file and rename it into place."""
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        digest = hashlib.sha256()
+        with open(input_path, "rb") as src, open(tmp_path, "wb") as dst:
+            _copy_stream(src, dst, digest)
+        _check_sha256(digest.hexdigest(), sha256, input_path)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _fetch_url(url: str, output_path: str, sha256: str, conditional: bool) -> None:
+    """Stream a URL to disk with conditional requests and resumable downloads."""
+    meta_path = f"{output_path}.meta.json"
+    part_path = f"{output_path}.part"
+    part_meta_path = f"{part_path}.json"
+
+    headers = {}
+    meta = _read_json(meta_path)
+    if conditional and os.path.exists(output_path) and meta.get("url") == url:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    # Resume an interrupted download if the server can tell us it is unchanged
+    part_meta = _read_json(part_meta_path)
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    validator = part_meta.get("etag") or part_meta.get("last_modified")
+    if offset and part_meta.get("url") == url and validator:
+        headers["Range"] = f"bytes={offset}-"
+        headers["If-Range"] = validator
+    else:
+        offset = 0
+
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        response = urllib.request.urlopen(request)
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            # Not modified since the last download
+            if sha256:
+                _check_sha256(_hash_file(output_path).hexdigest(), sha256, url)
+            return
+        if e.code == 416 and offset:
+            # The partial file is no longer valid, start over
+            os.remove(part_path)
+            return _fetch_url(url, output_path, sha256, conditional)
+        raise
+
+    with response:
+        validators = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        if response.status == 206:
+            digest = _hash_file(part_path)
+            mode = "ab"
+        else:
+            digest = hashlib.sha256()
+            mode = "wb"
+            _write_json(part_meta_path, validators)
+        with open(part_path, mode) as dst:
+            _copy_stream(response, dst, digest)
+
+    try:
+        _check_sha256(digest.hexdigest(), sha256, url)
+    except ValueError:
+        os.remove(part_path)
+        os.remove(part_meta_path)
+        raise
+
+    os.replace(part_path, output_path)
+    os.remove(part_meta_path)
+    _write_json(meta_path, dict(validators, sha256=digest.hexdigest()))
+
+
+def download_csv(
+    input_path: str, output_path: str, sha256: str = None, conditional: bool = True
+) -> str:
     """
     Download or copy a CSV file from a URL or local path and save it to output_path.
 
+    The raw bytes are streamed straight to disk without parsing, through a
+    temporary file that is renamed into place, so readers never see a
+    partial file. For URLs, the ETag and Last-Modified headers are kept in
+    a ``<output_path>.meta.json`` sidecar and sent back on the next call,
+    so an unchanged file is not downloaded again, and an interrupted
+    download is resumed from its ``<output_path>.part`` file.
+
     Parameters
     ----------
     input_path : str
         URL or local path to the raw CSV data.
     output_path : str
         Local path where the CSV should be saved.
+    sha256 : str, optional
+        Expected SHA-256 hex digest of the file; checked when given.
+    conditional : bool, optional
+        Whether to skip the download when the server reports the file is
+        unchanged, by default True.
 
     Returns
     -------
     str
         The path where the data was saved.
+
+    Raises
+    ------
+    FileNotFoundError
+        If a local input file does not exist.
+    ValueError
+        If the file does not match the expected SHA-256 digest.
     """
     # Create output directory if needed
     out_dir = os.path.dirname(output_path)
@@ -29,12 +173,10 @@ def download_csv(input_path: str, output_path: str) -> str:
     is_url = parsed.scheme in {"http", "https"}
 
     if is_url:
-        df = pd.read_csv(input_path)
-        df.to_csv(output_path, index=False)
+        _fetch_url(input_path, output_path, sha256, conditional)
     else:
         if not os.path.exists(input_path):
             raise FileNotFoundError(f"{input_path} not found.")
-        df = pd.read_csv(input_path)
-        df.to_csv(output_path, index=False)
+        _copy_local(input_path, output_path, sha256)
 
     return output_path
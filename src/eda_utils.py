@@ -1,86 +1,155 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.gridspec as gridspec
-import seaborn as sns
-from scipy.stats import linregress, gaussian_kde
 import numpy as np
 import os
+import pandas as pd
+
+from src.io_utils import iter_clean_data, read_clean_data, read_columns
+from src.metrics_utils import write_metrics_table
+from src.plot_utils import DENSITY_THRESHOLD, density_scatter
+from src.profile_utils import timed
+from src.render_utils import REPORT_STYLE, FigureSpec, render_figures
+from src.stats_utils import (
+    KDE_METHODS,
+    PAIR_COLUMNS,
+    SleepStats,
+    evaluate_kde,
+    scott_bandwidth,
+)
+
+# Columns of the cleaned data used by the EDA figures
+EDA_COLUMNS = ["sleep_duration", "sleep_quality", "sleep_disorder", "stress_level"]
+
+# Custom color palette from notebook
+SESHADRI = [
+    "#c3121e",
+    "#0348a1",
+    "#ffb01c",
+    "#027608",
+    "#0193b0",
+    "#9c5300",
+    "#949c01",
+    "#7104b5",
+]
 
 
-def perform_eda(input_file, output_dir):
+@timed()
+def compute_eda_stats(input_file, chunksize=None):
     """
-    Performs Exploratory Data Analysis on the training split of the data
-    and saves the resulting figures.
+    Accumulates the EDA statistics of the training split in one pass.
+
+    Returns a tuple of the ``SleepStats`` and whether a 'train' column was
+    found. ``input_file`` is a CSV or Parquet path, or an already loaded
+    DataFrame of cleaned data. With ``chunksize`` a file is streamed chunk
+    by chunk, so it does not need to fit in memory.
     """
-    # Load data
-    try:
-        df = pd.read_csv(input_file)
-    except FileNotFoundError:
-        print(f"Error: Input file '{input_file}' not found.")
-        return
+    if isinstance(input_file, pd.DataFrame):
+        df = input_file
+        has_train = "train" in df.columns
+        if has_train:
+            df = df[df["train"].astype(bool)]
+        return SleepStats.from_frame(df[EDA_COLUMNS]), has_train
 
-    # Ensure output directory exists
-    os.makedirs(output_dir, exist_ok=True)
+    has_train = "train" in read_columns(input_file)
+    train = 1 if has_train else None
 
-    # Filter for training data if the 'train' column exists
-    if "train" in df.columns:
-        train_df = df[df["train"] == 1].copy()
-        print(f"Using training subset: {len(train_df)} samples.")
+    if chunksize:
+        stats = SleepStats()
+        for chunk in iter_clean_data(
+            input_file, columns=EDA_COLUMNS, train=train, chunksize=chunksize
+        ):
+            stats.update(chunk)
     else:
-        train_df = df.copy()
-        print("Warning: 'train' column not found. Using entire dataset for EDA.")
+        df = read_clean_data(input_file, columns=EDA_COLUMNS, train=train)
+        stats = SleepStats.from_frame(df)
+    return stats, has_train
 
-    # Set plot style
-    try:
-        import scienceplots
-
-        plt.style.use(["science", "notebook", "grid"])
-    except ImportError:
-        print("Warning: 'scienceplots' not found. Using default seaborn style.")
-        sns.set_theme(style="whitegrid")
-
-    # Custom color palette from notebook
-    seshadri = [
-        "#c3121e",
-        "#0348a1",
-        "#ffb01c",
-        "#027608",
-        "#0193b0",
-        "#9c5300",
-        "#949c01",
-        "#7104b5",
-    ]
 
-    # Create figure
-    fig = plt.figure(figsize=(15, 12), dpi=100)
-    gs = gridspec.GridSpec(2, 2, figure=fig)
-    gs.update(wspace=0.21, hspace=0.21)
+def _regression_panel(
+    ax, stats, x, text_x, scatter="auto", threshold=DENSITY_THRESHOLD
+):
+    """Scatter of the distinct (x, stress) pairs with the fitted line."""
+    pairs = stats.pairs(x) if stats.n else None
+    if pairs is not None:
+        density_scatter(
+            ax,
+            pairs[x],
+            pairs["stress_level"],
+            counts=pairs["count"],
+            mode=scatter,
+            threshold=threshold,
+            color=SESHADRI[1],
+            alpha=0.8,
+        )
 
-    # PLOT 1: Sleep Duration vs Stress Level
-    ax1 = fig.add_subplot(gs[0])
-    # Check if sufficient data for regression
-    if len(train_df) > 1:
-        lr1 = linregress(y=train_df["sleep_duration"], x=train_df["stress_level"])
-        sns.regplot(
-            data=train_df,
-            x="sleep_duration",
-            y="stress_level",
-            ci=False,
-            line_kws=dict(color=seshadri[0], alpha=0.4),
-            scatter_kws=dict(color=seshadri[1]),
-            ax=ax1,
+    if stats.n > 1 and stats.variance(x) > 0:
+        lr = stats.linregress(x, "stress_level")
+        x_line = np.linspace(pairs[x].min(), pairs[x].max(), 100)
+        ax.plot(
+            x_line,
+            lr.intercept + lr.slope * x_line,
+            color=SESHADRI[0],
+            alpha=0.4,
         )
-        ax1.text(
-            0.71,
+        ax.text(
+            text_x,
             0.855,
-            f"r : {lr1.rvalue:.3f} \np : {lr1.pvalue:.3e}",
+            f"r : {lr.rvalue:.3f} \np : {lr.pvalue:.3e}",
             fontsize=14,
-            transform=ax1.transAxes,
+            transform=ax.transAxes,
             bbox=dict(facecolor="white", edgecolor="black"),
         )
+
+
+def _violin_stats(hist, gridsize=100, cut=2, kde="exact"):
+    """Violin outline and summary of one group from its stress histogram."""
+    values = hist.index.to_numpy(dtype=np.float64)
+    counts = hist.to_numpy(dtype=np.float64)
+    n = counts.sum()
+    cumulative = np.cumsum(counts) / n
+    quartiles = [values[np.searchsorted(cumulative, q)] for q in (0.25, 0.5, 0.75)]
+    result = dict(
+        mean=np.dot(values, counts) / n,
+        median=quartiles[1],
+        quartiles=(quartiles[0], quartiles[2]),
+        min=values.min(),
+        max=values.max(),
+    )
+
+    std = np.sqrt(np.dot(counts, (values - result["mean"]) ** 2) / max(n - 1, 1))
+    if n > 1 and std > 0:
+        bandwidth = scott_bandwidth(values, counts)
+        coords = np.linspace(
+            values.min() - cut * bandwidth, values.max() + cut * bandwidth, gridsize
+        )
+        result["coords"] = coords
+        result["vals"] = evaluate_kde(values, counts, coords, kde)
     else:
-        sns.scatterplot(data=train_df, x="sleep_duration", y="stress_level", ax=ax1)
+        # A single distinct value is drawn as a flat line, like seaborn does
+        result["coords"] = np.array([values.min(), values.max()])
+        result["vals"] = np.zeros(2)
+    return result
 
+
+def render_eda_summary(
+    stats,
+    kde="exact",
+    gridsize=200,
+    scatter="auto",
+    density_threshold=DENSITY_THRESHOLD,
+):
+    """
+    Draws the 2x2 EDA summary figure from the statistics of ``compute_eda_stats``
+    and returns it; see ``perform_eda`` for the options.
+    """
+    # Create figure
+    fig = plt.figure(figsize=(15, 12), dpi=100)
+    gs = gridspec.GridSpec(2, 2, figure=fig)
+    gs.update(wspace=0.21, hspace=0.21)
+
+    # PLOT 1: Sleep Duration vs Stress Level
+    ax1 = fig.add_subplot(gs[0])
+    _regression_panel(ax1, stats, "sleep_duration", 0.71, scatter, density_threshold)
     ax1.text(
         0.01,
         1.02,
@@ -95,28 +164,7 @@ def perform_eda(input_file, output_dir):
 
     # PLOT 2: Sleep Quality vs Stress Level
     ax2 = fig.add_subplot(gs[1])
-    if len(train_df) > 1:
-        lr2 = linregress(y=train_df["sleep_quality"], x=train_df["stress_level"])
-        sns.regplot(
-            data=train_df,
-            x="sleep_quality",
-            y="stress_level",
-            ci=False,
-            line_kws=dict(color=seshadri[0], alpha=0.4),
-            scatter_kws=dict(color=seshadri[1]),
-            ax=ax2,
-        )
-        ax2.text(
-            0.68,
-            0.855,
-            f"r : {lr2.rvalue:.3f} \np : {lr2.pvalue:.3e}",
-            fontsize=14,
-            transform=ax2.transAxes,
-            bbox=dict(facecolor="white", edgecolor="black"),
-        )
-    else:
-        sns.scatterplot(data=train_df, x="sleep_quality", y="stress_level", ax=ax2)
-
+    _regression_panel(ax2, stats, "sleep_quality", 0.68, scatter, density_threshold)
     ax2.text(
         0.01,
         1.02,
@@ -131,17 +179,31 @@ def perform_eda(input_file, output_dir):
 
     # PLOT 3: Violin Plot Sleep Disorder vs Stress
     ax3 = fig.add_subplot(gs[2])
-    if not train_df.empty:
-        sns.violinplot(
-            data=train_df,
-            y="sleep_disorder",
-            x="stress_level",
-            hue="sleep_disorder",
-            palette=seshadri[: len(train_df["sleep_disorder"].unique())],
-            alpha=0.7,
-            ax=ax3,
-            legend=False,
+    if stats.n:
+        disorders = stats.disorders()
+        vpstats = [
+            _violin_stats(stats.stress_histogram(d), gridsize, kde=kde)
+            for d in disorders
+        ]
+        # First disorder on top, as in a seaborn violin plot
+        positions = np.arange(len(disorders))[::-1]
+        parts = ax3.violin(
+            vpstats,
+            positions=positions,
+            orientation="horizontal",
+            widths=0.8,
+            showmeans=False,
+            showextrema=False,
         )
+        for body, color in zip(parts["bodies"], SESHADRI):
+            body.set_facecolor(color)
+            body.set_edgecolor("0.3")
+            body.set_alpha(0.7)
+        for pos, vp in zip(positions, vpstats):
+            ax3.hlines(pos, vp["min"], vp["max"], color="0.2", lw=1.5)
+            ax3.hlines(pos, *vp["quartiles"], color="0.2", lw=5)
+            ax3.scatter(vp["median"], pos, color="white", s=20, zorder=3)
+        ax3.set_yticks(positions, disorders)
     ax3.text(
         0.01,
         1.02,
@@ -156,14 +218,12 @@ def perform_eda(input_file, output_dir):
 
     # PLOT 4: Density Plot of Stress Level
     ax4 = fig.add_subplot(gs[3])
-    if len(train_df) > 1 and train_df["stress_level"].nunique() > 1:
-        kde = gaussian_kde(train_df["stress_level"])
-        x_range = np.linspace(
-            train_df["stress_level"].min(), train_df["stress_level"].max(), 200
-        )
-        y_kde = kde(x_range)
-        ax4.plot(x_range, y_kde, color=seshadri[0], linewidth=2.5, alpha=0.8)
-        ax4.fill_between(x_range, y_kde, alpha=0.3, color=seshadri[0])
+    if stats.n > 1 and len(stats.stress_histogram()) > 1:
+        hist = stats.stress_histogram()
+        x_range = np.linspace(hist.index.min(), hist.index.max(), gridsize)
+        y_kde = evaluate_kde(hist.index, hist.to_numpy(), x_range, kde)
+        ax4.plot(x_range, y_kde, color=SESHADRI[0], linewidth=2.5, alpha=0.8)
+        ax4.fill_between(x_range, y_kde, alpha=0.3, color=SESHADRI[0])
     ax4.set_xlabel("Stress Level")
     ax4.set_ylabel("Density")
     ax4.text(
@@ -176,10 +236,134 @@ def perform_eda(input_file, output_dir):
         transform=ax4.transAxes,
     )
 
-    # Save figure
-    output_path = os.path.join(output_dir, "eda_summary.png")
+    return fig
+
+
+def eda_correlations(stats, n_bootstrap=1000, n_jobs=1) -> pd.DataFrame:
+    """
+    Correlation and regression slope of stress_level on each scatter
+    panel variable, with bootstrap confidence intervals.
+
+    The r, slope and p-values are those annotated on the figure. The
+    intervals resample the distinct (x, stress_level) pairs of ``stats``
+    weighted by their counts (``bootstrap_correlation``), which is the
+    same as resampling every training row; ``n_bootstrap=0`` leaves them
+    out.
+    """
+    from src.bootstrap_utils import bootstrap_correlation
+
+    rows = []
+    for x in PAIR_COLUMNS:
+        if stats.n < 2 or stats.variance(x) == 0:
+            continue
+        lr = stats.linregress(x, "stress_level")
+        row = {
+            "variable": x,
+            "n": stats.n,
+            "r": lr.rvalue,
+            "slope": lr.slope,
+            "pvalue": lr.pvalue,
+        }
+        if n_bootstrap > 0:
+            pairs = stats.pairs(x)
+            interval = bootstrap_correlation(
+                pairs[x],
+                pairs["stress_level"],
+                pairs["count"],
+                n_replicates=n_bootstrap,
+                n_jobs=n_jobs,
+            )
+            row.update((k, v) for k, v in interval.items() if k not in ("r", "slope"))
+        rows.append(row)
+
+    # Intervals next to their estimates
+    columns = ["variable", "n", "r", "r_ci_low", "r_ci_high", "slope"]
+    columns += ["slope_ci_low", "slope_ci_high", "pvalue"]
+    df = pd.DataFrame(rows)
+    return df[[c for c in columns if c in df.columns]]
+
+
+def perform_eda(
+    input_file,
+    output_dir,
+    chunksize=None,
+    kde="exact",
+    gridsize=200,
+    scatter="auto",
+    density_threshold=DENSITY_THRESHOLD,
+    fmt="png",
+    dpi=None,
+    render=True,
+    n_bootstrap=1000,
+    bootstrap_jobs=1,
+):
+    """
+    Performs Exploratory Data Analysis on the training split of the data
+    and saves the resulting figures. The input can be a CSV or Parquet file,
+    of which only the plotted columns and the training rows are loaded, or
+    a DataFrame already in memory.
+
+    All panels and their r/p annotations are derived from one pass of
+    mergeable sufficient statistics (see ``SleepStats``). With
+    ``chunksize`` the file is streamed, so it may be larger than memory.
+
+    The densities of panels (c) and (d) are evaluated on ``gridsize``
+    points, either exactly or, with ``kde="binned"``, by linear binning
+    and FFT convolution (see ``binned_kde``). Panels (a) and (b) are drawn
+    with ``density_scatter``: above ``density_threshold`` rows the points
+    are aggregated (mode "auto"), while the regression lines and r/p values
+    always come from the full data. ``fmt="svg"`` or a low ``dpi`` give
+    quick previews.
+
+    The correlations are also written, with ``n_bootstrap`` bootstrap
+    confidence intervals drawn on ``bootstrap_jobs`` workers, to the
+    eda_correlations tables (see ``eda_correlations``).
+
+    Returns the list of figure specs; with ``render=False`` they are not
+    rendered, so that the caller can render them with other figures.
+    """
+    if kde not in KDE_METHODS:
+        raise ValueError(
+            f"Unknown KDE method '{kde}', expected one of {list(KDE_METHODS)}"
+        )
+
+    # Load data
     try:
-        plt.savefig(output_path, bbox_inches="tight")
-        print(f"EDA summary figure saved to '{output_path}'")
-    except Exception as e:
-        print(f"Error saving figure: {e}")
+        stats, has_train = compute_eda_stats(input_file, chunksize)
+    except FileNotFoundError:
+        print(f"Error: Input file '{input_file}' not found.")
+        return []
+
+    # Ensure output directory exists
+    os.makedirs(output_dir, exist_ok=True)
+
+    if has_train:
+        print(f"Using training subset: {stats.n} samples.")
+    else:
+        print("Warning: 'train' column not found. Using entire dataset for EDA.")
+
+    correlations = eda_correlations(stats, n_bootstrap, bootstrap_jobs)
+    for path in write_metrics_table(
+        correlations,
+        os.path.join(output_dir, "eda_correlations"),
+        title="Correlations with stress level",
+    ):
+        print(f"Metrics saved to '{path}'")
+
+    # Render and save the figure
+    spec = FigureSpec(
+        render_eda_summary,
+        os.path.join(output_dir, "eda_summary.png"),
+        dict(
+            stats=stats,
+            kde=kde,
+            gridsize=gridsize,
+            scatter=scatter,
+            density_threshold=density_threshold,
+        ),
+        label="EDA summary figure",
+        style=REPORT_STYLE,
+    )
+    if render:
+        render_figures([spec], fmt=fmt, dpi=dpi)
+    return [spec]
@@ -0,0 +1,330 @@
+"""
+Feature matrix of all the raw columns, built chunk by chunk.
+
+The matrix is stored as CSR for its encoding, not to save memory: every
+row stores its 8 numeric features and one 1 per categorical feature, 12
+entries out of the 27 columns of the bundled data. At 4 bytes of float32
+value and 4 of int32 column index per entry, that is about 96 bytes per
+row against 108 for a dense float32 row, so the sparse layout only wins
+when the categorical features have many more categories. What bounds
+memory is the chunked build, which writes each chunk straight into
+arrays allocated once for the whole file.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.clean_utils import chunk_splitter
+from src.profile_utils import timed, timer
+
+# Raw columns of the full feature set and their clean names
+FEATURE_NAME_DICT = {
+    "Gender": "gender",
+    "Age": "age",
+    "Occupation": "occupation",
+    "Sleep Duration": "sleep_duration",
+    "Quality of Sleep": "sleep_quality",
+    "Physical Activity Level": "physical_activity",
+    "Stress Level": "stress_level",
+    "BMI Category": "bmi_category",
+    "Blood Pressure": "blood_pressure",
+    "Heart Rate": "heart_rate",
+    "Daily Steps": "daily_steps",
+    "Sleep Disorder": "sleep_disorder",
+}
+
+# Numeric features, stored as they are in the matrix
+NUMERIC_FEATURES = [
+    "age",
+    "sleep_duration",
+    "sleep_quality",
+    "physical_activity",
+    "heart_rate",
+    "daily_steps",
+    "systolic_bp",
+    "diastolic_bp",
+]
+
+# Categorical features, one-hot encoded in the matrix
+CATEGORICAL_FEATURES = ["gender", "occupation", "bmi_category", "sleep_disorder"]
+
+# Raw BMI labels of the same category
+BMI_ALIASES = {"Normal Weight": "Normal"}
+
+
+def split_blood_pressure(blood_pressure: pd.Series) -> pd.DataFrame:
+    """
+    Split "systolic/diastolic" readings such as "126/83" into two integers.
+
+    Parameters
+    ----------
+    blood_pressure : pd.Series
+        Readings as strings.
+
+    Returns
+    -------
+    pd.DataFrame
+        'systolic_bp' and 'diastolic_bp' int16 columns, with the index of
+        the input.
+
+    Raises
+    ------
+    ValueError
+        If a reading is missing or not two integers separated by "/".
+    """
+    parts = blood_pressure.astype("string").str.extract(r"^\s*(\d+)\s*/\s*(\d+)\s*$")
+    bad = parts[0].isna()
+    if bad.any():
+        examples = blood_pressure[bad].head(3).tolist()
+        raise ValueError(
+            f"{int(bad.sum())} blood pressure readings are not 'systolic/diastolic', "
+            f"e.g. {examples}"
+        )
+    parts.columns = ["systolic_bp", "diastolic_bp"]
+    return parts.astype("int16")
+
+
+def clean_feature_data(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cleans the raw columns of the full feature set.
+
+    Columns are renamed as in ``FEATURE_NAME_DICT``, missing disorders
+    become "No Disorder", "Normal Weight" is merged into "Normal" and the
+    blood pressure is split into 'systolic_bp' and 'diastolic_bp'.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Raw sleep data, with at least the columns of ``FEATURE_NAME_DICT``.
+
+    Returns
+    -------
+    pd.DataFrame
+        The features and 'stress_level', numeric columns first.
+
+    Raises
+    ------
+    ValueError
+        If columns are missing or a blood pressure reading is malformed.
+    """
+    missing = set(FEATURE_NAME_DICT) - set(df.columns)
+    if missing:
+        raise ValueError(
+            f"The following required columns are missing from the dataframe: {missing}"
+        )
+    clean = df[list(FEATURE_NAME_DICT)].rename(columns=FEATURE_NAME_DICT)
+    clean["sleep_disorder"] = clean["sleep_disorder"].fillna("No Disorder")
+    clean["bmi_category"] = clean["bmi_category"].replace(BMI_ALIASES)
+    clean = clean.join(split_blood_pressure(clean.pop("blood_pressure")))
+    return clean[NUMERIC_FEATURES + CATEGORICAL_FEATURES + ["stress_level"]]
+
+
+def feature_names(categories: dict) -> list:
+    """Names of the matrix columns: numeric features, then one per category."""
+    return NUMERIC_FEATURES + [
+        f"{column}={value}"
+        for column in CATEGORICAL_FEATURES
+        for value in categories[column]
+    ]
+
+
+def encode_features(clean: pd.DataFrame, categories: dict):
+    """
+    Encode cleaned features as a CSR matrix without a dense intermediate.
+
+    Every row has one entry per numeric feature and a single 1 per
+    categorical feature, so the CSR arrays are built directly: the column
+    of a one-hot entry is the offset of its feature plus the category code.
+    Explicit zeros are dropped.
+
+    Parameters
+    ----------
+    clean : pd.DataFrame
+        Output of ``clean_feature_data``.
+    categories : dict
+        Sorted categories of each categorical feature.
+
+    Returns
+    -------
+    scipy.sparse.csr_matrix
+        float32 matrix with ``len(feature_names(categories))`` columns.
+
+    Raises
+    ------
+    ValueError
+        If a value is not among the given categories.
+    """
+    from scipy import sparse
+
+    n_rows = len(clean)
+    n_numeric = len(NUMERIC_FEATURES)
+    per_row = n_numeric + len(CATEGORICAL_FEATURES)
+
+    data = np.ones((n_rows, per_row), dtype=np.float32)
+    indices = np.empty((n_rows, per_row), dtype=np.int32)
+    data[:, :n_numeric] = clean[NUMERIC_FEATURES].to_numpy(dtype=np.float32)
+    indices[:, :n_numeric] = np.arange(n_numeric)
+
+    offset = n_numeric
+    for i, column in enumerate(CATEGORICAL_FEATURES):
+        codes = pd.Categorical(clean[column], categories=categories[column]).codes
+        if (codes < 0).any():
+            unknown = sorted(set(clean[column][codes < 0]))
+            raise ValueError(f"Unknown {column} categories: {unknown}")
+        indices[:, n_numeric + i] = offset + codes
+        offset += len(categories[column])
+
+    matrix = sparse.csr_matrix(
+        (
+            data.ravel(),
+            indices.ravel(),
+            np.arange(0, n_rows * per_row + 1, per_row, dtype=np.int64),
+        ),
+        shape=(n_rows, offset),
+    )
+    matrix.eliminate_zeros()
+    return matrix
+
+
+def scan_categories(source: str, chunksize: int = 100_000):
+    """
+    Sorted categories of each categorical feature in a raw CSV, and its
+    number of rows.
+    """
+    raw_columns = {v: k for k, v in FEATURE_NAME_DICT.items()}
+    usecols = [raw_columns[c] for c in CATEGORICAL_FEATURES]
+    seen = {column: set() for column in CATEGORICAL_FEATURES}
+    n_rows = 0
+    for chunk in pd.read_csv(source, usecols=usecols, chunksize=chunksize):
+        n_rows += len(chunk)
+        chunk = chunk.rename(columns=FEATURE_NAME_DICT)
+        chunk["sleep_disorder"] = chunk["sleep_disorder"].fillna("No Disorder")
+        chunk["bmi_category"] = chunk["bmi_category"].replace(BMI_ALIASES)
+        for column in CATEGORICAL_FEATURES:
+            seen[column].update(chunk[column].dropna().unique())
+    return {column: sorted(values) for column, values in seen.items()}, n_rows
+
+
+@timed()
+def build_feature_matrix(
+    source: str,
+    split: str = "random",
+    random_state: int = 522,
+    chunksize: int = 100_000,
+    group_columns=None,
+) -> dict:
+    """
+    Builds the sparse feature matrix of a raw CSV, chunk by chunk.
+
+    A first pass collects the categories of the categorical features and
+    counts the rows (``scan_categories``), so that every chunk is encoded
+    with the same columns and the CSR arrays of the whole matrix are
+    allocated once, at their largest possible size. Each chunk is then
+    cleaned (``clean_feature_data``), given its train split as in
+    ``clean_sleep_data_chunked``, encoded (``encode_features``) and copied
+    into place, so peak memory is the final matrix plus one chunk.
+
+    Parameters
+    ----------
+    source : str
+        Path to the raw CSV file.
+    split : {"random", "hash", "stratified", "group"}, optional
+        How rows are assigned to the training set, by default "random".
+    random_state : int, optional
+        Random state for the train-test split, by default 522.
+    chunksize : int, optional
+        Number of rows read per chunk, by default 100_000.
+    group_columns : list, optional
+        Raw columns forming the group key of the "group" split.
+
+    Returns
+    -------
+    dict
+        'X' (CSR matrix), 'y' (stress levels), 'train' (bool mask) and
+        'feature_names', as saved by ``save_feature_matrix``.
+    """
+    from scipy import sparse
+
+    categories, n_rows = scan_categories(source, chunksize)
+    split_columns, train_mask = chunk_splitter(
+        source, split, random_state, chunksize, group_columns
+    )
+    usecols = list(dict.fromkeys(list(FEATURE_NAME_DICT) + split_columns))
+    names = feature_names(categories)
+
+    # Every row has at most one entry per feature
+    max_nnz = n_rows * (len(NUMERIC_FEATURES) + len(CATEGORICAL_FEATURES))
+    data = np.empty(max_nnz, dtype=np.float32)
+    indices = np.empty(max_nnz, dtype=np.int32)
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    y = np.empty(n_rows, dtype=np.int8)
+    train = np.empty(n_rows, dtype=bool)
+
+    offset, nnz = 0, 0
+    for chunk in pd.read_csv(source, usecols=usecols, chunksize=chunksize):
+        end = offset + len(chunk)
+        if end > n_rows:
+            raise ValueError(f"'{source}' grew while the feature matrix was built")
+        with timer("encode_chunk", n_rows=len(chunk)):
+            clean = clean_feature_data(chunk)
+            block = encode_features(clean, categories)
+            data[nnz : nnz + block.nnz] = block.data
+            indices[nnz : nnz + block.nnz] = block.indices
+            indptr[offset + 1 : end + 1] = block.indptr[1:] + nnz
+            y[offset:end] = clean["stress_level"].to_numpy(dtype=np.int8)
+            train[offset:end] = train_mask(chunk, offset)
+        offset, nnz = end, nnz + block.nnz
+
+    return {
+        "X": sparse.csr_matrix(
+            (data[:nnz], indices[:nnz], indptr[: offset + 1]),
+            shape=(offset, len(names)),
+            copy=False,
+        ),
+        "y": y[:offset],
+        "train": train[:offset],
+        "feature_names": names,
+    }
+
+
+def save_feature_matrix(features: dict, path: str) -> str:
+    """
+    Save a feature matrix, its target, split and column names to one .npz.
+
+    Only the CSR arrays are written, so the file is as small as the
+    matrix is sparse.
+    """
+    import os
+
+    out_dir = os.path.dirname(path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    X = features["X"]
+    with open(path, "wb") as f:
+        np.savez(
+            f,
+            data=X.data,
+            indices=X.indices,
+            indptr=X.indptr,
+            shape=np.asarray(X.shape),
+            y=features["y"],
+            train=features["train"],
+            feature_names=np.asarray(features["feature_names"], dtype=str),
+        )
+    return path
+
+
+def load_feature_matrix(path: str) -> dict:
+    """Load a feature matrix written by ``save_feature_matrix``."""
+    from scipy import sparse
+
+    with np.load(path) as npz:
+        return {
+            "X": sparse.csr_matrix(
+                (npz["data"], npz["indices"], npz["indptr"]),
+                shape=tuple(npz["shape"]),
+            ),
+            "y": npz["y"],
+            "train": npz["train"],
+            "feature_names": npz["feature_names"].tolist(),
+        }
@@ -0,0 +1,255 @@
+import os
+
+import pandas as pd
+
+from src.profile_utils import timer
+from src.schema_utils import CLEAN_SCHEMA, apply_clean_schema
+
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+
+
+def is_parquet(path: str) -> bool:
+    """Return True if the path has a Parquet file extension."""
+    return str(path).lower().endswith(PARQUET_EXTENSIONS)
+
+
+def _import_pyarrow():
+    """Import pyarrow lazily with a helpful message when it is missing."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "Reading or writing Parquet files requires 'pyarrow' to be installed."
+        ) from e
+    return pyarrow
+
+
+def _clean_arrow_schema(df: pd.DataFrame):
+    """Arrow schema matching ``CLEAN_SCHEMA``; other columns keep their dtype."""
+    pa = _import_pyarrow()
+    types = {
+        "int64": pa.int64(),
+        "int8": pa.int8(),
+        "float32": pa.float32(),
+        "bool": pa.bool_(),
+        "category": pa.dictionary(pa.int8(), pa.string()),
+    }
+    inferred = pa.Schema.from_pandas(df, preserve_index=False)
+    return pa.schema(
+        [
+            (c, types[CLEAN_SCHEMA[c]] if c in CLEAN_SCHEMA else inferred.field(c).type)
+            for c in df.columns
+        ]
+    )
+
+
+def read_columns(path: str) -> list:
+    """
+    Read the column names of a cleaned data file without loading any rows.
+
+    Parameters
+    ----------
+    path : str
+        Path to a CSV or Parquet file.
+
+    Returns
+    -------
+    list
+        Column names in file order.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the file does not exist.
+    """
+    if is_parquet(path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{path} not found.")
+        _import_pyarrow()
+        import pyarrow.parquet as pq
+
+        return list(pq.read_schema(path).names)
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def _projection(path: str, columns, train):
+    """Columns to return and columns to read for a projected, filtered load."""
+    file_columns = read_columns(path)
+    if columns is None:
+        columns = file_columns
+    selected = [c for c in file_columns if c in columns]
+    read_cols = selected
+    if train is not None and "train" not in selected:
+        read_cols = selected + ["train"]
+    return selected, read_cols
+
+
+def read_clean_data(path: str, columns=None, train=None) -> pd.DataFrame:
+    """
+    Read a cleaned data file, loading only the requested columns and rows.
+
+    For Parquet files the column projection and the ``train`` filter are
+    pushed down to the reader, so unused columns are never decoded and row
+    groups without matching rows are skipped. CSV files are parsed with
+    ``usecols`` and filtered after parsing. The declared ``CLEAN_SCHEMA``
+    dtypes are applied to the result.
+
+    Parameters
+    ----------
+    path : str
+        Path to a CSV or Parquet file.
+    columns : list, optional
+        Columns to load. Requested columns that are not in the file are
+        ignored. By default all columns are loaded.
+    train : int, optional
+        If given, only rows whose 'train' column equals this value are kept.
+
+    Returns
+    -------
+    pd.DataFrame
+        The requested subset of the data.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the file does not exist.
+    """
+    selected, read_cols = _projection(path, columns, train)
+
+    if is_parquet(path):
+        filters = [("train", "==", bool(train))] if train is not None else None
+        with timer("read_parquet", path=path, train=train):
+            df = pd.read_parquet(
+                path, columns=read_cols, filters=filters, engine="pyarrow"
+            )
+    else:
+        with timer("read_csv", path=path, train=train):
+            df = pd.read_csv(path, usecols=lambda c: c in read_cols)
+            if train is not None:
+                df = df[df["train"] == train]
+
+    return apply_clean_schema(df[selected])
+
+
+def iter_clean_data(path: str, columns=None, train=None, chunksize: int = 100_000):
+    """
+    Iterate over a cleaned data file in chunks of at most ``chunksize`` rows.
+
+    Takes the same projection and filter arguments as ``read_clean_data``,
+    but never holds more than one chunk in memory.
+
+    Parameters
+    ----------
+    path : str
+        Path to a CSV or Parquet file.
+    columns : list, optional
+        Columns to load; requested columns not in the file are ignored.
+    train : int, optional
+        If given, only rows whose 'train' column equals this value are kept.
+    chunksize : int, optional
+        Maximum number of rows per chunk, by default 100_000.
+
+    Yields
+    ------
+    pd.DataFrame
+        Consecutive chunks of the requested data.
+    """
+    selected, read_cols = _projection(path, columns, train)
+
+    if is_parquet(path):
+        _import_pyarrow()
+        import pyarrow.dataset as ds
+
+        dataset = ds.dataset(path, format="parquet")
+        flt = ds.field("train") == bool(train) if train is not None else None
+        for batch in dataset.to_batches(
+            columns=read_cols, filter=flt, batch_size=chunksize
+        ):
+            if batch.num_rows:
+                yield apply_clean_schema(batch.to_pandas()[selected])
+    else:
+        reader = pd.read_csv(
+            path, usecols=lambda c: c in read_cols, chunksize=chunksize
+        )
+        for chunk in reader:
+            if train is not None:
+                chunk = chunk[chunk["train"] == train]
+            yield apply_clean_schema(chunk[selected])
+
+
+class CleanDataWriter:
+    """
+    Incrementally write cleaned data chunks to a CSV or Parquet file.
+
+    The format is inferred from the file extension. CSV output gets the
+    header with the first chunk only and stores 'train' as 0/1; Parquet
+    output follows ``CLEAN_SCHEMA`` and gets one row group per chunk.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rows = 0
+        self._schema = None
+        self._file = None
+        self._writer = None
+
+        out_dir = os.path.dirname(path)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+
+    def write(self, df: pd.DataFrame) -> None:
+        """Append a chunk of cleaned data."""
+        if is_parquet(self.path):
+            pa = _import_pyarrow()
+            import pyarrow.parquet as pq
+
+            df = apply_clean_schema(df)
+            if self._schema is None:
+                self._schema = _clean_arrow_schema(df)
+                self._writer = pq.ParquetWriter(self.path, self._schema)
+            table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+            self._writer.write_table(table)
+        else:
+            header = self._file is None
+            if header:
+                self._file = open(self.path, "w", newline="")
+            bool_cols = df.select_dtypes("bool").columns
+            df = df.astype({c: "int8" for c in bool_cols})
+            df.to_csv(self._file, index=False, header=header)
+        self.rows += len(df)
+
+    def close(self) -> None:
+        """Flush and close the underlying file."""
+        if self._writer is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def write_clean_data(df: pd.DataFrame, path: str) -> str:
+    """
+    Write a cleaned dataframe to CSV or Parquet, depending on the extension.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The cleaned data.
+    path : str
+        Destination path ending in .csv, .parquet or .pq.
+
+    Returns
+    -------
+    str
+        The path where the data was saved.
+    """
+    with CleanDataWriter(path) as writer:
+        writer.write(df)
+    return path
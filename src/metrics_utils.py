@@ -0,0 +1,179 @@
+import json
+import os
+
+# Structured formats metric tables can be written in
+METRICS_FORMATS = ("csv", "json", "md")
+
+
+def _check_formats(formats) -> None:
+    """Raise ValueError for unknown metrics formats."""
+    unknown = set(formats) - set(METRICS_FORMATS)
+    if unknown:
+        raise ValueError(
+            f"Unknown metrics formats {sorted(unknown)}, "
+            f"expected some of {list(METRICS_FORMATS)}"
+        )
+
+
+def _to_builtin(value):
+    """JSON encoder fallback for numpy scalars and arrays."""
+    import numpy as np
+
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def json_safe(value):
+    """
+    Copy of nested dicts and lists with NaN and infinite floats as None.
+
+    ``json.dump`` writes them as bare ``NaN``/``Infinity``, which strict
+    parsers (``JSON.parse``, jq) reject; the result can be dumped with
+    ``allow_nan=False``.
+    """
+    import math
+
+    import numpy as np
+
+    if isinstance(value, dict):
+        return {k: json_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [json_safe(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def markdown_table(df, title=None, floatfmt=".4f") -> str:
+    """
+    Format a DataFrame as a GitHub-flavoured Markdown table.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Table to format; the index is not included.
+    title : str, optional
+        Heading written above the table.
+    floatfmt : str, optional
+        Format spec of float cells, by default ".4f".
+
+    Returns
+    -------
+    str
+        The Markdown text.
+    """
+    import numpy as np
+    import pandas as pd
+
+    def cell(value):
+        if isinstance(value, (float, np.floating)):
+            return format(value, floatfmt)
+        return str(value).replace("|", "\\|")
+
+    lines = [f"### {title}", ""] if title else []
+    lines.append("| " + " | ".join(cell(c) for c in df.columns) + " |")
+    lines.append(
+        "| "
+        + " | ".join(
+            "---:" if pd.api.types.is_numeric_dtype(df[c]) else "---"
+            for c in df.columns
+        )
+        + " |"
+    )
+    for row in df.itertuples(index=False):
+        lines.append("| " + " | ".join(cell(v) for v in row) + " |")
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics_table(df, prefix: str, formats=METRICS_FORMATS, title=None) -> list:
+    """
+    Write a table of metrics as CSV, JSON and/or Markdown.
+
+    The CSV and JSON files keep full precision and can be read back with
+    ``pd.read_csv`` / ``pd.read_json``; the JSON file is a list of row
+    records, with missing values (e.g. undefined confidence bounds) as
+    null. The Markdown file is meant for reports and CI summaries.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Table of metrics, e.g. one row per CV fold.
+    prefix : str
+        Output path without extension, e.g. results/model_analysis_cv_results.
+    formats : iterable of str, optional
+        Any of METRICS_FORMATS, by default all of them.
+    title : str, optional
+        Heading of the Markdown table.
+
+    Returns
+    -------
+    list of str
+        Paths of the written files.
+
+    Raises
+    ------
+    ValueError
+        If a format is unknown.
+    """
+    _check_formats(formats)
+    out_dir = os.path.dirname(prefix)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+
+    paths = []
+    for fmt in METRICS_FORMATS:
+        if fmt not in formats:
+            continue
+        path = f"{prefix}.{fmt}"
+        if fmt == "csv":
+            df.to_csv(path, index=False)
+        elif fmt == "json":
+            with open(path, "w") as f:
+                json.dump(
+                    json_safe(df.to_dict(orient="records")),
+                    f,
+                    indent=2,
+                    default=_to_builtin,
+                    allow_nan=False,
+                )
+        else:
+            with open(path, "w") as f:
+                f.write(markdown_table(df, title))
+        paths.append(path)
+    return paths
+
+
+def append_metrics_log(path: str, record: dict) -> None:
+    """
+    Append one run's record to a JSON Lines metrics log.
+
+    Each line is a self-contained JSON object, so the log can grow over
+    thousands of runs and still be appended to without reading it.
+    """
+    out_dir = os.path.dirname(path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    line = json.dumps(
+        json_safe(record), sort_keys=True, default=_to_builtin, allow_nan=False
+    )
+    with open(path, "a") as f:
+        f.write(line + "\n")
+
+
+def read_metrics_log(path: str):
+    """
+    Load a metrics log as a DataFrame with one row per run.
+
+    Nested fields are flattened with dotted names, e.g. 'metrics.test_MSE'
+    or 'params.alpha', so that runs can be filtered and compared directly.
+    """
+    import pandas as pd
+
+    with open(path) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return pd.json_normalize(records)
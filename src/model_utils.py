@@ -1,10 +1,376 @@
-import matplotlib.pyplot as plt
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
+from src.metrics_utils import METRICS_FORMATS, append_metrics_log, write_metrics_table
+from src.plot_utils import DENSITY_THRESHOLD, density_scatter
+from src.profile_utils import submit, timed, timer
+from src.render_utils import REPORT_STYLE, FigureSpec, render_figures
 
-def save_df_as_png(df, filename, title=None):
+# numpy, pandas, scikit-learn and matplotlib are imported in the functions
+# that use them, so that importing this module (e.g. for DEFAULT_SCORING in
+# a CLI's --help) stays fast
+
+# Scorers used by the model stage unless others are requested
+DEFAULT_SCORING = ("neg_mean_squared_error", "r2")
+
+# Short names of the scorer columns in the metric tables
+METRIC_NAMES = {
+    "test_neg_mean_squared_error": "test_neg_MSE",
+    "train_neg_mean_squared_error": "train_neg_MSE",
+}
+
+# Columns of the cleaned data used for modeling
+MODEL_COLUMNS = ["sleep_duration", "sleep_quality", "sleep_disorder", "stress_level"]
+
+
+def make_preprocessor():
     """
-    Saves a pandas DataFrame as a PNG table.
+    Column transformer of the model features: sleep_duration is
+    standardized, sleep_disorder one-hot encoded and sleep_quality passed
+    through unchanged.
+    """
+    from sklearn.compose import make_column_transformer
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+    # Note: remainder='passthrough' is crucial to keep sleep_quality which isn't transformed
+    return make_column_transformer(
+        (StandardScaler(), ["sleep_duration"]),
+        (OneHotEncoder(), ["sleep_disorder"]),
+        remainder="passthrough",
+    )
+
+
+def deduplicate_rows(X, y):
+    """
+    Collapses identical (features, target) rows into weighted unique rows.
+
+    Fitting a ridge pipeline on the unique rows with their counts as
+    ``sample_weight`` (see ``fit_weighted``) gives the same model as
+    fitting on every row, since the scaler statistics and the squared
+    loss are both weighted sums over rows.
+
+    Parameters
+    ----------
+    X : pd.DataFrame
+        Feature matrix.
+    y : pd.Series
+        Target values.
+
+    Returns
+    -------
+    X_unique : pd.DataFrame
+        Distinct rows of X, in order of first appearance.
+    y_unique : pd.Series
+        Target of each distinct row.
+    weights : np.ndarray
+        Number of rows each distinct row stands for.
+    """
+    import numpy as np
+
+    target = y.name if y.name is not None else "__target__"
+    df = X.assign(**{target: y.to_numpy()})
+    counts = (
+        df.groupby(list(df.columns), observed=True, sort=False, dropna=False)
+        .size()
+        .reset_index(name="__weight__")
+    )
+    weights = counts.pop("__weight__").to_numpy(dtype=np.float64)
+    y_unique = counts.pop(target).rename(y.name)
+    X_unique = counts.astype(X.dtypes.to_dict())
+    return X_unique, y_unique, weights
+
+
+def fit_weighted(estimator, X, y, sample_weight=None):
+    """
+    Fits an estimator, routing ``sample_weight`` to every step accepting it.
+
+    Pipelines and column transformers only forward sample weights with
+    scikit-learn's metadata routing, so it is enabled for the fit and
+    requested from each step whose ``fit`` takes ``sample_weight``.
+    Without weights this is a plain ``estimator.fit(X, y)``.
+    """
+    import inspect
+
+    import sklearn
+
+    if sample_weight is None:
+        return estimator.fit(X, y)
+    with sklearn.config_context(enable_metadata_routing=True):
+        steps = [estimator, *estimator.get_params(deep=True).values()]
+        for step in steps:
+            fit = getattr(step, "fit", None)
+            if (
+                hasattr(step, "set_fit_request")
+                and fit is not None
+                and "sample_weight" in inspect.signature(fit).parameters
+            ):
+                step.set_fit_request(sample_weight=True)
+        return estimator.fit(X, y, sample_weight=sample_weight)
+
+
+def _take_rows(values, index):
+    """Rows of a DataFrame, Series, array or sparse matrix by position."""
+    if hasattr(values, "iloc"):
+        return values.iloc[index]
+    return values[index]
+
+
+def _fit_and_score_fold(
+    estimator, X, y, train_idx, test_idx, scoring, sample_weight=None
+):
+    """Fit a clone of the estimator on one fold and score it on both sides."""
+    from sklearn.base import clone
+    from sklearn.metrics import get_scorer
+
+    with timer("cv_fold", n_train=len(train_idx), n_test=len(test_idx)):
+        start = time.perf_counter()
+        estimator = clone(estimator)
+        X_train, y_train = _take_rows(X, train_idx), _take_rows(y, train_idx)
+        X_test, y_test = _take_rows(X, test_idx), _take_rows(y, test_idx)
+        w_train = w_test = None
+        if sample_weight is not None:
+            w_train, w_test = sample_weight[train_idx], sample_weight[test_idx]
+
+        fit_weighted(estimator, X_train, y_train, w_train)
+        fit_time = time.perf_counter() - start
+
+        score_start = time.perf_counter()
+        result = {"fit_time": fit_time}
+        for name in scoring:
+            scorer = get_scorer(name)
+            result[f"test_{name}"] = scorer(
+                estimator, X_test, y_test, sample_weight=w_test
+            )
+            result[f"train_{name}"] = scorer(
+                estimator, X_train, y_train, sample_weight=w_train
+            )
+        result["score_time"] = time.perf_counter() - score_start
+        result["wall_time"] = time.perf_counter() - start
+    return result
+
+
+def _make_executor(n_jobs, backend):
+    """Create a process or thread pool with n_jobs workers (-1 for all cores)."""
+    if n_jobs is None or n_jobs < 1:
+        n_jobs = os.cpu_count() or 1
+    if backend == "process":
+        return ProcessPoolExecutor(max_workers=n_jobs)
+    if backend == "thread":
+        return ThreadPoolExecutor(max_workers=n_jobs)
+    raise ValueError(f"Unknown backend '{backend}', expected 'process' or 'thread'")
+
+
+@timed()
+def run_cross_validation(
+    estimator,
+    X,
+    y,
+    n_splits=5,
+    n_repeats=1,
+    scoring=DEFAULT_SCORING,
+    n_jobs=1,
+    backend="process",
+    random_state=522,
+    sample_weight=None,
+):
+    """
+    Cross-validates an estimator, optionally running the folds in parallel.
+
+    With a single repeat the folds are the unshuffled ``KFold`` that
+    ``cross_validate(cv=n_splits)`` uses for regressors, so results match it.
+    More repeats use ``RepeatedKFold`` seeded with ``random_state``.
+
+    Parameters
+    ----------
+    estimator : estimator object
+        Unfitted scikit-learn estimator or pipeline; it is cloned per fold.
+    X : pd.DataFrame, np.ndarray or sparse matrix
+        Feature matrix.
+    y : pd.Series or np.ndarray
+        Target values.
+    n_splits : int, optional
+        Number of folds, by default 5.
+    n_repeats : int, optional
+        Number of repetitions of the k-fold split, by default 1.
+    scoring : sequence of str, optional
+        Names of scikit-learn scorers, by default MSE and R2.
+    n_jobs : int, optional
+        Number of workers; 1 runs the folds in-process and -1 uses all cores.
+        By default 1.
+    backend : {"process", "thread"}, optional
+        Pool used when n_jobs is not 1, by default "process".
+    random_state : int, optional
+        Random state for repeated k-fold, by default 522.
+    sample_weight : array-like, optional
+        Weight of each row, e.g. from ``deduplicate_rows``; used both to
+        fit and to score each fold.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per fold with 'repeat', 'fold', 'fit_time', 'score_time',
+        'wall_time' and a 'test_<scorer>' and 'train_<scorer>' column per scorer.
+    """
+    import numpy as np
+    import pandas as pd
+    from sklearn.model_selection import KFold, RepeatedKFold
+
+    if n_repeats > 1:
+        cv = RepeatedKFold(
+            n_splits=n_splits, n_repeats=n_repeats, random_state=random_state
+        )
+    else:
+        cv = KFold(n_splits=n_splits)
+    splits = list(cv.split(X, y))
+    scoring = list(scoring)
+    if sample_weight is not None:
+        sample_weight = np.asarray(sample_weight, dtype=np.float64)
+    args = (estimator, X, y)
+
+    if n_jobs == 1:
+        results = [
+            _fit_and_score_fold(*args, tr, te, scoring, sample_weight)
+            for tr, te in splits
+        ]
+    else:
+        with _make_executor(n_jobs, backend) as executor:
+            futures = [
+                submit(
+                    executor,
+                    _fit_and_score_fold,
+                    *args,
+                    tr,
+                    te,
+                    scoring,
+                    sample_weight,
+                )
+                for tr, te in splits
+            ]
+            results = [f.result() for f in futures]
+
+    cv_results_df = pd.DataFrame(results)
+    cv_results_df.insert(0, "fold", np.arange(len(splits)) % n_splits)
+    cv_results_df.insert(0, "repeat", np.arange(len(splits)) // n_splits)
+    columns = ["repeat", "fold", "fit_time", "score_time", "wall_time"]
+    for name in scoring:
+        columns += [f"test_{name}", f"train_{name}"]
+    return cv_results_df[columns]
+
+
+def ridge_path(X, y, alphas):
+    """
+    Solves ridge regression with an intercept for many alphas at once.
+
+    The centered Gram matrix is eigendecomposed once, after which every
+    alpha only costs a diagonal rescaling. Results match ``Ridge`` with
+    ``fit_intercept=True``.
+
+    Parameters
+    ----------
+    X : array-like of shape (n_samples, n_features)
+        Dense feature matrix.
+    y : array-like of shape (n_samples,)
+        Target values.
+    alphas : array-like of shape (n_alphas,)
+        Strictly positive regularization strengths.
+
+    Returns
+    -------
+    coefs : np.ndarray of shape (n_features, n_alphas)
+        Coefficients, one column per alpha.
+    intercepts : np.ndarray of shape (n_alphas,)
+        Intercepts, one per alpha.
+    """
+    import numpy as np
+
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    alphas = np.asarray(alphas, dtype=np.float64)
+    if np.any(alphas <= 0):
+        raise ValueError("All alphas must be strictly positive.")
+
+    x_mean = X.mean(axis=0)
+    y_mean = y.mean()
+    Xc = X - x_mean
+    gram = Xc.T @ Xc
+    xty = Xc.T @ (y - y_mean)
+
+    eigvals, eigvecs = np.linalg.eigh(gram)
+    eigvals = np.clip(eigvals, 0, None)
+    projected = eigvecs.T @ xty
+    coefs = eigvecs @ (projected[:, None] / (eigvals[:, None] + alphas[None, :]))
+    intercepts = y_mean - x_mean @ coefs
+    return coefs, intercepts
+
+
+@timed()
+def ridge_alpha_path(preprocessor, X, y, alphas, n_splits=5):
     """
+    Cross-validated error of ridge regression over a grid of alphas.
+
+    The preprocessor is fitted once per fold, and ``ridge_path`` solves the
+    whole alpha grid from a single eigendecomposition per fold, so hundreds
+    of alphas cost about as much as one pipeline fit.
+
+    Parameters
+    ----------
+    preprocessor : transformer
+        Unfitted transformer applied before the ridge step; cloned per fold.
+    X : pd.DataFrame
+        Feature matrix.
+    y : pd.Series
+        Target values.
+    alphas : array-like
+        Strictly positive regularization strengths.
+    n_splits : int, optional
+        Number of unshuffled CV folds, by default 5.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per alpha with the mean and standard deviation of the
+        validation MSE across folds and the mean validation R2.
+    """
+    import numpy as np
+    import pandas as pd
+    from sklearn.base import clone
+    from sklearn.model_selection import KFold
+
+    alphas = np.asarray(alphas, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    mse = np.empty((n_splits, len(alphas)))
+    r2 = np.empty((n_splits, len(alphas)))
+
+    for i, (train_idx, test_idx) in enumerate(KFold(n_splits=n_splits).split(X)):
+        transformer = clone(preprocessor)
+        Z_train = transformer.fit_transform(X.iloc[train_idx])
+        Z_test = transformer.transform(X.iloc[test_idx])
+        if hasattr(Z_train, "toarray"):
+            Z_train, Z_test = Z_train.toarray(), Z_test.toarray()
+
+        coefs, intercepts = ridge_path(Z_train, y[train_idx], alphas)
+        y_test = y[test_idx]
+        residuals = y_test[:, None] - (Z_test @ coefs + intercepts)
+        mse[i] = (residuals**2).mean(axis=0)
+        r2[i] = 1 - mse[i] / y_test.var()
+
+    return pd.DataFrame(
+        {
+            "alpha": alphas,
+            "mean_test_MSE": mse.mean(axis=0),
+            "std_test_MSE": mse.std(axis=0),
+            "mean_test_r2": r2.mean(axis=0),
+        }
+    )
+
+
+def render_table(df, title=None):
+    """
+    Draws a pandas DataFrame as a table and returns the figure.
+    """
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots(figsize=(len(df.columns) * 2.5, len(df) * 0.8 + 1))
     ax.axis("off")
 
@@ -19,13 +385,462 @@ def save_df_as_png(df, filename, title=None):
     table.scale(1, 1.5)
 
     if title:
-        plt.title(title, fontsize=16, fontweight="bold", pad=20)
-
-    plt.tight_layout()
-    try:
-        plt.savefig(filename, bbox_inches="tight", dpi=150)
-        print(f"Table saved to '{filename}'")
-    except Exception as e:
-        print(f"Error saving table '{filename}': {e}")
-    finally:
-        plt.close(fig)
+        ax.set_title(title, fontsize=16, fontweight="bold", pad=20)
+
+    fig.tight_layout()
+    return fig
+
+
+def table_spec(df, filename, title=None):
+    """Figure spec saving a DataFrame as a PNG table (see ``render_figures``)."""
+    return FigureSpec(
+        render_table, filename, dict(df=df, title=title), label="Table", dpi=150
+    )
+
+
+def save_df_as_png(df, filename, title=None):
+    """
+    Saves a pandas DataFrame as a PNG table.
+    """
+    render_figures([table_spec(df, filename, title)])
+
+
+def render_alpha_path(path_df, best_alpha):
+    """
+    Draws the CV error of ``ridge_alpha_path`` against alpha, with a band of
+    one standard deviation and the best alpha marked, and returns the figure.
+    """
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(7, 5))
+    ax.plot(path_df["alpha"], path_df["mean_test_MSE"], color="C0")
+    ax.fill_between(
+        path_df["alpha"],
+        path_df["mean_test_MSE"] - path_df["std_test_MSE"],
+        path_df["mean_test_MSE"] + path_df["std_test_MSE"],
+        alpha=0.2,
+        color="C0",
+    )
+    ax.axvline(best_alpha, color="r", linestyle="--", lw=1)
+    ax.set_xscale("log")
+    ax.set_xlabel("Alpha", fontsize=12)
+    ax.set_ylabel("CV MSE", fontsize=12)
+    return fig
+
+
+def render_prediction_plots(
+    y_test, y_pred, scatter="auto", density_threshold=DENSITY_THRESHOLD
+):
+    """
+    Draws the actual-vs-predicted and residual plots of a test set and
+    returns the figure. Large test sets are aggregated as described in
+    ``density_scatter``.
+    """
+    import matplotlib.gridspec as gridspec
+    import matplotlib.pyplot as plt
+    import numpy as np
+
+    y_test = np.asarray(y_test)
+    y_pred = np.asarray(y_pred)
+    residuals = y_test - y_pred
+
+    fig = plt.figure(figsize=(14, 6))
+    gs = gridspec.GridSpec(1, 2, figure=fig, wspace=0.2)
+
+    # Plot 1: Actual vs Predicted
+    min_val = min(y_test.min(), y_pred.min())
+    max_val = max(y_test.max(), y_pred.max())
+
+    ax1 = fig.add_subplot(gs[0])
+    density_scatter(
+        ax1,
+        y_test,
+        y_pred,
+        mode=scatter,
+        threshold=density_threshold,
+        alpha=0.6,
+        edgecolors="k",
+        linewidth=0.5,
+    )
+    ax1.plot(
+        [min_val, max_val], [min_val, max_val], "r--", lw=2, label="Perfect Prediction"
+    )
+    ax1.set_xlabel("Actual Stress Level", fontsize=12)
+    ax1.set_ylabel("Predicted Stress Level", fontsize=12)
+    ax1.set_title(
+        "Actual vs Predicted Stress Levels", fontsize=14, fontweight="bold", loc="left"
+    )
+    ax1.legend()
+    ax1.grid(True, alpha=0.3)
+
+    # Plot 2: Residuals
+    ax2 = fig.add_subplot(gs[1])
+    density_scatter(
+        ax2,
+        y_pred,
+        residuals,
+        mode=scatter,
+        threshold=density_threshold,
+        alpha=0.6,
+        edgecolors="k",
+        linewidth=0.5,
+    )
+    ax2.axhline(y=0, color="r", linestyle="--", lw=2)
+    ax2.set_xlabel("Predicted Stress Level", fontsize=12)
+    ax2.set_ylabel("Residuals (Actual - Predicted)", fontsize=12)
+    ax2.set_title("Residual Plot", fontsize=14, fontweight="bold", loc="left")
+    ax2.grid(True, alpha=0.3)
+
+    fig.tight_layout()
+    return fig
+
+
+def _write_metrics(df, prefix, table_format):
+    """Writes a metrics table in the structured formats among table_format."""
+    formats = [f for f in table_format if f in METRICS_FORMATS]
+    for path in write_metrics_table(df, prefix, formats):
+        print(f"Metrics saved to '{path}'")
+
+
+def _test_metrics(y_test, y_pred, n_bootstrap=0, n_jobs=1):
+    """
+    Table of the test MSE and R2, with bootstrap confidence intervals
+    ('CI Low', 'CI High') when ``n_bootstrap`` replicates are requested.
+    """
+    import numpy as np
+    import pandas as pd
+    from sklearn.metrics import mean_squared_error, r2_score
+
+    from src.bootstrap_utils import CI_LEVEL, bootstrap_regression_metrics
+
+    if n_bootstrap > 0:
+        results_df = bootstrap_regression_metrics(
+            y_test, y_pred, n_bootstrap, n_jobs=n_jobs
+        )
+    else:
+        mse = mean_squared_error(y_test, y_pred)
+        r2 = r2_score(y_test, y_pred)
+        results_df = pd.DataFrame({"Metric": ["MSE", "R2 Score"], "Value": [mse, r2]})
+
+    for i, label in enumerate(["MSE", "R2"]):
+        interval = ""
+        if n_bootstrap > 0 and not np.isnan(results_df["CI Low"][i]):
+            low, high = results_df["CI Low"][i], results_df["CI High"][i]
+            interval = f" ({CI_LEVEL:.0%} CI {low:.4f} to {high:.4f})"
+        print(f"Test {label}: {results_df['Value'][i]:.4f}{interval}")
+    return results_df
+
+
+def run_model_analysis(
+    train_df,
+    test_df,
+    output_prefix,
+    model_file=None,
+    alpha=1.0,
+    cv_folds=5,
+    cv_repeats=1,
+    scoring=DEFAULT_SCORING,
+    n_jobs=1,
+    cv_backend="process",
+    alpha_sweep=0,
+    alpha_min=1e-3,
+    alpha_max=1e3,
+    scatter="auto",
+    density_threshold=DENSITY_THRESHOLD,
+    table_format=METRICS_FORMATS,
+    metrics_log=None,
+    dedup=False,
+    input_file=None,
+    n_bootstrap=1000,
+):
+    """
+    Cross-validates, fits and evaluates the ridge pipeline on in-memory
+    train and test splits and saves its tables, artifact and metrics log.
+
+    Figures are not drawn here: their specs are returned, so that callers
+    can render them together, e.g. in a process pool with ``render_figures``.
+
+    Parameters
+    ----------
+    train_df, test_df : pd.DataFrame
+        Cleaned training and test rows with the MODEL_COLUMNS.
+    output_prefix : str
+        Prefix of the output files, e.g. results/model_analysis.
+    model_file : str, optional
+        Where to save the model, by default <output_prefix>_model.joblib.
+    alpha : float, optional
+        Ridge regularization strength, by default 1.0.
+    cv_folds, cv_repeats, scoring, n_jobs, cv_backend
+        Cross-validation settings, see ``run_cross_validation``.
+    alpha_sweep : int, optional
+        Number of log-spaced alphas between alpha_min and alpha_max for a
+        closed-form CV error path, by default 0 (disabled).
+    alpha_min, alpha_max : float, optional
+        Range of the alpha sweep.
+    scatter, density_threshold
+        How the prediction plots are drawn, see ``density_scatter``.
+    table_format : iterable of str, optional
+        Formats of the metric tables: any of METRICS_FORMATS and "png".
+    metrics_log : str, optional
+        JSON Lines log each run is appended to, by default
+        <output_prefix>_metrics_log.jsonl.
+    dedup : bool, optional
+        Whether identical training rows are collapsed into weighted unique
+        rows (``deduplicate_rows``) before cross-validation and the final
+        fit. The fitted model is the same, but fits are faster, and since
+        duplicates share a fold the CV scores are no longer inflated by
+        rows seen in training. By default False.
+    input_file : str, optional
+        File the data was read from, hashed into the artifact metadata.
+    n_bootstrap : int, optional
+        Bootstrap replicates of the test metric confidence intervals,
+        drawn on ``n_jobs`` workers, by default 1000; 0 disables them.
+
+    Returns
+    -------
+    list of FigureSpec
+        Figures of the run, to be rendered by the caller.
+    """
+    import numpy as np
+    from sklearn.linear_model import Ridge
+    from sklearn.pipeline import make_pipeline
+
+    from src.artifact_utils import build_metadata, save_model_artifact
+
+    if model_file is None:
+        model_file = f"{output_prefix}_model.joblib"
+    if metrics_log is None:
+        metrics_log = f"{output_prefix}_metrics_log.jsonl"
+
+    # Ensure output directory exists
+    output_dir = os.path.dirname(output_prefix)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    target_col = "stress_level"
+    cols_to_drop = [target_col]
+
+    X_train = train_df.drop(columns=cols_to_drop)
+    y_train = train_df[target_col]
+
+    X_test = test_df.drop(columns=cols_to_drop)
+    y_test = test_df[target_col]
+
+    print(f"Training shapes: X={X_train.shape}, y={y_train.shape}")
+    print(f"Testing shapes: X={X_test.shape}, y={y_test.shape}")
+
+    # Fit on weighted unique rows; the alpha sweep and metadata keep all rows
+    X_fit, y_fit, sample_weight = X_train, y_train, None
+    if dedup:
+        X_fit, y_fit, sample_weight = deduplicate_rows(X_train, y_train)
+        print(
+            f"Deduplicated {len(X_train)} training rows "
+            f"to {len(X_fit)} weighted unique rows"
+        )
+
+    # Define Pipeline
+    preprocesser = make_preprocessor()
+    ridge_pipe = make_pipeline(preprocesser, Ridge(alpha=alpha))
+
+    # Cross-Validation
+    print("Running Cross-Validation...")
+    cv_results = run_cross_validation(
+        ridge_pipe,
+        X_fit,
+        y_fit,
+        n_splits=cv_folds,
+        n_repeats=cv_repeats,
+        scoring=scoring,
+        n_jobs=n_jobs,
+        backend=cv_backend,
+        sample_weight=sample_weight,
+    )
+
+    cv_results_df = cv_results.rename(columns=METRIC_NAMES)
+
+    # Calculate means for summary
+    cv_summary = cv_results_df.mean().to_frame(name="Mean").T
+
+    # Structured metric tables; rasterized tables are only drawn on request
+    _write_metrics(cv_results_df, f"{output_prefix}_cv_results", table_format)
+    figures = []
+    if "png" in table_format:
+        figures.append(
+            table_spec(cv_results_df.round(4), f"{output_prefix}_cv_results.png")
+        )
+
+    # Optional: CV error over a grid of alphas, solved in closed form per fold
+    if alpha_sweep > 0:
+        print(f"Sweeping {alpha_sweep} alphas...")
+        alphas = np.logspace(np.log10(alpha_min), np.log10(alpha_max), alpha_sweep)
+        path_df = ridge_alpha_path(
+            preprocesser, X_train, y_train, alphas, n_splits=cv_folds
+        )
+        best = path_df.loc[path_df["mean_test_MSE"].idxmin()]
+        print(f"Best alpha: {best['alpha']:.4g} (CV MSE {best['mean_test_MSE']:.4f})")
+        figures.append(
+            FigureSpec(
+                render_alpha_path,
+                f"{output_prefix}_alpha_path.png",
+                dict(path_df=path_df, best_alpha=best["alpha"]),
+                label="Alpha path",
+            )
+        )
+
+    # Final Training & Evaluation
+    print("Training final model and evaluating on test set...")
+    with timer("fit", n_rows=len(X_fit)):
+        fit_weighted(ridge_pipe, X_fit, y_fit, sample_weight)
+    with timer("predict", n_rows=len(X_test)):
+        y_pred = ridge_pipe.predict(X_test)
+
+    results_df = _test_metrics(y_test, y_pred, n_bootstrap, n_jobs)
+    test_metrics = {
+        "test_MSE": results_df["Value"][0],
+        "test_R2": results_df["Value"][1],
+    }
+    if n_bootstrap > 0:
+        for i, name in enumerate(["test_MSE", "test_R2"]):
+            test_metrics[f"{name}_ci_low"] = results_df["CI Low"][i]
+            test_metrics[f"{name}_ci_high"] = results_df["CI High"][i]
+
+    # Save Test Results Table
+    _write_metrics(results_df, f"{output_prefix}_test_metrics", table_format)
+    if "png" in table_format:
+        figures.append(
+            table_spec(results_df.round(4), f"{output_prefix}_test_metrics.png")
+        )
+
+    # Persist the fitted model so that scoring does not require retraining
+    metadata = build_metadata(
+        X_train,
+        target_col,
+        input_file=input_file,
+        metrics=test_metrics,
+        params={
+            "alpha": alpha,
+            "cv_folds": cv_folds,
+            "cv_repeats": cv_repeats,
+            "dedup": dedup,
+            "n_bootstrap": n_bootstrap,
+        },
+    )
+    save_model_artifact(ridge_pipe, model_file, metadata)
+    print(f"Model artifact saved to '{model_file}'")
+
+    # One queryable line per run, see metrics_utils.read_metrics_log
+    cv_means = cv_summary.iloc[0]
+    append_metrics_log(
+        metrics_log,
+        {
+            "created_at": metadata["created_at"],
+            "training_data_sha256": metadata["training_data_sha256"],
+            "model_file": model_file,
+            "params": dict(metadata["params"], scoring=list(scoring)),
+            "metrics": dict(
+                metadata["metrics"],
+                **{
+                    f"cv_mean_{c}": cv_means[c]
+                    for c in cv_means.index
+                    if c.startswith("test_")
+                },
+            ),
+        },
+    )
+    print(f"Metrics appended to '{metrics_log}'")
+
+    # Visualization (Actual vs Predicted & Residuals)
+    figures.append(
+        FigureSpec(
+            render_prediction_plots,
+            f"{output_prefix}_prediction_plots.png",
+            dict(
+                y_test=y_test.to_numpy(),
+                y_pred=y_pred,
+                scatter=scatter,
+                density_threshold=density_threshold,
+            ),
+            label="Prediction plots",
+            style=REPORT_STYLE,
+        )
+    )
+    return figures
+
+
+def run_sparse_model_analysis(
+    features,
+    output_prefix,
+    alpha=1.0,
+    cv_folds=5,
+    cv_repeats=1,
+    scoring=DEFAULT_SCORING,
+    n_jobs=1,
+    cv_backend="process",
+    table_format=METRICS_FORMATS,
+    n_bootstrap=1000,
+):
+    """
+    Trains the ridge model on the full sparse feature matrix.
+
+    The features come from ``feature_utils.build_feature_matrix``. They
+    stay in CSR form throughout: ``MaxAbsScaler`` scales each column
+    without centering, which would fill in the zeros, and ``Ridge`` fits
+    sparse input directly. The CV and test metric tables are written as
+    in ``run_model_analysis``.
+
+    Parameters
+    ----------
+    features : dict
+        'X', 'y', 'train' and 'feature_names' of the feature matrix.
+    output_prefix : str
+        Prefix of the metric tables.
+    alpha, cv_folds, cv_repeats, scoring, n_jobs, cv_backend, table_format, \
+    n_bootstrap :
+        As in ``run_model_analysis``.
+
+    Returns
+    -------
+    sklearn.pipeline.Pipeline
+        The pipeline fitted on the training rows.
+    """
+    import numpy as np
+    from sklearn.linear_model import Ridge
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import MaxAbsScaler
+
+    X, y, train = features["X"], features["y"].astype(np.float64), features["train"]
+    X_train, y_train = X[train], y[train]
+    X_test, y_test = X[~train], y[~train]
+    density = X.nnz / max(X.shape[0] * X.shape[1], 1)
+    print(f"Training shapes: X={X_train.shape}, y={y_train.shape}")
+    print(f"Testing shapes: X={X_test.shape}, y={y_test.shape}")
+    print(f"Sparse features: {X.shape[1]} columns, {density:.1%} non-zero")
+
+    sparse_pipe = make_pipeline(MaxAbsScaler(), Ridge(alpha=alpha))
+
+    print("Running Cross-Validation...")
+    cv_results = run_cross_validation(
+        sparse_pipe,
+        X_train,
+        y_train,
+        n_splits=cv_folds,
+        n_repeats=cv_repeats,
+        scoring=scoring,
+        n_jobs=n_jobs,
+        backend=cv_backend,
+    )
+    _write_metrics(
+        cv_results.rename(columns=METRIC_NAMES),
+        f"{output_prefix}_cv_results",
+        table_format,
+    )
+
+    print("Training final model and evaluating on test set...")
+    with timer("fit", n_rows=X_train.shape[0]):
+        sparse_pipe.fit(X_train, y_train)
+    with timer("predict", n_rows=X_test.shape[0]):
+        y_pred = sparse_pipe.predict(X_test)
+
+    results_df = _test_metrics(y_test, y_pred, n_bootstrap, n_jobs)
+    _write_metrics(results_df, f"{output_prefix}_test_metrics", table_format)
+    return sparse_pipe
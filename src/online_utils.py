@@ -0,0 +1,280 @@
+import numpy as np
+
+from src.profile_utils import timer
+
+# Feature columns standardized before the ridge penalty, as in make_preprocessor
+SCALED_COLUMNS = ("sleep_duration",)
+
+# Feature columns one-hot encoded, as in make_preprocessor
+CATEGORICAL_COLUMNS = ("sleep_disorder",)
+
+
+class IncrementalRidge:
+    """
+    Ridge regression updated batch by batch from sufficient statistics.
+
+    The model keeps the row count, the means of the features and the
+    target, the centered scatter matrix of the features and their centered
+    cross products with the target. A batch is summarized on its own and
+    merged in with the pairwise update of Chan et al., so ``partial_fit``
+    costs time proportional to the batch, not to the rows seen before.
+
+    The statistics also hold the running mean and variance of
+    ``SCALED_COLUMNS``, which replace the refit ``StandardScaler``: the
+    scaling is applied to the statistics when solving, so the coefficients
+    equal those of ``make_pipeline(make_preprocessor(), Ridge(alpha))``
+    fitted on all the rows at once. Categories seen for the first time
+    add a one-hot column whose past rows are all zero.
+
+    Parameters
+    ----------
+    alpha : float, optional
+        Ridge regularization strength, by default 1.0.
+    """
+
+    def __init__(self, alpha: float = 1.0):
+        self.alpha = alpha
+        self.n_samples_seen_ = 0
+        self.feature_names_in_ = None
+        self.categories_ = {}
+
+    def _design(self, X):
+        """Numeric features followed by one indicator per known category."""
+        numeric = [c for c in self.feature_names_in_ if c not in CATEGORICAL_COLUMNS]
+        blocks = [X[numeric].to_numpy(dtype=np.float64)]
+        for column in self.feature_names_in_:
+            if column in CATEGORICAL_COLUMNS:
+                values = X[column].astype(str).to_numpy()
+                categories = np.array(self.categories_[column], dtype=str)
+                blocks.append((values[:, None] == categories).astype(np.float64))
+        return np.hstack(blocks)
+
+    def _add_categories(self, X) -> None:
+        """Append unseen categories, padding the statistics with zeros."""
+        position = len(self.feature_names_in_) - len(
+            [c for c in self.feature_names_in_ if c in CATEGORICAL_COLUMNS]
+        )
+        for column in self.feature_names_in_:
+            if column not in CATEGORICAL_COLUMNS:
+                continue
+            known = self.categories_.setdefault(column, [])
+            new = sorted(set(X[column].astype(str)) - set(known))
+            position += len(known)
+            known.extend(new)
+            if new and self.n_samples_seen_:
+                # Past rows are 0 in the new indicators, so the new means and
+                # the centered products with them are 0 as well
+                at = [position] * len(new)
+                self.mean_x_ = np.insert(self.mean_x_, at, 0.0)
+                self.scatter_xy_ = np.insert(self.scatter_xy_, at, 0.0)
+                self.scatter_xx_ = np.insert(
+                    np.insert(self.scatter_xx_, at, 0.0, axis=0), at, 0.0, axis=1
+                )
+            position += len(new)
+
+    def partial_fit(self, X, y):
+        """
+        Update the model with a batch of rows.
+
+        Parameters
+        ----------
+        X : pd.DataFrame
+            Batch of features, with the columns of the first batch.
+        y : array-like
+            Target values of the batch.
+
+        Returns
+        -------
+        IncrementalRidge
+            The updated model.
+
+        Raises
+        ------
+        ValueError
+            If the columns differ from those of the first batch.
+        """
+        if self.feature_names_in_ is None:
+            self.feature_names_in_ = list(X.columns)
+        elif list(X.columns) != self.feature_names_in_:
+            raise ValueError(
+                f"Expected columns {self.feature_names_in_}, got {list(X.columns)}"
+            )
+        n_b = len(X)
+        if n_b == 0:
+            return self
+
+        with timer("partial_fit", n_rows=n_b):
+            self._add_categories(X)
+            Z = self._design(X)
+            y = np.asarray(y, dtype=np.float64)
+            mean_x_b, mean_y_b = Z.mean(axis=0), y.mean()
+            Zc, yc = Z - mean_x_b, y - mean_y_b
+            scatter_xx_b, scatter_xy_b = Zc.T @ Zc, Zc.T @ yc
+
+            n_a = self.n_samples_seen_
+            if n_a == 0:
+                self.mean_x_, self.mean_y_ = mean_x_b, mean_y_b
+                self.scatter_xx_, self.scatter_xy_ = scatter_xx_b, scatter_xy_b
+            else:
+                n = n_a + n_b
+                delta_x = mean_x_b - self.mean_x_
+                delta_y = mean_y_b - self.mean_y_
+                self.scatter_xx_ = (
+                    self.scatter_xx_
+                    + scatter_xx_b
+                    + np.outer(delta_x, delta_x) * (n_a * n_b / n)
+                )
+                self.scatter_xy_ = (
+                    self.scatter_xy_
+                    + scatter_xy_b
+                    + delta_x * delta_y * (n_a * n_b / n)
+                )
+                self.mean_x_ = self.mean_x_ + delta_x * (n_b / n)
+                self.mean_y_ = self.mean_y_ + delta_y * (n_b / n)
+            self.n_samples_seen_ = n_a + n_b
+            self._solve()
+        return self
+
+    def fit(self, X, y):
+        """Fit from scratch on all the rows, as a single batch."""
+        self.__init__(self.alpha)
+        return self.partial_fit(X, y)
+
+    @property
+    def scale_(self) -> np.ndarray:
+        """Per-column divisor: the running standard deviation of the scaled
+        columns, and 1 for the others (and for constant columns)."""
+        numeric = [c for c in self.feature_names_in_ if c not in CATEGORICAL_COLUMNS]
+        scale = np.ones(len(self.mean_x_))
+        for j, column in enumerate(numeric):
+            if column in SCALED_COLUMNS:
+                std = np.sqrt(self.scatter_xx_[j, j] / self.n_samples_seen_)
+                scale[j] = std if std > 0 else 1.0
+        return scale
+
+    def _solve(self) -> None:
+        """Ridge coefficients of the standardized features, in raw units."""
+        d = 1.0 / self.scale_
+        gram = self.scatter_xx_ * np.outer(d, d)
+        gram[np.diag_indices_from(gram)] += self.alpha
+        coef_scaled = np.linalg.solve(gram, self.scatter_xy_ * d)
+        self.coef_ = coef_scaled * d
+        self.intercept_ = self.mean_y_ - self.mean_x_ @ self.coef_
+
+    def predict(self, X) -> np.ndarray:
+        """Predict the target; categories never seen in training count as 0."""
+        return self._design(X) @ self.coef_ + self.intercept_
+
+
+def update_model_file(
+    batch_file: str,
+    model_file: str,
+    alpha: float = 1.0,
+    reset: bool = False,
+    chunksize: int = 100_000,
+) -> dict:
+    """
+    Update a persisted ``IncrementalRidge`` with a new batch of cleaned data.
+
+    The batch is streamed in chunks; only its training rows are used when
+    it has a 'train' column. Before the update, the current model scores
+    the whole batch, which it has not seen yet, giving an honest estimate
+    of its error on new data. The artifact metadata keeps the list of
+    batches the model was trained on.
+
+    Parameters
+    ----------
+    batch_file : str
+        Cleaned CSV or Parquet file of new rows.
+    model_file : str
+        Artifact to update; created when missing.
+    alpha : float, optional
+        Ridge strength of a new model, by default 1.0. An existing model
+        keeps its own alpha.
+    reset : bool, optional
+        Start a new model even if ``model_file`` exists, by default False.
+    chunksize : int, optional
+        Rows read at a time, by default 100_000.
+
+    Returns
+    -------
+    dict
+        Rows added ('rows'), total rows seen ('n_samples_seen'), elapsed
+        seconds ('seconds') and the MSE on the batch before the update
+        ('batch_MSE', None for a new model). A batch without training rows
+        leaves the artifact unchanged.
+
+    Raises
+    ------
+    ValueError
+        If ``model_file`` holds another kind of model.
+    """
+    import os
+    import time
+
+    from src.artifact_utils import (
+        build_metadata,
+        file_sha256,
+        load_model_artifact,
+        save_model_artifact,
+    )
+    from src.io_utils import iter_clean_data, read_columns
+    from src.model_utils import MODEL_COLUMNS
+
+    target_col = "stress_level"
+    start = time.perf_counter()
+    columns = read_columns(batch_file)
+    if not reset and os.path.exists(model_file):
+        model, metadata = load_model_artifact(model_file)
+        if not isinstance(model, IncrementalRidge):
+            raise ValueError(
+                f"'{model_file}' holds a {type(model).__name__}, "
+                "not an IncrementalRidge"
+            )
+        batches = metadata.get("batches", [])
+    else:
+        model, batches = IncrementalRidge(alpha=alpha), []
+
+    batch_mse = None
+    if model.n_samples_seen_:
+        sse, n = 0.0, 0
+        for chunk in iter_clean_data(batch_file, MODEL_COLUMNS, chunksize=chunksize):
+            residual = chunk[target_col] - model.predict(chunk.drop(columns=target_col))
+            sse += float((residual**2).sum())
+            n += len(chunk)
+        batch_mse = sse / n if n else None
+
+    train = 1 if "train" in columns else None
+    rows, last = 0, None
+    for chunk in iter_clean_data(
+        batch_file, MODEL_COLUMNS, train=train, chunksize=chunksize
+    ):
+        last = chunk.drop(columns=target_col)
+        model.partial_fit(last, chunk[target_col])
+        rows += len(chunk)
+
+    stats = {
+        "rows": rows,
+        "n_samples_seen": model.n_samples_seen_,
+        "seconds": time.perf_counter() - start,
+        "batch_MSE": batch_mse,
+    }
+    if rows == 0:
+        # Nothing new to learn; the artifact is left as it was
+        return stats
+
+    batches.append(
+        {"file": batch_file, "sha256": file_sha256(batch_file), "rows": rows}
+    )
+    metadata = build_metadata(
+        last,
+        target_col,
+        input_file=batch_file,
+        metrics={} if batch_mse is None else {"batch_MSE": batch_mse},
+        params={"alpha": model.alpha, "incremental": True},
+    )
+    metadata["n_training_rows"] = model.n_samples_seen_
+    metadata["batches"] = batches
+    save_model_artifact(model, model_file, metadata)
+    stats["seconds"] = time.perf_counter() - start
+    return stats
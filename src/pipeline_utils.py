@@ -0,0 +1,168 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.profile_utils import timer
+
+# URL of the raw Sleep Health and Lifestyle data
+DATA_URL = (
+    "https://raw.githubusercontent.com/Muhanad-husn/"
+    "Sleep-Health-and-Lifestyle/main/data.csv"
+)
+
+
+def load_raw_data(input_path: str, raw_path: str = None):
+    """
+    Load the raw data, optionally keeping a copy on disk.
+
+    Without ``raw_path`` the CSV is parsed straight from the URL or local
+    path; otherwise it is first saved there with ``download_csv``, which
+    skips unchanged remote files.
+    """
+    import pandas as pd
+
+    if raw_path:
+        from src.download_utils import download_csv
+
+        with timer("download_csv", path=input_path):
+            input_path = download_csv(input_path, raw_path)
+    with timer("read_csv", path=input_path):
+        return pd.read_csv(input_path)
+
+
+def split_model_data(clean_df):
+    """Training and test rows of the modeling columns of the cleaned data."""
+    from src.model_utils import MODEL_COLUMNS
+
+    train = clean_df["train"].astype(bool)
+    return (
+        clean_df.loc[train, MODEL_COLUMNS].reset_index(drop=True),
+        clean_df.loc[~train, MODEL_COLUMNS].reset_index(drop=True),
+    )
+
+
+def run_pipeline(
+    input_path=DATA_URL,
+    output_dir="results",
+    raw_path=None,
+    clean_path=None,
+    split="random",
+    random_state=522,
+    group_columns=None,
+    eda_options=None,
+    model_options=None,
+    concurrent=True,
+    render_jobs=-1,
+    fmt="png",
+    dpi=None,
+) -> dict:
+    """
+    Runs download, cleaning, EDA and modeling in a single process.
+
+    The raw and cleaned DataFrames are passed between the stages in
+    memory instead of being written and parsed again by each script, and
+    the intermediate files are only written when their paths are given.
+    The EDA statistics and the model are computed concurrently in two
+    threads, since pandas and numpy release the GIL in their heavy loops,
+    and all figures are rendered together at the end with
+    ``render_figures``.
+
+    Parameters
+    ----------
+    input_path : str, optional
+        URL or local path to the raw CSV data, by default DATA_URL.
+    output_dir : str, optional
+        Directory of the figures, tables and model artifact, by default
+        "results".
+    raw_path : str, optional
+        Where to keep a copy of the raw data; not written by default.
+    clean_path : str, optional
+        Where to write the cleaned data (.csv or .parquet); not written by
+        default.
+    split : {"random", "hash", "stratified", "group"}, optional
+        How rows are assigned to the training set, by default "random";
+        see ``clean_sleep_data``.
+    random_state : int, optional
+        Random state of the split, by default 522.
+    group_columns : list, optional
+        Raw columns forming the group key of the "group" split, by default
+        all columns except the person ID.
+    eda_options : dict, optional
+        Keyword arguments of ``perform_eda``, e.g. ``kde`` or ``scatter``.
+    model_options : dict, optional
+        Keyword arguments of ``run_model_analysis``, e.g. ``alpha``.
+    concurrent : bool, optional
+        Whether EDA and modeling run at the same time, by default True.
+    render_jobs : int, optional
+        Number of figure rendering processes (-1 for all cores), by
+        default -1.
+    fmt : str, optional
+        One of FIGURE_FORMATS, by default "png".
+    dpi : float, optional
+        Resolution overriding the figures' own.
+
+    Returns
+    -------
+    dict
+        Wall time in seconds of each stage, keyed by stage name.
+    """
+    from src.clean_utils import clean_sleep_data
+    from src.eda_utils import perform_eda
+    from src.model_utils import run_model_analysis
+    from src.render_utils import render_figures
+
+    timings = {}
+
+    def run_stage(name, func, *args, **kwargs):
+        start = time.perf_counter()
+        with timer(f"stage:{name}"):
+            result = func(*args, **kwargs)
+        timings[name] = time.perf_counter() - start
+        return result
+
+    raw_df = run_stage("load", load_raw_data, input_path, raw_path)
+    clean_df = run_stage(
+        "clean", clean_sleep_data, raw_df, random_state, split, group_columns
+    )
+    del raw_df
+    if clean_path:
+        from src.io_utils import write_clean_data
+
+        run_stage("write-clean", write_clean_data, clean_df, clean_path)
+
+    os.makedirs(output_dir, exist_ok=True)
+    with timer("split_model_data"):
+        train_df, test_df = split_model_data(clean_df)
+    model_options = dict(model_options or {})
+    model_options.setdefault("input_file", clean_path)
+
+    stages = [
+        (
+            "eda",
+            perform_eda,
+            (clean_df, output_dir),
+            dict(eda_options or {}, fmt=fmt, render=False),
+        ),
+        (
+            "model",
+            run_model_analysis,
+            (train_df, test_df, os.path.join(output_dir, "model_analysis")),
+            model_options,
+        ),
+    ]
+    if concurrent:
+        with ThreadPoolExecutor(max_workers=len(stages)) as pool:
+            futures = [
+                pool.submit(run_stage, name, func, *args, **kwargs)
+                for name, func, args, kwargs in stages
+            ]
+            results = [future.result() for future in futures]
+    else:
+        results = [
+            run_stage(name, func, *args, **kwargs)
+            for name, func, args, kwargs in stages
+        ]
+
+    specs = [spec for stage_specs in results for spec in stage_specs]
+    run_stage("render", render_figures, specs, n_jobs=render_jobs, fmt=fmt, dpi=dpi)
+    return timings
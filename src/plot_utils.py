@@ -0,0 +1,140 @@
+# Ways of drawing a scatter panel
+SCATTER_MODES = ("auto", "points", "weighted", "hexbin")
+
+# Above this many rows, "auto" aggregates the points instead of drawing each
+DENSITY_THRESHOLD = 100_000
+
+# "auto" draws count-weighted markers only up to this many distinct points
+MAX_WEIGHTED_MARKERS = 5_000
+
+
+def _check_scatter_mode(mode: str) -> None:
+    """Raise ValueError for unknown scatter modes."""
+    if mode not in SCATTER_MODES:
+        raise ValueError(
+            f"Unknown scatter mode '{mode}', expected one of {list(SCATTER_MODES)}"
+        )
+
+
+def aggregate_pairs(x, y):
+    """
+    Count the distinct (x, y) pairs.
+
+    Parameters
+    ----------
+    x, y : array-like
+        Coordinates of the points.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        Distinct x values, y values and the number of points at each.
+    """
+    import numpy as np
+    import pandas as pd
+
+    counts = (
+        pd.DataFrame({"x": np.asarray(x), "y": np.asarray(y)})
+        .value_counts(sort=False)
+        .sort_index()
+    )
+    return (
+        counts.index.get_level_values("x").to_numpy(),
+        counts.index.get_level_values("y").to_numpy(),
+        counts.to_numpy(),
+    )
+
+
+def density_scatter(
+    ax,
+    x,
+    y,
+    counts=None,
+    mode="auto",
+    threshold=DENSITY_THRESHOLD,
+    color=None,
+    gridsize=50,
+    **kwargs,
+):
+    """
+    Draw a scatter panel whose cost does not grow with the number of rows.
+
+    In "points" mode every point is drawn as a marker, as ``ax.scatter``
+    does. "weighted" draws one marker per distinct (x, y) pair with an area
+    growing with its count, and "hexbin" draws a 2D count grid. "auto"
+    keeps plain points up to ``threshold`` rows and aggregates above it,
+    using weighted markers when there are few distinct pairs (integer
+    scores) and a hexbin otherwise.
+
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes
+        Axes to draw on.
+    x, y : array-like
+        Coordinates of the points, or of distinct points when ``counts``
+        is given.
+    counts : array-like, optional
+        Number of rows at each (x, y); by default each point is one row.
+    mode : str, optional
+        One of SCATTER_MODES, by default "auto".
+    threshold : int, optional
+        Row count above which "auto" aggregates, by default
+        DENSITY_THRESHOLD.
+    color : str, optional
+        Marker color; hexbins use a colormap of the same hue.
+    gridsize : int, optional
+        Number of hexagons across the x axis, by default 50.
+    **kwargs
+        Passed to ``ax.scatter`` in the "points" and "weighted" modes.
+
+    Returns
+    -------
+    str
+        The mode used to draw the panel.
+
+    Raises
+    ------
+    ValueError
+        If the mode is unknown.
+    """
+    import numpy as np
+
+    _check_scatter_mode(mode)
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n_rows = int(np.sum(counts)) if counts is not None else len(x)
+
+    if mode == "auto":
+        if n_rows <= threshold:
+            mode = "points"
+        else:
+            # Aggregate once and decide from the number of distinct pairs
+            if counts is None:
+                x, y, counts = aggregate_pairs(x, y)
+            mode = "weighted" if len(x) <= MAX_WEIGHTED_MARKERS else "hexbin"
+
+    if mode == "points":
+        ax.scatter(x, y, color=color, **kwargs)
+    elif mode == "weighted":
+        if counts is None:
+            x, y, counts = aggregate_pairs(x, y)
+        counts = np.asarray(counts, dtype=np.float64)
+        sizes = 6 + 194 * np.sqrt(counts / counts.max()) if len(counts) else []
+        kwargs.pop("s", None)
+        ax.scatter(x, y, s=sizes, color=color, **kwargs)
+    else:
+        from matplotlib.colors import LinearSegmentedColormap
+
+        cmap = LinearSegmentedColormap.from_list("density", ["white", color or "C0"])
+        hb = ax.hexbin(
+            x,
+            y,
+            C=counts,
+            reduce_C_function=np.sum,
+            gridsize=gridsize,
+            bins="log",
+            mincnt=1,
+            cmap=cmap,
+        )
+        ax.figure.colorbar(hb, ax=ax, label="Count")
+    return mode
@@ -0,0 +1,393 @@
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+
+# Environment variables enabling a trace without command-line flags, e.g.
+# SLEEP_PROFILE=results/trace.json SLEEP_PROFILE_FORMAT=chrome make model
+PROFILE_ENV = "SLEEP_PROFILE"
+PROFILE_FORMAT_ENV = "SLEEP_PROFILE_FORMAT"
+PROFILE_CAPTURE_ENV = "SLEEP_PROFILE_CAPTURE"
+
+# Trace file layouts: a plain list of spans, or the Chrome trace event format
+# that chrome://tracing and https://ui.perfetto.dev open directly
+TRACE_FORMATS = ("json", "chrome")
+
+# Optional extra captures: a cProfile dump next to the trace, and the
+# tracemalloc memory growth and peak of every span
+CAPTURE_MODES = ("cprofile", "memory")
+
+# State of the active trace; None when profiling is disabled, so that the
+# timers only cost a global lookup
+_STATE = None
+
+_NULL_TIMER = contextlib.nullcontext()
+
+
+def _check_options(fmt, capture) -> None:
+    """Raise ValueError for unknown trace formats or capture modes."""
+    if fmt not in TRACE_FORMATS:
+        raise ValueError(
+            f"Unknown trace format '{fmt}', expected one of {list(TRACE_FORMATS)}"
+        )
+    unknown = set(capture) - set(CAPTURE_MODES)
+    if unknown:
+        raise ValueError(
+            f"Unknown capture modes {sorted(unknown)}, "
+            f"expected some of {list(CAPTURE_MODES)}"
+        )
+
+
+class _Trace:
+    """Spans recorded in this process, plus the optional profilers."""
+
+    def __init__(self, path=None, fmt="json", capture=()):
+        self.path = path
+        self.fmt = fmt
+        self.capture = tuple(capture)
+        self.origin = time.perf_counter_ns()
+        self.started = time.time()
+        self.spans = []
+        self.lock = threading.Lock()
+        # Peaks of the open memory spans, one stack per thread; the list of
+        # all stacks lets a reset of the process-wide peak reach every thread
+        self.local = threading.local()
+        self.memory_stacks = []
+        self.profiler = None
+
+    def add(self, spans) -> None:
+        with self.lock:
+            self.spans.extend(spans)
+
+    def memory_stack(self) -> list:
+        """The open memory spans of the calling thread, innermost last."""
+        stack = getattr(self.local, "memory_stack", None)
+        if stack is None:
+            stack = self.local.memory_stack = []
+            with self.lock:
+                self.memory_stacks.append(stack)
+        return stack
+
+
+def enable_profiling(path=None, fmt="json", capture=()) -> None:
+    """
+    Start recording spans in this process.
+
+    Parameters
+    ----------
+    path : str, optional
+        Where ``finish_profiling`` writes the trace; without it the spans
+        are only kept in memory.
+    fmt : str, optional
+        One of TRACE_FORMATS, by default "json".
+    capture : iterable of str, optional
+        Any of CAPTURE_MODES. "cprofile" profiles the calling thread and
+        "memory" traces allocations with ``tracemalloc``; both slow the
+        run down noticeably.
+
+    Raises
+    ------
+    ValueError
+        If the format or a capture mode is unknown.
+    """
+    global _STATE
+
+    _check_options(fmt, capture)
+    _STATE = _Trace(path, fmt, capture)
+    if "memory" in _STATE.capture:
+        import tracemalloc
+
+        tracemalloc.start()
+    if "cprofile" in _STATE.capture:
+        import cProfile
+
+        _STATE.profiler = cProfile.Profile()
+        _STATE.profiler.enable()
+
+
+def profiling_enabled() -> bool:
+    """Whether spans are being recorded."""
+    return _STATE is not None
+
+
+def _fold_peak(state, peak) -> None:
+    """Credit the peak since the last reset to the open spans of all threads."""
+    for stack in state.memory_stacks:
+        if stack:
+            stack[-1] = max(stack[-1], peak)
+
+
+def _memory_start(state):
+    import tracemalloc
+
+    stack = state.memory_stack()
+    current, peak = tracemalloc.get_traced_memory()
+    with state.lock:
+        _fold_peak(state, peak)
+        stack.append(0)
+        tracemalloc.reset_peak()
+    return current
+
+
+def _memory_stop(state, start):
+    import tracemalloc
+
+    stack = state.memory_stack()
+    current, peak = tracemalloc.get_traced_memory()
+    with state.lock:
+        _fold_peak(state, peak)
+        peak = stack.pop()
+        if stack:
+            stack[-1] = max(stack[-1], peak)
+        tracemalloc.reset_peak()
+    return {"memory_delta": current - start, "memory_peak": peak}
+
+
+@contextlib.contextmanager
+def _span(state, name, args):
+    memory = _memory_start(state) if "memory" in state.capture else None
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        end = time.perf_counter_ns()
+        span = {
+            "name": name,
+            "start_ns": start,
+            "duration_ns": end - start,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args,
+        }
+        if memory is not None:
+            span["args"] = dict(args, **_memory_stop(state, memory))
+        state.add([span])
+
+
+def timer(name: str, **args):
+    """
+    Context manager recording a span around a block.
+
+    Keyword arguments are stored with the span, e.g. a row count or a
+    file path. When profiling is disabled a shared no-op context is
+    returned, so the cost is a single check.
+
+    Examples
+    --------
+    >>> with timer("read_csv", path=path):
+    ...     df = pd.read_csv(path)
+    """
+    state = _STATE
+    if state is None:
+        return _NULL_TIMER
+    return _span(state, name, args)
+
+
+def timed(name: str = None):
+    """
+    Decorator recording a span around every call of a function.
+
+    The span is named after the function unless ``name`` is given.
+    """
+
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            state = _STATE
+            if state is None:
+                return func(*args, **kwargs)
+            with _span(state, span_name, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _run_traced(func, args, kwargs, capture):
+    """Run func in a pool worker with its own trace, returning its spans."""
+    global _STATE
+
+    # Forked workers inherit the parent's spans and profilers; start afresh
+    _STATE = _Trace(capture=tuple(c for c in capture if c == "memory"))
+    if "memory" in _STATE.capture:
+        import tracemalloc
+
+        tracemalloc.start()
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        spans, _STATE = _STATE.spans, None
+    return result, spans
+
+
+def submit(executor, func, *args, **kwargs) -> Future:
+    """
+    ``executor.submit`` that also collects the spans of process workers.
+
+    Threads record into the shared trace directly, but spans recorded in a
+    worker process are sent back with the result and merged here. When
+    profiling is disabled this is a plain ``submit``.
+    """
+    state = _STATE
+    if state is None or not isinstance(executor, ProcessPoolExecutor):
+        return executor.submit(func, *args, **kwargs)
+
+    outer = Future()
+
+    def merge(inner):
+        try:
+            result, spans = inner.result()
+        except BaseException as e:
+            outer.set_exception(e)
+        else:
+            state.add(spans)
+            outer.set_result(result)
+
+    executor.submit(_run_traced, func, args, kwargs, state.capture).add_done_callback(
+        merge
+    )
+    return outer
+
+
+def trace_spans() -> list:
+    """
+    The spans recorded so far, oldest first.
+
+    Each span is a dict with the 'name', the 'start' and 'duration' in
+    seconds since profiling was enabled, the 'pid' and 'tid' it ran in,
+    and its 'args'.
+    """
+    state = _STATE
+    if state is None:
+        return []
+    with state.lock:
+        spans = sorted(state.spans, key=lambda s: s["start_ns"])
+    return [
+        {
+            "name": s["name"],
+            "start": (s["start_ns"] - state.origin) / 1e9,
+            "duration": s["duration_ns"] / 1e9,
+            "pid": s["pid"],
+            "tid": s["tid"],
+            "args": s["args"],
+        }
+        for s in spans
+    ]
+
+
+def write_trace(path: str, fmt: str = "json") -> str:
+    """
+    Write the spans recorded so far to a file.
+
+    Parameters
+    ----------
+    path : str
+        Output path, e.g. results/trace.json.
+    fmt : str, optional
+        "json" writes the run metadata and list of spans; "chrome" writes
+        complete ("X") events of the Chrome trace event format, with one
+        row per process and thread. By default "json".
+
+    Returns
+    -------
+    str
+        The path written.
+    """
+    _check_options(fmt, ())
+    spans = trace_spans()
+    if fmt == "chrome":
+        payload = {
+            "traceEvents": [
+                {
+                    "name": s["name"],
+                    "ph": "X",
+                    "ts": s["start"] * 1e6,
+                    "dur": s["duration"] * 1e6,
+                    "pid": s["pid"],
+                    "tid": s["tid"],
+                    "args": s["args"],
+                }
+                for s in spans
+            ],
+            "displayTimeUnit": "ms",
+        }
+    else:
+        payload = {
+            "argv": sys.argv,
+            "pid": os.getpid(),
+            "started": _STATE.started if _STATE is not None else None,
+            "spans": spans,
+        }
+    out_dir = os.path.dirname(path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=1, default=str)
+    return path
+
+
+def finish_profiling() -> list:
+    """
+    Stop profiling and write the trace and cProfile dump, if any.
+
+    The cProfile statistics are written next to the trace with a
+    ``.prof`` extension, for ``python -m pstats`` or snakeviz.
+
+    Returns
+    -------
+    list of str
+        Paths of the written files.
+    """
+    global _STATE
+
+    state = _STATE
+    if state is None:
+        return []
+    paths = []
+    if state.profiler is not None:
+        state.profiler.disable()
+    if state.path:
+        paths.append(write_trace(state.path, state.fmt))
+        if state.profiler is not None:
+            prof_path = f"{os.path.splitext(state.path)[0]}.prof"
+            state.profiler.dump_stats(prof_path)
+            paths.append(prof_path)
+    if "memory" in state.capture:
+        import tracemalloc
+
+        tracemalloc.stop()
+    _STATE = None
+    return paths
+
+
+@contextlib.contextmanager
+def profile_run(path=None, fmt=None, capture=()):
+    """
+    Profile the enclosed block and write its trace on exit.
+
+    Options left unset are read from the SLEEP_PROFILE (trace path),
+    SLEEP_PROFILE_FORMAT and SLEEP_PROFILE_CAPTURE (comma-separated)
+    environment variables. Without a trace path nothing is recorded.
+    """
+    path = path or os.environ.get(PROFILE_ENV)
+    if not path:
+        yield
+        return
+    fmt = fmt or os.environ.get(PROFILE_FORMAT_ENV, "json")
+    if not capture:
+        capture = [c for c in os.environ.get(PROFILE_CAPTURE_ENV, "").split(",") if c]
+
+    enable_profiling(path, fmt, capture)
+    try:
+        with timer("run", argv=" ".join(sys.argv)):
+            yield
+    finally:
+        for written in finish_profiling():
+            print(f"Profile saved to '{written}'")
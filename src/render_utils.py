@@ -0,0 +1,183 @@
+import contextlib
+import functools
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from src.profile_utils import submit, timer
+
+# Formats figures can be saved in; "svg" skips rasterization for quick previews
+FIGURE_FORMATS = ("png", "svg")
+
+# Matplotlib styles of the report figures
+REPORT_STYLE = ["science", "notebook", "grid"]
+
+
+class FigureSpec(
+    namedtuple("FigureSpec", ["render", "path", "kwargs", "label", "style", "dpi"])
+):
+    """
+    Description of one figure to render.
+
+    ``render(**kwargs)`` must be a module-level function returning a
+    matplotlib Figure, and ``kwargs`` must be picklable, so that the spec
+    can be sent to a worker process. ``style`` is a list of matplotlib
+    styles applied while drawing and saving, and ``dpi`` the default
+    resolution (None keeps the figure's own).
+    """
+
+    def __new__(cls, render, path, kwargs=None, label="Figure", style=None, dpi=None):
+        return super().__new__(cls, render, path, kwargs or {}, label, style, dpi)
+
+
+def figure_path(path: str, fmt: str = "png") -> str:
+    """The output path of a figure saved in the given format."""
+    return f"{os.path.splitext(path)[0]}.{fmt}"
+
+
+def _check_format(fmt: str) -> None:
+    """Raise ValueError for unknown figure formats."""
+    if fmt not in FIGURE_FORMATS:
+        raise ValueError(
+            f"Unknown figure format '{fmt}', expected one of {list(FIGURE_FORMATS)}"
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def _has_scienceplots() -> bool:
+    """Import scienceplots once per process; it registers the 'science' styles."""
+    try:
+        import scienceplots  # noqa: F401
+    except ImportError:
+        print("Warning: 'scienceplots' not found. Using default seaborn style.")
+        return False
+    return True
+
+
+def _style_context(style):
+    """Context applying the given styles, falling back to seaborn's whitegrid."""
+    import matplotlib.pyplot as plt
+
+    if not style:
+        return contextlib.nullcontext()
+    if not _has_scienceplots():
+        import seaborn as sns
+
+        return sns.axes_style("whitegrid")
+    return plt.style.context(style)
+
+
+def render_figure(spec: FigureSpec, fmt: str = "png", dpi=None) -> str:
+    """
+    Render one figure spec and save it.
+
+    Parameters
+    ----------
+    spec : FigureSpec
+        Figure to render.
+    fmt : str, optional
+        One of FIGURE_FORMATS, by default "png".
+    dpi : float, optional
+        Resolution overriding the spec's, e.g. for low-DPI previews.
+
+    Returns
+    -------
+    str
+        The path the figure was saved to.
+    """
+    import matplotlib.pyplot as plt
+
+    path = figure_path(spec.path, fmt)
+    with _style_context(spec.style):
+        with timer("draw_figure", label=spec.label):
+            fig = spec.render(**spec.kwargs)
+        try:
+            with timer("savefig", path=path):
+                fig.savefig(
+                    path,
+                    format=fmt,
+                    bbox_inches="tight",
+                    dpi=dpi or spec.dpi or "figure",
+                )
+        finally:
+            plt.close(fig)
+    return path
+
+
+def _use_agg():
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+
+def render_figures(specs, n_jobs=1, fmt="png", dpi=None) -> list:
+    """
+    Render and save figure specs, optionally in a process pool.
+
+    Rasterizing and encoding figures is CPU-bound, so with ``n_jobs`` > 1
+    the specs are rendered concurrently in worker processes using the
+    non-interactive Agg backend, and the total time approaches that of
+    the slowest figure. An error in one figure never stops the others:
+    every error is reported once all figures are rendered. Errors saving a
+    file (``OSError``, ``ValueError``) end there; any other error, such as
+    a bug in a drawing function, is then raised again.
+
+    Parameters
+    ----------
+    specs : list of FigureSpec
+        Figures to render.
+    n_jobs : int, optional
+        Number of worker processes (-1 for all cores), by default 1, which
+        renders in the calling process.
+    fmt : str, optional
+        One of FIGURE_FORMATS, by default "png".
+    dpi : float, optional
+        Resolution overriding the specs', e.g. for low-DPI previews.
+
+    Returns
+    -------
+    list of str
+        Paths of the figures that were saved.
+
+    Raises
+    ------
+    ValueError
+        If the format is unknown.
+    Exception
+        The first error of a figure other than ``OSError`` and
+        ``ValueError``, after all figures are rendered.
+    """
+    _check_format(fmt)
+    if n_jobs is None or n_jobs < 1:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = min(n_jobs, len(specs))
+
+    if n_jobs <= 1:
+        outcomes = []
+        for spec in specs:
+            try:
+                outcomes.append((spec, render_figure(spec, fmt, dpi), None))
+            except Exception as e:
+                outcomes.append((spec, None, e))
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_use_agg) as pool:
+            futures = [(s, submit(pool, render_figure, s, fmt, dpi)) for s in specs]
+            outcomes = []
+            for spec, future in futures:
+                try:
+                    outcomes.append((spec, future.result(), None))
+                except Exception as e:
+                    outcomes.append((spec, None, e))
+
+    saved, unexpected = [], []
+    for spec, path, error in outcomes:
+        if error is None:
+            print(f"{spec.label} saved to '{path}'")
+            saved.append(path)
+        else:
+            print(f"Error saving {spec.label.lower()} '{spec.path}': {error}")
+            if not isinstance(error, (OSError, ValueError)):
+                unexpected.append(error)
+    if unexpected:
+        raise unexpected[0]
+    return saved
@@ -0,0 +1,70 @@
+import pandas as pd
+
+# Declared dtypes of the cleaned sleep table. Scores are bounded small
+# integers, durations only carry one decimal and disorders are a handful of
+# labels, so the narrowest dtypes hold them without loss.
+CLEAN_SCHEMA = {
+    "person_id": "int64",
+    "sleep_duration": "float32",
+    "sleep_quality": "int8",
+    "sleep_disorder": "category",
+    "stress_level": "int8",
+    "train": "bool",
+}
+
+# Dtypes pandas infers for the same columns when parsing the cleaned CSV
+DEFAULT_SCHEMA = {
+    "person_id": "int64",
+    "sleep_duration": "float64",
+    "sleep_quality": "int64",
+    "sleep_disorder": "object",
+    "stress_level": "int64",
+    "train": "int64",
+}
+
+
+def apply_clean_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cast the columns of a cleaned dataframe to the declared compact dtypes.
+
+    Columns that are not part of the schema are left untouched, and missing
+    schema columns are skipped.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Cleaned sleep data.
+
+    Returns
+    -------
+    pd.DataFrame
+        The dataframe with ``CLEAN_SCHEMA`` dtypes applied.
+    """
+    dtypes = {c: t for c, t in CLEAN_SCHEMA.items() if c in df.columns}
+    return df.astype(dtypes)
+
+
+def memory_report(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compare the memory footprint of the default and compact dtypes.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Cleaned sleep data, with either default or compact dtypes.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per column plus a 'total' row, with the deep memory usage in
+        bytes under the default dtypes ('before') and ``CLEAN_SCHEMA``
+        ('after'), and the reduction factor ('ratio').
+    """
+    default_dtypes = {c: t for c, t in DEFAULT_SCHEMA.items() if c in df.columns}
+    before = df.astype(default_dtypes).memory_usage(index=False, deep=True)
+    after = apply_clean_schema(df).memory_usage(index=False, deep=True)
+
+    report = pd.DataFrame({"before": before, "after": after})
+    report.loc["total"] = report.sum()
+    report["ratio"] = (report["before"] / report["after"]).round(2)
+    return report
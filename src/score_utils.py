@@ -0,0 +1,64 @@
+import time
+
+from src.io_utils import CleanDataWriter, iter_clean_data, read_columns
+
+
+def score_file(
+    model, metadata: dict, input_path: str, output_path: str, batch_size=100_000
+) -> dict:
+    """
+    Score a CSV or Parquet file in batches and write predictions as they go.
+
+    Only the feature columns recorded in the artifact metadata (and
+    'person_id', if present) are read, and at most ``batch_size`` rows are
+    held in memory at once.
+
+    Parameters
+    ----------
+    model : estimator object
+        Fitted model with a ``predict`` method.
+    metadata : dict
+        Artifact metadata with the 'features' schema.
+    input_path : str
+        CSV or Parquet file with the feature columns.
+    output_path : str
+        CSV or Parquet file receiving 'person_id' (if available) and
+        'prediction' columns.
+    batch_size : int, optional
+        Number of rows scored per batch, by default 100_000.
+
+    Returns
+    -------
+    dict
+        Number of rows scored ('rows'), elapsed seconds ('seconds') and
+        throughput ('rows_per_s').
+
+    Raises
+    ------
+    ValueError
+        If a feature column is missing from the input file.
+    """
+    features = [f["name"] for f in metadata["features"]]
+    columns = read_columns(input_path)
+    missing = set(features) - set(columns)
+    if missing:
+        raise ValueError(f"Input file is missing feature columns: {missing}")
+    id_cols = ["person_id"] if "person_id" in columns else []
+
+    start = time.perf_counter()
+    rows = 0
+    with CleanDataWriter(output_path) as writer:
+        for batch in iter_clean_data(
+            input_path, columns=id_cols + features, chunksize=batch_size
+        ):
+            out = batch[id_cols].copy()
+            out["prediction"] = model.predict(batch[features])
+            writer.write(out)
+            rows += len(batch)
+    seconds = time.perf_counter() - start
+
+    return {
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_s": rows / seconds if seconds > 0 else float("inf"),
+    }
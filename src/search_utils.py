@@ -0,0 +1,430 @@
+import json
+import math
+import os
+
+from src.compare_utils import run_fold_jobs, transform_folds
+from src.metrics_utils import append_metrics_log
+from src.model_utils import make_preprocessor
+from src.profile_utils import timer
+
+# Hyperparameter distributions of the tunable models of compare_utils:
+# ("log", low, high) is log-uniform, ("int", low, high) a uniform integer
+# with both ends included and ("choice", values) a uniform pick. The
+# subsamples are large enough for the most kNN neighbours (_min_train_rows)
+SEARCH_SPACES = {
+    "ridge": {"alpha": ("log", 1e-3, 1e3)},
+    "lasso": {"alpha": ("log", 1e-4, 1.0)},
+    "knn": {
+        "n_neighbors": ("int", 1, 30),
+        "weights": ("choice", ["uniform", "distance"]),
+    },
+    "hist_gb": {
+        "learning_rate": ("log", 0.01, 0.3),
+        "max_leaf_nodes": ("int", 7, 63),
+        "min_samples_leaf": ("int", 5, 50),
+        "l2_regularization": ("log", 1e-3, 10.0),
+    },
+}
+
+# Score the candidates are ranked by; scikit-learn scorers are greater-is-better
+SEARCH_SCORING = "neg_mean_squared_error"
+
+
+def _check_search_models(names) -> None:
+    """Raise ValueError for models without a search space."""
+    unknown = set(names) - set(SEARCH_SPACES)
+    if unknown:
+        raise ValueError(
+            f"No search space for models {sorted(unknown)}, "
+            f"expected some of {list(SEARCH_SPACES)}"
+        )
+
+
+def _space_size(space) -> float:
+    """Number of points of a search space, infinite with a "log" parameter."""
+    size = 1
+    for kind, *spec in space.values():
+        if kind == "log":
+            return math.inf
+        size *= spec[1] - spec[0] + 1 if kind == "int" else len(spec[0])
+    return size
+
+
+def sample_candidates(models, n_candidates, random_state=522) -> list:
+    """
+    Draw random hyperparameters from ``SEARCH_SPACES``.
+
+    Parameters
+    ----------
+    models : sequence of str
+        Names of the models to tune.
+    n_candidates : int
+        Candidates drawn per model.
+    random_state : int, optional
+        Seed of the draws, by default 522. The same seed gives the same
+        candidates, which is what lets an interrupted search resume.
+
+    Returns
+    -------
+    list of dict
+        ``{"model": name, "params": {...}}`` per candidate. Candidates are
+        distinct: repeated draws are drawn again, and a model whose space
+        has fewer than ``n_candidates`` points gets each point once.
+    """
+    import numpy as np
+
+    models = list(models)
+    _check_search_models(models)
+    rng = np.random.default_rng(random_state)
+    candidates = []
+    for name in models:
+        n_wanted = min(n_candidates, _space_size(SEARCH_SPACES[name]))
+        seen = set()
+        while len(seen) < n_wanted:
+            params = {}
+            for param, (kind, *spec) in SEARCH_SPACES[name].items():
+                if kind == "log":
+                    low, high = spec
+                    value = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+                elif kind == "int":
+                    value = int(rng.integers(spec[0], spec[1] + 1))
+                else:
+                    value = spec[0][rng.integers(len(spec[0]))]
+                params[param] = value
+            key = json.dumps(params, sort_keys=True)
+            if key not in seen:
+                seen.add(key)
+                candidates.append({"model": name, "params": params})
+    return candidates
+
+
+def _min_train_rows(models) -> int:
+    """
+    Training rows each fold needs so that every candidate of ``models``
+    can be fitted: at least 10, and the largest kNN ``n_neighbors``.
+    """
+    rows = 10
+    for name in models:
+        spec = SEARCH_SPACES.get(name, {}).get("n_neighbors")
+        if spec is not None:
+            rows = max(rows, spec[2])
+    return rows
+
+
+def halving_schedule(
+    n_candidates, n_rows, factor=3, min_resources=None, n_splits=5, min_train_rows=10
+):
+    """
+    Rounds of successive halving as ``(n_candidates, n_rows)`` pairs.
+
+    Each round keeps the best ``1 / factor`` of the candidates and gives
+    the survivors ``factor`` times more training rows, until a single
+    candidate is left or the rows run out. The last round always uses
+    every row, so the winner is scored on the full training data.
+
+    Parameters
+    ----------
+    n_candidates : int
+        Candidates of the first round.
+    n_rows : int
+        Number of training rows available.
+    factor : int, optional
+        Elimination and growth factor, by default 3.
+    min_resources : int, optional
+        Rows of the first round. By default the rows are chosen so that
+        the last round would reach ``n_rows``, with at least 10 rows per
+        fold.
+    n_splits : int, optional
+        Number of CV folds, which bounds the smallest subsample.
+    min_train_rows : int, optional
+        Training rows every fold of the smallest subsample must have, by
+        default 10.
+
+    Returns
+    -------
+    list of tuple
+    """
+    if factor < 2:
+        raise ValueError(f"factor must be at least 2, got {factor}")
+    n_rounds = 1 + math.ceil(math.log(max(n_candidates, 1), factor) - 1e-9)
+    if min_resources is None:
+        min_resources = n_rows // factor ** (n_rounds - 1)
+    # Each fold trains on (n_splits - 1) / n_splits of the subsample
+    floor = max(10 * n_splits, math.ceil(min_train_rows * n_splits / (n_splits - 1)))
+    min_resources = min(max(min_resources, floor), n_rows)
+
+    schedule = []
+    remaining = n_candidates
+    for i in range(n_rounds):
+        rows = n_rows if i == n_rounds - 1 else min(min_resources * factor**i, n_rows)
+        schedule.append((remaining, rows))
+        if rows == n_rows:
+            break
+        remaining = max(math.ceil(remaining / factor), 1)
+    return schedule
+
+
+def _trial_key(model, params, n_rows, n_splits, random_state) -> str:
+    """Identity of a trial in the log: candidate, subsample and folds."""
+    return json.dumps(
+        {
+            "model": model,
+            "params": params,
+            "n_rows": n_rows,
+            "n_splits": n_splits,
+            "random_state": random_state,
+        },
+        sort_keys=True,
+    )
+
+
+def read_trial_log(path: str) -> dict:
+    """
+    Load a trial log as a dict from trial key to trial record.
+
+    A missing log is empty. A line cut short by an interrupted write is
+    ignored, so that trial simply runs again.
+    """
+    trials = {}
+    if not os.path.exists(path):
+        return trials
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            key = _trial_key(
+                record["model"],
+                record["params"],
+                record["n_rows"],
+                record["n_splits"],
+                record["random_state"],
+            )
+            trials[key] = record
+    return trials
+
+
+def successive_halving(
+    X,
+    y,
+    models=tuple(SEARCH_SPACES),
+    n_candidates=27,
+    factor=3,
+    min_resources=None,
+    n_splits=5,
+    n_jobs=-1,
+    random_state=522,
+    log_path=None,
+):
+    """
+    Tunes the models with successive halving on nested row subsamples.
+
+    Random candidates from ``SEARCH_SPACES`` are cross-validated on a small
+    subsample of the rows; only the best ``1 / factor`` go on to the next
+    round, on ``factor`` times more rows (``halving_schedule``). Poor
+    candidates are thus stopped early, after a cheap fit, and only the
+    last few see the full data.
+
+    The subsamples are nested prefixes of one seeded row permutation and
+    each round fits the preprocessing once per fold, shared by every
+    candidate. Candidate x fold jobs run on a process pool
+    (``run_fold_jobs``).
+
+    Every finished trial is appended to ``log_path``, a JSON Lines file.
+    Trials already in the log are not run again, so an interrupted search
+    started again with the same settings continues where it stopped.
+
+    Parameters
+    ----------
+    X : pd.DataFrame
+        Feature matrix with the columns used by ``make_preprocessor``.
+    y : pd.Series
+        Target values.
+    models : sequence of str, optional
+        Names from SEARCH_SPACES, by default all of them.
+    n_candidates : int, optional
+        Random candidates per model, by default 27.
+    factor, min_resources : optional
+        Halving settings, see ``halving_schedule``.
+    n_splits : int, optional
+        Number of CV folds per trial, by default 5.
+    n_jobs : int, optional
+        Number of worker processes; 1 runs the jobs in-process and -1 uses
+        all cores. By default -1.
+    random_state : int, optional
+        Seed of the candidates, the subsamples and the models, by default 522.
+    log_path : str, optional
+        Trial log to append to and resume from; no log by default.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per trial with 'round', 'n_rows', 'model', 'params',
+        'mean_test_score', 'std_test_score', 'mean_fit_time' and 'resumed',
+        sorted by round and decreasing score; the first row of the last
+        round is the best candidate.
+    """
+    import numpy as np
+    import pandas as pd
+    from sklearn.model_selection import KFold
+
+    candidates = sample_candidates(models, n_candidates, random_state)
+    schedule = halving_schedule(
+        len(candidates),
+        len(X),
+        factor,
+        min_resources,
+        n_splits,
+        _min_train_rows(models),
+    )
+    done = read_trial_log(log_path) if log_path else {}
+    order = np.random.default_rng(random_state).permutation(len(X))
+    scorer = f"test_{SEARCH_SCORING}"
+
+    rows = []
+    for round_, (n_keep, n_rows) in enumerate(schedule):
+        if round_ > 0:
+            previous = sorted(
+                [r for r in rows if r["round"] == round_ - 1],
+                key=lambda r: r["mean_test_score"],
+                reverse=True,
+            )
+            candidates = [
+                {"model": r["model"], "params": r["params"]} for r in previous[:n_keep]
+            ]
+        keys = [
+            _trial_key(c["model"], c["params"], n_rows, n_splits, random_state)
+            for c in candidates
+        ]
+        todo = [i for i, key in enumerate(keys) if key not in done]
+        print(
+            f"Round {round_}: {len(candidates)} candidates on {n_rows} rows "
+            f"({len(candidates) - len(todo)} from the log)"
+        )
+
+        if todo:
+            with timer("halving_round", round=round_, n_rows=n_rows):
+                index = order[:n_rows]
+                X_sub, y_sub = X.iloc[index], y.iloc[index]
+                splits = list(KFold(n_splits=n_splits).split(X_sub))
+                folds = transform_folds(make_preprocessor(), X_sub, y_sub, splits)
+                jobs = [
+                    (candidates[i]["model"], fold, candidates[i]["params"])
+                    for i in todo
+                    for fold in range(n_splits)
+                ]
+                scores = {i: [] for i in todo}
+                for j, result in run_fold_jobs(
+                    folds, jobs, [SEARCH_SCORING], n_jobs, random_state
+                ):
+                    i = todo[j // n_splits]
+                    scores[i].append(result)
+                    if len(scores[i]) < n_splits:
+                        continue
+                    # Logged as soon as all folds of a candidate are done
+                    record = {
+                        "model": candidates[i]["model"],
+                        "params": candidates[i]["params"],
+                        "n_rows": n_rows,
+                        "n_splits": n_splits,
+                        "random_state": random_state,
+                        "mean_test_score": float(
+                            np.mean([r[scorer] for r in scores[i]])
+                        ),
+                        "std_test_score": float(np.std([r[scorer] for r in scores[i]])),
+                        "mean_fit_time": float(
+                            np.mean([r["fit_time"] for r in scores[i]])
+                        ),
+                    }
+                    if log_path:
+                        append_metrics_log(log_path, record)
+                    done[keys[i]] = dict(record, resumed=False)
+
+        for key in keys:
+            record = done[key]
+            rows.append(dict(record, round=round_, resumed=record.get("resumed", True)))
+
+    columns = [
+        "round",
+        "n_rows",
+        "model",
+        "params",
+        "mean_test_score",
+        "std_test_score",
+        "mean_fit_time",
+        "resumed",
+    ]
+    return (
+        pd.DataFrame(rows, columns=columns)
+        .sort_values(["round", "mean_test_score"], ascending=[True, False])
+        .reset_index(drop=True)
+    )
+
+
+def run_search(
+    train_df,
+    output_prefix,
+    models=tuple(SEARCH_SPACES),
+    n_candidates=27,
+    factor=3,
+    min_resources=None,
+    cv_folds=5,
+    n_jobs=-1,
+    random_state=522,
+    log_path=None,
+    table_format=("csv", "json", "md"),
+):
+    """
+    Runs the successive halving search on the training split and saves
+    the trials as metric tables and the best candidate as JSON.
+
+    Returns the best candidate as ``{"model", "params", "mean_test_score"}``.
+    """
+    from src.metrics_utils import markdown_table, write_metrics_table
+
+    target_col = "stress_level"
+    X_train = train_df.drop(columns=[target_col])
+    y_train = train_df[target_col]
+    if log_path is None:
+        log_path = f"{output_prefix}_trials.jsonl"
+
+    trials = successive_halving(
+        X_train,
+        y_train,
+        models=models,
+        n_candidates=n_candidates,
+        factor=factor,
+        min_resources=min_resources,
+        n_splits=cv_folds,
+        n_jobs=n_jobs,
+        random_state=random_state,
+        log_path=log_path,
+    )
+    table = trials.assign(
+        params=trials["params"].map(lambda p: json.dumps(p, sort_keys=True))
+    ).rename(
+        columns={
+            "mean_test_score": "mean_test_neg_MSE",
+            "std_test_score": "std_test_neg_MSE",
+        }
+    )
+    for path in write_metrics_table(
+        table, f"{output_prefix}_trials", table_format, title="Search trials"
+    ):
+        print(f"Metrics saved to '{path}'")
+
+    final = trials[trials["round"] == trials["round"].max()]
+    best_row = final.iloc[0]
+    best = {
+        "model": best_row["model"],
+        "params": best_row["params"],
+        "mean_test_score": float(best_row["mean_test_score"]),
+        "n_rows": int(best_row["n_rows"]),
+    }
+    best_path = f"{output_prefix}_best.json"
+    with open(best_path, "w") as f:
+        json.dump(best, f, indent=2)
+    print(f"Best candidate saved to '{best_path}'")
+    print(markdown_table(table[table["round"] == table["round"].max()].round(4)))
+    return best
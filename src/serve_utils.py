@@ -0,0 +1,306 @@
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+
+class LinearScorer:
+    """
+    Precompiled form of a fitted ``make_pipeline(column_transformer, linear)``.
+
+    Standard scaling is folded into the coefficients and one-hot encoding
+    becomes a per-category lookup table, so a prediction is an intercept
+    plus a dot product and a few dictionary lookups, without building a
+    DataFrame or running the pipeline.
+    """
+
+    def __init__(self, intercept, numeric_coefs, category_tables):
+        self.intercept = float(intercept)
+        self.numeric_columns = list(numeric_coefs)
+        self.numeric_coefs = np.array(
+            [numeric_coefs[c] for c in self.numeric_columns], dtype=np.float64
+        )
+        self.category_tables = category_tables
+
+    @classmethod
+    def from_pipeline(cls, pipeline):
+        """
+        Compile a fitted pipeline of a ``ColumnTransformer`` and a linear model.
+
+        Supported transformers are ``StandardScaler``, ``OneHotEncoder``,
+        'passthrough' and 'drop'.
+
+        Parameters
+        ----------
+        pipeline : sklearn.pipeline.Pipeline
+            Fitted two-step pipeline, e.g. the ridge pipeline of model.py.
+
+        Returns
+        -------
+        LinearScorer
+            The compiled scorer.
+
+        Raises
+        ------
+        ValueError
+            If the pipeline contains an unsupported step.
+        """
+        from sklearn.compose import ColumnTransformer
+        from sklearn.preprocessing import (
+            FunctionTransformer,
+            OneHotEncoder,
+            StandardScaler,
+        )
+
+        preprocessor, regressor = pipeline[0], pipeline[-1]
+        if len(pipeline) != 2 or not isinstance(preprocessor, ColumnTransformer):
+            raise ValueError("Expected a pipeline of a ColumnTransformer and a model.")
+
+        coef = np.ravel(regressor.coef_)
+        intercept = float(np.ravel(regressor.intercept_)[0])
+        numeric_coefs = {}
+        category_tables = {}
+        names_in = list(preprocessor.feature_names_in_)
+        offset = 0
+
+        for _, transformer, columns in preprocessor.transformers_:
+            columns = [
+                names_in[c] if isinstance(c, (int, np.integer)) else c for c in columns
+            ]
+            if transformer == "drop" or len(columns) == 0:
+                continue
+            # Fitted passthrough columns are stored as identity FunctionTransformers
+            identity = isinstance(transformer, FunctionTransformer) and (
+                transformer.func is None
+            )
+            if transformer == "passthrough" or identity:
+                for col in columns:
+                    numeric_coefs[col] = coef[offset]
+                    offset += 1
+            elif isinstance(transformer, StandardScaler):
+                scale = transformer.scale_ if transformer.scale_ is not None else 1.0
+                mean = transformer.mean_ if transformer.with_mean else 0.0
+                scale = np.broadcast_to(scale, len(columns))
+                mean = np.broadcast_to(mean, len(columns))
+                for i, col in enumerate(columns):
+                    numeric_coefs[col] = coef[offset] / scale[i]
+                    intercept -= coef[offset] * mean[i] / scale[i]
+                    offset += 1
+            elif isinstance(transformer, OneHotEncoder):
+                if transformer.drop is not None:
+                    raise ValueError("OneHotEncoder with 'drop' is not supported.")
+                for col, categories in zip(columns, transformer.categories_):
+                    category_tables[col] = {
+                        str(cat): coef[offset + i] for i, cat in enumerate(categories)
+                    }
+                    offset += len(categories)
+            else:
+                raise ValueError(
+                    f"Unsupported transformer {type(transformer).__name__}."
+                )
+
+        return cls(intercept, numeric_coefs, category_tables)
+
+    def predict_records(self, records) -> np.ndarray:
+        """
+        Predict for a list of feature dicts.
+
+        Raises
+        ------
+        KeyError
+            If a record misses a feature.
+        ValueError
+            If a record has a category unseen during training, or a missing
+            or non-finite numeric feature.
+        """
+        numeric = np.array(
+            [[r[c] for c in self.numeric_columns] for r in records], dtype=np.float64
+        ).reshape(len(records), len(self.numeric_columns))
+        if not np.isfinite(numeric).all():
+            rows, cols = np.nonzero(~np.isfinite(numeric))
+            bad = sorted({self.numeric_columns[c] for c in cols})
+            raise ValueError(
+                f"Missing or non-finite values for {bad} in {len(set(rows))} records."
+            )
+        predictions = self.intercept + numeric @ self.numeric_coefs
+
+        for col, table in self.category_tables.items():
+            values = [str(r[col]) for r in records]
+            unknown = set(values) - table.keys()
+            if unknown:
+                raise ValueError(f"Unknown categories {unknown} for '{col}'.")
+            predictions += [table[v] for v in values]
+        return predictions
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent prediction requests into micro-batches.
+
+    Requests are queued and a single worker thread drains the queue,
+    waiting at most ``max_latency_ms`` after the first request of a batch
+    (or until ``max_batch_size`` records are collected) before calling
+    ``predict_fn`` once for the whole batch.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=256, max_latency_ms=2.0):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000
+        self.batches = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, records) -> Future:
+        """Queue a list of records; the future resolves to their predictions."""
+        future = Future()
+        self._queue.put((records, future))
+        return future
+
+    def close(self) -> None:
+        """Stop the worker thread after the queued requests are served."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            pending = [item]
+            try:
+                stop = self._collect(pending)
+                self._serve(pending)
+            except Exception as e:
+                # Never let one request stop the worker: fail what is pending
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                stop = False
+            if stop:
+                return
+
+    def _collect(self, pending) -> bool:
+        """
+        Add queued requests to ``pending`` until the batch is full or its
+        deadline passes; True if the stop sentinel was dequeued.
+        """
+        size = len(pending[0][0])
+        deadline = time.perf_counter() + self.max_latency
+        while size < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None:
+                return True
+            pending.append(item)
+            size += len(item[0])
+        return False
+
+    def _serve(self, pending):
+        records = [r for recs, _ in pending for r in recs]
+        self.batches += 1
+        try:
+            predictions = self.predict_fn(records)
+        except Exception:
+            # Fall back to one call per request so that a bad request only
+            # fails itself
+            for recs, future in pending:
+                try:
+                    future.set_result(self.predict_fn(recs))
+                except Exception as e:
+                    future.set_exception(e)
+            return
+
+        start = 0
+        for recs, future in pending:
+            future.set_result(predictions[start : start + len(recs)])
+            start += len(recs)
+
+
+class _PredictionHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/predict":
+            self._send_json(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            if length < 0:
+                raise ValueError(f"Invalid Content-Length {length}.")
+            payload = json.loads(self.rfile.read(length))
+            records = payload["instances"]
+            if not isinstance(records, list) or not all(
+                isinstance(r, dict) for r in records
+            ):
+                raise ValueError("'instances' must be a list of feature objects.")
+            predictions = self.server.batcher.submit(records).result()
+        except (KeyError, ValueError, TypeError, OverflowError) as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        self._send_json(200, {"predictions": [float(p) for p in predictions]})
+
+
+def make_server(
+    scorer, host="127.0.0.1", port=8000, max_batch_size=256, max_latency_ms=2.0
+):
+    """
+    Create an HTTP prediction server around a compiled scorer.
+
+    ``POST /predict`` takes ``{"instances": [{feature: value, ...}, ...]}``
+    and returns ``{"predictions": [...]}``; ``GET /health`` reports liveness.
+    Call ``serve_forever()`` on the result, and ``shutdown()`` followed by
+    ``server_close()`` and ``batcher.close()`` to stop it.
+
+    Parameters
+    ----------
+    scorer : LinearScorer
+        Compiled model.
+    host : str, optional
+        Interface to bind, by default "127.0.0.1".
+    port : int, optional
+        Port to bind (0 picks a free one), by default 8000.
+    max_batch_size : int, optional
+        Maximum number of records per micro-batch, by default 256.
+    max_latency_ms : float, optional
+        How long the first request of a batch waits for others, by default 2.
+
+    Returns
+    -------
+    ThreadingHTTPServer
+        The server, with the micro-batcher attached as ``server.batcher``.
+    """
+    server = ThreadingHTTPServer((host, port), _PredictionHandler)
+    server.daemon_threads = True
+    server.batcher = MicroBatcher(
+        scorer.predict_records, max_batch_size, max_latency_ms
+    )
+    return server
@@ -0,0 +1,278 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# Numeric columns whose moments are accumulated
+MOMENT_COLUMNS = ["sleep_duration", "sleep_quality", "stress_level"]
+
+# Columns plotted against stress_level in the scatter panels
+PAIR_COLUMNS = ["sleep_duration", "sleep_quality"]
+
+# Ways of evaluating a kernel density estimate
+KDE_METHODS = ("exact", "binned")
+
+LinregressResult = namedtuple(
+    "LinregressResult", ["slope", "intercept", "rvalue", "pvalue", "stderr"]
+)
+
+
+def _add_counts(a: pd.Series, b: pd.Series) -> pd.Series:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return a.add(b, fill_value=0).astype("int64")
+
+
+class SleepStats:
+    """
+    Mergeable sufficient statistics of the cleaned sleep data.
+
+    A single vectorized pass over each chunk accumulates the row count, the
+    means and co-moment matrix (sums of squares and cross-products about
+    the mean) of the numeric columns, counts of each distinct
+    (x, stress_level) pair for the scatter panels, and per-disorder
+    stress_level histograms. Statistics of separate chunks are combined
+    with ``merge``, so the data never has to be in memory at once.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean = np.zeros(len(MOMENT_COLUMNS))
+        self.comoment = np.zeros((len(MOMENT_COLUMNS), len(MOMENT_COLUMNS)))
+        self.pair_counts = {col: None for col in PAIR_COLUMNS}
+        self.disorder_counts = None
+        self.disorder_order = []
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "SleepStats":
+        """Statistics of one chunk of cleaned data."""
+        result = cls()
+        values = df[MOMENT_COLUMNS].to_numpy(dtype=np.float64)
+        result.n = len(values)
+        if result.n == 0:
+            return result
+        result.mean = values.mean(axis=0)
+        centered = values - result.mean
+        result.comoment = centered.T @ centered
+
+        for col in PAIR_COLUMNS:
+            result.pair_counts[col] = df.groupby([col, "stress_level"]).size()
+        disorder = df["sleep_disorder"].astype(str)
+        result.disorder_counts = df.groupby([disorder, "stress_level"]).size()
+        result.disorder_order = list(disorder.unique())
+        return result
+
+    def update(self, df: pd.DataFrame) -> "SleepStats":
+        """Add a chunk of cleaned data; returns self."""
+        return self.merge(SleepStats.from_frame(df))
+
+    def merge(self, other: "SleepStats") -> "SleepStats":
+        """Combine with the statistics of another chunk; returns self."""
+        n = self.n + other.n
+        if n:
+            delta = other.mean - self.mean
+            self.comoment = (
+                self.comoment
+                + other.comoment
+                + np.outer(delta, delta) * self.n * other.n / n
+            )
+            self.mean = self.mean + delta * other.n / n
+        self.n = n
+
+        for col in PAIR_COLUMNS:
+            self.pair_counts[col] = _add_counts(
+                self.pair_counts[col], other.pair_counts[col]
+            )
+        self.disorder_counts = _add_counts(self.disorder_counts, other.disorder_counts)
+        self.disorder_order += [
+            d for d in other.disorder_order if d not in self.disorder_order
+        ]
+        return self
+
+    def _index(self, col: str) -> int:
+        return MOMENT_COLUMNS.index(col)
+
+    def variance(self, col: str) -> float:
+        """Sample variance (ddof=1) of a numeric column."""
+        i = self._index(col)
+        return self.comoment[i, i] / (self.n - 1) if self.n > 1 else 0.0
+
+    def linregress(self, x: str, y: str) -> LinregressResult:
+        """
+        Least-squares regression of y on x, as ``scipy.stats.linregress``.
+
+        Raises
+        ------
+        ValueError
+            If there are fewer than two rows or x is constant.
+        """
+        i, j = self._index(x), self._index(y)
+        sxx, syy, sxy = self.comoment[i, i], self.comoment[j, j], self.comoment[i, j]
+        if self.n < 2 or sxx == 0:
+            raise ValueError("Regression needs at least two distinct x values.")
+
+        slope = sxy / sxx
+        intercept = self.mean[j] - slope * self.mean[i]
+        r = np.clip(sxy / np.sqrt(sxx * syy), -1.0, 1.0) if syy > 0 else 0.0
+        dof = self.n - 2
+        if dof > 0 and abs(r) < 1:
+            t = r * np.sqrt(dof / ((1.0 - r) * (1.0 + r)))
+            from scipy import stats
+
+            pvalue = 2 * stats.t.sf(abs(t), dof)
+            stderr = np.sqrt((1 - r**2) * syy / sxx / dof)
+        else:
+            pvalue = 0.0 if abs(r) == 1 and dof > 0 else 1.0
+            stderr = 0.0
+        return LinregressResult(slope, intercept, r, pvalue, stderr)
+
+    def pairs(self, col: str) -> pd.DataFrame:
+        """Distinct (col, stress_level) pairs with their counts."""
+        counts = self.pair_counts[col]
+        return counts.rename("count").reset_index()
+
+    def stress_histogram(self, disorder: str = None) -> pd.Series:
+        """Counts of each stress level, overall or for one disorder."""
+        counts = self.disorder_counts
+        if disorder is not None:
+            return counts.xs(disorder, level=0)
+        return counts.groupby(level=1).sum()
+
+    def disorders(self) -> list:
+        """Disorders present in the data, in order of first appearance."""
+        return list(self.disorder_order)
+
+
+def kde_from_counts(values, counts, grid) -> np.ndarray:
+    """
+    Gaussian KDE of repeated values, identical to ``scipy.stats.gaussian_kde``.
+
+    Each distinct value contributes once, weighted by its count, so the cost
+    is O(distinct values x grid points) instead of O(rows x grid points).
+    The bandwidth follows Scott's rule on the expanded data.
+
+    Parameters
+    ----------
+    values : array-like
+        Distinct data values.
+    counts : array-like
+        Number of occurrences of each value.
+    grid : array-like
+        Points at which the density is evaluated.
+
+    Returns
+    -------
+    np.ndarray
+        Density at each grid point.
+    """
+    values, counts, grid = _as_float(values, counts, grid)
+    n = counts.sum()
+    bandwidth = scott_bandwidth(values, counts)
+
+    z = (grid[:, None] - values[None, :]) / bandwidth
+    kernel = np.exp(-0.5 * z**2) / np.sqrt(2 * np.pi)
+    return kernel @ counts / (n * bandwidth)
+
+
+def _as_float(*arrays):
+    return [np.asarray(a, dtype=np.float64) for a in arrays]
+
+
+def scott_bandwidth(values, counts) -> float:
+    """Scott's rule bandwidth of repeated values, as used by gaussian_kde."""
+    values, counts = _as_float(values, counts)
+    n = counts.sum()
+    mean = np.dot(values, counts) / n
+    std = np.sqrt(np.dot(counts, (values - mean) ** 2) / (n - 1))
+    return std * n ** (-1 / 5)
+
+
+def binned_kde(values, counts, grid) -> np.ndarray:
+    """
+    Gaussian KDE of repeated values, approximated on a regular grid.
+
+    The counts are spread over the two nearest grid points (linear
+    binning) and the binned counts are convolved with the Gaussian kernel
+    by FFT, so the cost is O(grid points x log(grid points)) whatever the
+    number of rows or distinct values. The bandwidth is the same as in
+    ``kde_from_counts``; the error shrinks with the square of the grid
+    spacing.
+
+    Parameters
+    ----------
+    values : array-like
+        Distinct data values, all within the grid.
+    counts : array-like
+        Number of occurrences of each value.
+    grid : array-like
+        Evenly spaced points at which the density is evaluated.
+
+    Returns
+    -------
+    np.ndarray
+        Density at each grid point.
+
+    Raises
+    ------
+    ValueError
+        If the grid is not evenly spaced or does not cover the values.
+    """
+    values, counts, grid = _as_float(values, counts, grid)
+    m = len(grid)
+    step = (grid[-1] - grid[0]) / (m - 1) if m > 1 else 0.0
+    if step <= 0 or not np.allclose(np.diff(grid), step):
+        raise ValueError("Binned KDE needs an increasing, evenly spaced grid.")
+    position = (values - grid[0]) / step
+    if position.min() < -1e-9 or position.max() > m - 1 + 1e-9:
+        raise ValueError("Binned KDE needs a grid that covers all values.")
+
+    # Linear binning: each value is split between its two neighbouring points
+    position = np.clip(position, 0, m - 1)
+    left = np.minimum(np.floor(position).astype(np.int64), m - 2) if m > 1 else 0
+    frac = position - left
+    binned = np.bincount(left, counts * (1 - frac), minlength=m)
+    binned += np.bincount(np.minimum(left + 1, m - 1), counts * frac, minlength=m)
+
+    n = counts.sum()
+    bandwidth = scott_bandwidth(values, counts)
+    offsets = np.arange(-(m - 1), m) * step / bandwidth
+    kernel = np.exp(-0.5 * offsets**2) / np.sqrt(2 * np.pi)
+
+    # Linear (not circular) convolution through zero-padded real FFTs
+    size = 1 << int(np.ceil(np.log2(3 * m - 2)))
+    full = np.fft.irfft(np.fft.rfft(binned, size) * np.fft.rfft(kernel, size), size)
+    density = full[m - 1 : 2 * m - 1] / (n * bandwidth)
+    return np.maximum(density, 0.0)
+
+
+def evaluate_kde(values, counts, grid, method: str = "exact") -> np.ndarray:
+    """
+    Gaussian KDE of repeated values with the given method.
+
+    Parameters
+    ----------
+    values, counts, grid : array-like
+        As in ``kde_from_counts``.
+    method : str, optional
+        "exact" (``kde_from_counts``) or "binned" (``binned_kde``), by
+        default "exact".
+
+    Returns
+    -------
+    np.ndarray
+        Density at each grid point.
+
+    Raises
+    ------
+    ValueError
+        If the method is unknown.
+    """
+    if method == "exact":
+        return kde_from_counts(values, counts, grid)
+    if method == "binned":
+        return binned_kde(values, counts, grid)
+    raise ValueError(
+        f"Unknown KDE method '{method}', expected one of {list(KDE_METHODS)}"
+    )
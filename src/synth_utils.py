@@ -0,0 +1,204 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Columns of the raw data, in file order
+RAW_COLUMNS = [
+    "Person ID",
+    "Gender",
+    "Age",
+    "Occupation",
+    "Sleep Duration",
+    "Quality of Sleep",
+    "Physical Activity Level",
+    "Stress Level",
+    "BMI Category",
+    "Blood Pressure",
+    "Heart Rate",
+    "Daily Steps",
+    "Sleep Disorder",
+]
+
+# Category frequencies and relationships below were estimated from the
+# 374-row Sleep Health and Lifestyle data
+
+# Occupation frequencies and the share of men in each occupation
+OCCUPATIONS = {
+    "Nurse": (73, 0.0),
+    "Doctor": (71, 0.97),
+    "Engineer": (63, 0.49),
+    "Lawyer": (47, 0.96),
+    "Teacher": (40, 0.13),
+    "Accountant": (37, 0.03),
+    "Salesperson": (32, 1.0),
+    "Scientist": (4, 0.0),
+    "Software Engineer": (4, 1.0),
+    "Sales Representative": (2, 1.0),
+    "Manager": (1, 0.0),
+}
+
+STRESS_LEVELS = {3: 71, 4: 70, 5: 67, 6: 46, 7: 50, 8: 70}
+
+# BMI category frequencies, mean systolic pressure and the shares of
+# (no disorder, insomnia, sleep apnea)
+BMI_CATEGORIES = {
+    "Normal": (195, 124.0, (0.938, 0.036, 0.026)),
+    "Normal Weight": (21, 122.0, (0.810, 0.095, 0.095)),
+    "Overweight": (148, 135.0, (0.128, 0.433, 0.439)),
+    "Obese": (10, 139.0, (0.0, 0.4, 0.6)),
+}
+
+DISORDERS = np.array([np.nan, "Insomnia", "Sleep Apnea"], dtype=object)
+
+
+def _probabilities(weights) -> np.ndarray:
+    weights = np.asarray(weights, dtype=np.float64)
+    return weights / weights.sum()
+
+
+def _clipped_normal(rng, mean, sd, low, high, size=None):
+    return np.clip(rng.normal(mean, sd, size), low, high)
+
+
+def generate_sleep_data(
+    n_rows: int, random_state: int = 522, start_id: int = 1
+) -> pd.DataFrame:
+    """
+    Generate synthetic raw sleep data with the schema of the real file.
+
+    Every column of the raw CSV is produced with the value ranges of the
+    real data, its category frequencies, and its main relationships:
+    gender depends on occupation, sleep duration, quality and heart rate
+    on stress level, daily steps on physical activity, and blood pressure
+    and sleep disorder on BMI category. Missing disorders are NaN, as in
+    the raw file.
+
+    Parameters
+    ----------
+    n_rows : int
+        Number of rows.
+    random_state : int or sequence of int, optional
+        Seed of the generator, by default 522.
+    start_id : int, optional
+        Person ID of the first row, by default 1.
+
+    Returns
+    -------
+    pd.DataFrame
+        Raw data with the RAW_COLUMNS.
+    """
+    rng = np.random.default_rng(random_state)
+
+    occupations = np.array(list(OCCUPATIONS), dtype=object)
+    occupation = rng.choice(
+        len(occupations), n_rows, p=_probabilities([v[0] for v in OCCUPATIONS.values()])
+    )
+    male_share = np.array([v[1] for v in OCCUPATIONS.values()])[occupation]
+    gender = np.where(rng.random(n_rows) < male_share, "Male", "Female")
+
+    age = np.rint(_clipped_normal(rng, 42.2, 8.7, 27, 59, n_rows)).astype(np.int64)
+
+    stress = rng.choice(
+        np.array(list(STRESS_LEVELS)),
+        n_rows,
+        p=_probabilities(list(STRESS_LEVELS.values())),
+    )
+    duration = np.round(_clipped_normal(rng, 9.09 - 0.364 * stress, 0.46, 5.8, 8.5), 1)
+    quality = np.rint(
+        _clipped_normal(rng, 4.41 - 0.36 * stress + 0.678 * duration, 0.42, 4, 9)
+    ).astype(np.int64)
+    heart_rate = np.rint(
+        _clipped_normal(rng, 61.8 + 1.56 * stress, 3.1, 65, 86)
+    ).astype(np.int64)
+
+    activity = np.rint(_clipped_normal(rng, 59.2, 20.8, 30, 90, n_rows)).astype(
+        np.int64
+    )
+    steps = (
+        np.rint(_clipped_normal(rng, 3266 + 60 * activity, 1026, 3000, 10000) / 100)
+        * 100
+    ).astype(np.int64)
+
+    bmi_names = np.array(list(BMI_CATEGORIES), dtype=object)
+    bmi = rng.choice(
+        len(bmi_names),
+        n_rows,
+        p=_probabilities([v[0] for v in BMI_CATEGORIES.values()]),
+    )
+    systolic = np.rint(
+        _clipped_normal(
+            rng, np.array([v[1] for v in BMI_CATEGORIES.values()])[bmi], 4.0, 115, 142
+        )
+    ).astype(np.int64)
+    diastolic = np.rint(
+        _clipped_normal(rng, 0.774 * systolic - 14.8, 2.0, 75, 95)
+    ).astype(np.int64)
+    # Format each distinct pressure once instead of once per row
+    pairs, inverse = np.unique(systolic * 1000 + diastolic, return_inverse=True)
+    labels = np.array([f"{p // 1000}/{p % 1000}" for p in pairs], dtype=object)
+
+    # Draw the disorder from the cumulative shares of the row's BMI category
+    cumulative = np.cumsum([v[2] for v in BMI_CATEGORIES.values()], axis=1)[bmi]
+    disorder = (rng.random(n_rows)[:, None] > cumulative[:, :-1]).sum(axis=1)
+
+    return pd.DataFrame(
+        {
+            "Person ID": np.arange(start_id, start_id + n_rows, dtype=np.int64),
+            "Gender": gender.astype(object),
+            "Age": age,
+            "Occupation": occupations[occupation],
+            "Sleep Duration": duration,
+            "Quality of Sleep": quality,
+            "Physical Activity Level": activity,
+            "Stress Level": stress.astype(np.int64),
+            "BMI Category": bmi_names[bmi],
+            "Blood Pressure": labels[inverse.ravel()],
+            "Heart Rate": heart_rate,
+            "Daily Steps": steps,
+            "Sleep Disorder": DISORDERS[disorder],
+        },
+        columns=RAW_COLUMNS,
+    )
+
+
+def write_sleep_data(
+    path: str, n_rows: int, random_state: int = 522, chunksize: int = 1_000_000
+) -> int:
+    """
+    Write synthetic raw sleep data to a CSV file, chunk by chunk.
+
+    Only one chunk is held in memory, so files of 10^8 rows or more can be
+    written. Chunk ``i`` is generated with the seed ``(random_state, i)``,
+    so the file depends on both the seed and the chunk size.
+
+    Parameters
+    ----------
+    path : str
+        Output CSV path.
+    n_rows : int
+        Total number of rows.
+    random_state : int, optional
+        Seed of the generator, by default 522.
+    chunksize : int, optional
+        Rows generated and written at a time, by default 1,000,000.
+
+    Returns
+    -------
+    int
+        Number of rows written.
+    """
+    out_dir = os.path.dirname(path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+
+    written = 0
+    with open(path, "w", newline="") as f:
+        for i, start in enumerate(range(0, max(n_rows, 1), chunksize)):
+            size = min(chunksize, n_rows - start)
+            chunk = generate_sleep_data(
+                size, random_state=[random_state, i], start_id=start + 1
+            )
+            chunk.to_csv(f, index=False, header=i == 0)
+            written += size
+    return written
@@ -0,0 +1,66 @@
+import hashlib
+import json
+import pandas as pd
+import pytest
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from sklearn.linear_model import Ridge
+
+from src.artifact_utils import (
+    build_metadata,
+    file_sha256,
+    load_model_artifact,
+    save_model_artifact,
+)
+
+
+@pytest.fixture
+def training_data(tmp_path):
+    """Small training frame saved to disk so that it can be hashed."""
+    df = pd.DataFrame({"x": [1.0, 2.0, 3.0, 4.0], "y": [2.0, 4.1, 5.9, 8.0]})
+    path = tmp_path / "train.csv"
+    df.to_csv(path, index=False)
+    return df, str(path)
+
+
+def test_file_sha256_matches_hashlib(training_data):
+    """The chunked file hash should equal hashing the whole file at once."""
+    _, path = training_data
+    expected = hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+    assert file_sha256(path, chunk_size=7) == expected
+
+
+def test_artifact_round_trip(training_data, tmp_path):
+    """A saved model should load back with identical predictions and metadata."""
+    df, path = training_data
+    model = Ridge().fit(df[["x"]], df["y"])
+    metadata = build_metadata(
+        df[["x"]], "y", input_file=path, metrics={"test_MSE": 0.1}
+    )
+    artifact = tmp_path / "models" / "model.joblib"
+
+    save_model_artifact(model, str(artifact), metadata)
+    loaded, loaded_metadata = load_model_artifact(str(artifact))
+
+    assert loaded.predict(df[["x"]]).tolist() == model.predict(df[["x"]]).tolist()
+    assert loaded_metadata["training_data_sha256"] == file_sha256(path)
+    assert loaded_metadata["features"] == [{"name": "x", "dtype": "float64"}]
+    assert json.loads(Path(f"{artifact}.json").read_text()) == loaded_metadata
+
+
+def test_load_model_artifact_rejects_unknown_version(training_data, tmp_path):
+    """Artifacts with another layout version should raise a ValueError."""
+    df, _ = training_data
+    metadata = build_metadata(df[["x"]], "y")
+    metadata["artifact_version"] = 999
+    artifact = tmp_path / "model.joblib"
+    save_model_artifact(Ridge(), str(artifact), metadata)
+
+    with pytest.raises(ValueError, match="Unsupported artifact version"):
+        load_model_artifact(str(artifact))
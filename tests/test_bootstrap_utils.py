@@ -0,0 +1,116 @@
+"""
+Tests for src/bootstrap_utils.py - vectorized bootstrap confidence intervals
+
+some of the tests performed in this file are:
+- Test good input: intervals agree with a replicate-by-replicate loop bootstrap.
+- Test good input: results are identical with one or two worker processes.
+- Test good input: chunking the replicates does not change the result.
+- Test good input: compressed rows with counts match the uncompressed rows.
+- Test good input: poisson weights give intervals close to multinomial ones.
+- Test good input: bootstrap_correlation matches scipy's linregress estimate.
+- Test bad input: unknown methods and empty samples raise ValueError.
+"""
+
+import sys
+import numpy as np
+import pytest
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from scipy.stats import linregress
+
+from src.bootstrap_utils import (
+    bootstrap_correlation,
+    bootstrap_regression_metrics,
+    bootstrap_sums,
+    compress_rows,
+)
+
+
+@pytest.fixture(scope="module")
+def predictions():
+    rng = np.random.default_rng(0)
+    y_true = rng.integers(3, 9, 150).astype(float)
+    y_pred = y_true + rng.normal(0, 0.7, 150)
+    return y_true, y_pred
+
+
+def test_intervals_match_loop_bootstrap(predictions):
+    y_true, y_pred = predictions
+    table = bootstrap_regression_metrics(y_true, y_pred, n_replicates=4000)
+
+    rng = np.random.default_rng(1)
+    mse = []
+    for _ in range(4000):
+        idx = rng.integers(0, len(y_true), len(y_true))
+        mse.append(np.mean((y_true[idx] - y_pred[idx]) ** 2))
+    low, high = np.percentile(mse, [2.5, 97.5])
+
+    assert table["Value"][0] == pytest.approx(np.mean((y_true - y_pred) ** 2))
+    assert table["CI Low"][0] == pytest.approx(low, rel=0.05)
+    assert table["CI High"][0] == pytest.approx(high, rel=0.05)
+    assert table["CI Low"][1] < table["Value"][1] < table["CI High"][1]
+
+
+def test_same_result_with_workers(predictions):
+    values = np.column_stack(predictions)
+    serial = bootstrap_sums(values, n_replicates=200, n_jobs=1, max_cells=3000)
+    parallel = bootstrap_sums(values, n_replicates=200, n_jobs=2, max_cells=3000)
+    np.testing.assert_array_equal(serial, parallel)
+
+
+def test_chunking_keeps_replicate_distribution(predictions):
+    values = np.column_stack(predictions)
+    whole = bootstrap_sums(values, n_replicates=2000)
+    chunked = bootstrap_sums(values, n_replicates=2000, max_cells=1000)
+    assert chunked.shape == whole.shape == (2000, 2)
+    np.testing.assert_allclose(chunked.mean(axis=0), whole.mean(axis=0), rtol=0.01)
+    np.testing.assert_allclose(chunked.std(axis=0), whole.std(axis=0), rtol=0.1)
+
+
+def test_compressed_rows_match_full_rows():
+    rng = np.random.default_rng(2)
+    values = rng.integers(0, 4, (400, 2)).astype(float)
+    unique, counts = compress_rows(values)
+    assert counts.sum() == len(values)
+    assert len(unique) <= 16
+
+    full = bootstrap_sums(values, n_replicates=3000)
+    compressed = bootstrap_sums(unique, counts, n_replicates=3000)
+    np.testing.assert_allclose(full[:, 0].sum() / 3000, values[:, 0].sum(), rtol=0.01)
+    np.testing.assert_allclose(compressed.mean(axis=0), values.sum(axis=0), rtol=0.01)
+    np.testing.assert_allclose(compressed.std(axis=0), full.std(axis=0), rtol=0.1)
+
+
+def test_poisson_weights(predictions):
+    multinomial = bootstrap_regression_metrics(*predictions, n_replicates=3000)
+    poisson = bootstrap_regression_metrics(
+        *predictions, n_replicates=3000, method="poisson"
+    )
+    np.testing.assert_allclose(
+        poisson[["CI Low", "CI High"]], multinomial[["CI Low", "CI High"]], rtol=0.1
+    )
+
+
+def test_correlation_matches_linregress():
+    rng = np.random.default_rng(3)
+    x = rng.uniform(5, 9, 300).round(1)
+    y = np.clip(np.round(12 - x + rng.normal(0, 1, 300)), 3, 8)
+    pairs, counts = compress_rows(np.column_stack([x, y]))
+
+    result = bootstrap_correlation(pairs[:, 0], pairs[:, 1], counts, n_replicates=500)
+    expected = linregress(x, y)
+    assert result["r"] == pytest.approx(expected.rvalue)
+    assert result["slope"] == pytest.approx(expected.slope)
+    assert result["r_ci_low"] < result["r"] < result["r_ci_high"] < 0
+    assert result["slope_ci_low"] < result["slope"] < result["slope_ci_high"]
+
+
+def test_bad_input_raises():
+    with pytest.raises(ValueError, match="Unknown bootstrap method"):
+        bootstrap_sums(np.ones((5, 1)), method="jackknife")
+    with pytest.raises(ValueError, match="empty sample"):
+        bootstrap_sums(np.empty((0, 2)))
@@ -0,0 +1,72 @@
+import pytest
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.cache_utils import run_cached, stage_key
+
+
+@pytest.fixture
+def stage(tmp_path):
+    """A stage that doubles the content of an input file and counts its runs."""
+    input_file = tmp_path / "input.txt"
+    input_file.write_text("abc")
+    source = tmp_path / "stage.py"
+    source.write_text("# v1")
+    output_file = tmp_path / "out" / "output.txt"
+    calls = []
+
+    def fn():
+        calls.append(1)
+        output_file.parent.mkdir(exist_ok=True)
+        output_file.write_text(input_file.read_text() * 2)
+
+    def run(params=None):
+        return run_cached(
+            "double",
+            fn,
+            inputs=[str(input_file)],
+            outputs=[str(output_file)],
+            params=params or {"n": 2},
+            sources=[str(source)],
+            cache_dir=str(tmp_path / "cache"),
+        )
+
+    return run, calls, input_file, source, output_file
+
+
+def test_run_cached_restores_outputs_on_hit(stage):
+    """A repeated run should skip the stage and restore its outputs."""
+    run, calls, _, _, output_file = stage
+
+    assert run() is False
+    output_file.unlink()
+    assert run() is True
+
+    assert len(calls) == 1
+    assert output_file.read_text() == "abcabc"
+
+
+def test_run_cached_invalidates_on_changes(stage):
+    """Changing inputs, parameters or sources should rerun the stage."""
+    run, calls, input_file, source, output_file = stage
+    run()
+
+    input_file.write_text("xyz")
+    run()
+    run(params={"n": 3})
+    source.write_text("# v2")
+    run()
+
+    assert len(calls) == 4
+    assert output_file.read_text() == "xyzxyz"
+
+
+def test_stage_key_ignores_param_order(tmp_path):
+    """Keys should not depend on the order parameters are given in."""
+    assert stage_key("s", [], {"a": 1, "b": 2}, []) == stage_key(
+        "s", [], {"b": 2, "a": 1}, []
+    )
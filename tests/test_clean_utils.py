@@ -8,7 +8,14 @@ ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
-from src.clean_utils import clean_sleep_data
+from src.clean_utils import (
+    clean_sleep_data,
+    clean_sleep_data_chunked,
+    group_train_mask,
+    hash_train_mask,
+)
+from src.io_utils import read_clean_data, write_clean_data
+from src.schema_utils import CLEAN_SCHEMA, memory_report
 
 
 @pytest.fixture
@@ -105,3 +112,131 @@ def test_clean_sleep_data_small_dataframe():
     # If only 1 row, our logic sets train=1
     assert len(cleaned_df) == 1
     assert cleaned_df.iloc[0]["train"] == 1
+
+
+def test_clean_sleep_data_chunked_matches_in_memory(tmp_path):
+    """The streaming cleaner should write exactly what the in-memory path writes."""
+    source = ROOT_DIR / "data" / "raw" / "sleep_data_raw.csv"
+    expected_file = tmp_path / "expected.csv"
+    write_clean_data(clean_sleep_data(pd.read_csv(source)), str(expected_file))
+
+    streamed_file = tmp_path / "streamed.csv"
+    n_rows = clean_sleep_data_chunked(str(source), str(streamed_file), chunksize=50)
+
+    assert n_rows == 374
+    assert streamed_file.read_bytes() == expected_file.read_bytes()
+
+
+def test_clean_sleep_data_chunked_missing_columns(tmp_path):
+    """The streaming cleaner should validate columns before writing anything."""
+    source = tmp_path / "bad.csv"
+    pd.DataFrame({"Person ID": [1, 2], "Sleep Duration": [7.0, 6.0]}).to_csv(
+        source, index=False
+    )
+    dest = tmp_path / "out.csv"
+
+    with pytest.raises(ValueError, match="missing from the dataframe"):
+        clean_sleep_data_chunked(str(source), str(dest))
+    assert not dest.exists()
+
+
+def test_clean_sleep_data_hash_split_is_stable_when_appending(raw_data):
+    """Hash split assignments should not change when new people are appended."""
+    cleaned_df = clean_sleep_data(raw_data, split="hash")
+    assert cleaned_df["train"].isin([0, 1]).all()
+
+    more_rows = raw_data.assign(**{"Person ID": raw_data["Person ID"] + 5})
+    extended_df = clean_sleep_data(pd.concat([raw_data, more_rows]), split="hash")
+
+    assert extended_df["train"].iloc[:5].tolist() == cleaned_df["train"].tolist()
+
+
+def test_hash_train_mask_fraction_and_seed():
+    """Hash split should respect test_size on average and depend on the seed."""
+    ids = np.arange(100_000)
+    mask = hash_train_mask(ids, random_state=522)
+
+    assert abs(mask.mean() - 0.8) < 0.01
+    assert (mask != hash_train_mask(ids, random_state=1)).any()
+    assert (mask == hash_train_mask(ids, random_state=522)).all()
+
+
+def test_clean_sleep_data_chunked_hash_split(tmp_path):
+    """The streaming cleaner should match the in-memory hash split in one pass."""
+    source = ROOT_DIR / "data" / "raw" / "sleep_data_raw.csv"
+    expected = clean_sleep_data(pd.read_csv(source), split="hash")
+
+    streamed_file = tmp_path / "streamed.csv"
+    clean_sleep_data_chunked(
+        str(source), str(streamed_file), chunksize=64, split="hash"
+    )
+
+    pd.testing.assert_frame_equal(read_clean_data(str(streamed_file)), expected)
+
+
+def test_clean_sleep_data_stratified_split():
+    """The stratified split should keep the disorder proportions on both sides."""
+    raw = pd.read_csv(ROOT_DIR / "data" / "raw" / "sleep_data_raw.csv")
+    cleaned_df = clean_sleep_data(raw, split="stratified")
+
+    shares = cleaned_df.groupby("train")["sleep_disorder"].value_counts(normalize=True)
+    np.testing.assert_allclose(
+        shares[True].sort_index(), shares[False].sort_index(), atol=0.01
+    )
+    assert cleaned_df["train"].sum() == 299
+
+
+def test_clean_sleep_data_group_split_keeps_profiles_together():
+    """Identical raw profiles should never straddle the train/test split."""
+    raw = pd.read_csv(ROOT_DIR / "data" / "raw" / "sleep_data_raw.csv")
+    cleaned_df = clean_sleep_data(raw, split="group")
+
+    profiles = raw.drop(columns="Person ID").astype(str).agg("|".join, axis=1)
+    sides = pd.Series(cleaned_df["train"].to_numpy()).groupby(profiles).nunique()
+    assert (sides == 1).all()
+    assert 0.7 < cleaned_df["train"].mean() < 0.9
+
+
+def test_group_train_mask_custom_key(raw_data):
+    """Rows sharing the configured key should share a side."""
+    raw_data["Extra Column"] = ["A", "A", "A", "B", "B"]
+    mask = group_train_mask(raw_data, ["Extra Column"], random_state=1)
+    assert mask[0] == mask[1] == mask[2]
+    assert mask[3] == mask[4]
+
+    with pytest.raises(ValueError, match="Unknown group columns"):
+        clean_sleep_data(raw_data, split="group", group_columns=["Missing"])
+
+
+@pytest.mark.parametrize("split", ["stratified", "group"])
+def test_clean_sleep_data_chunked_new_splits(tmp_path, split):
+    """The streaming cleaner should match the in-memory stratified and group splits."""
+    source = ROOT_DIR / "data" / "raw" / "sleep_data_raw.csv"
+    expected = clean_sleep_data(pd.read_csv(source), split=split)
+
+    streamed_file = tmp_path / "streamed.csv"
+    clean_sleep_data_chunked(str(source), str(streamed_file), chunksize=64, split=split)
+
+    pd.testing.assert_frame_equal(read_clean_data(str(streamed_file)), expected)
+
+
+def test_clean_sleep_data_unknown_split(raw_data):
+    """Unknown split modes should raise a ValueError."""
+    with pytest.raises(ValueError, match="Unknown split mode"):
+        clean_sleep_data(raw_data, split="bogus")
+
+
+def test_clean_sleep_data_applies_compact_schema(raw_data):
+    """Cleaned columns should use the declared compact dtypes."""
+    cleaned_df = clean_sleep_data(raw_data)
+
+    assert cleaned_df.dtypes.astype(str).to_dict() == CLEAN_SCHEMA
+
+
+def test_memory_report_on_bundled_data():
+    """The compact schema should shrink the bundled data at least five-fold."""
+    raw = pd.read_csv(ROOT_DIR / "data" / "raw" / "sleep_data_raw.csv")
+    report = memory_report(clean_sleep_data(raw))
+
+    assert list(report.columns) == ["before", "after", "ratio"]
+    assert report.loc["total", "ratio"] >= 5
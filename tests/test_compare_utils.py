@@ -0,0 +1,106 @@
+"""
+Tests for src/compare_utils.py - multi-model comparison
+
+some of the tests performed in this file are:
+- Test good input: ridge scores on the cached folds match run_cross_validation.
+- Test good input: process-pool results equal the in-process results.
+- Test good input: the leaderboard has one row per model, ranked by score.
+- Test good input: run_model_comparison writes the fold and leaderboard tables.
+- Test bad input: unknown model names raise ValueError.
+"""
+
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from sklearn.linear_model import Ridge
+from sklearn.pipeline import make_pipeline
+
+from src.compare_utils import (
+    MODEL_NAMES,
+    compare_models,
+    leaderboard,
+    run_model_comparison,
+)
+from src.model_utils import make_preprocessor, run_cross_validation
+
+
+@pytest.fixture(scope="module")
+def train_df():
+    rng = np.random.default_rng(0)
+    n = 120
+    sleep_duration = rng.uniform(5.8, 8.5, n)
+    sleep_disorder = rng.choice(["No Disorder", "Insomnia", "Sleep Apnea"], n)
+    stress_level = np.clip(
+        np.round(20 - 2 * sleep_duration + rng.normal(0, 0.5, n)), 3, 8
+    ).astype(int)
+    return pd.DataFrame(
+        {
+            "sleep_duration": sleep_duration,
+            "sleep_disorder": sleep_disorder,
+            "stress_level": stress_level,
+        }
+    )
+
+
+def _split(df):
+    return df.drop(columns="stress_level"), df["stress_level"]
+
+
+def test_ridge_matches_run_cross_validation(train_df):
+    X, y = _split(train_df)
+    folds = compare_models(X, y, models=["ridge"], n_jobs=1)
+    expected = run_cross_validation(make_pipeline(make_preprocessor(), Ridge()), X, y)
+
+    assert folds["fold"].tolist() == list(range(5))
+    for column in ["test_neg_mean_squared_error", "train_r2"]:
+        np.testing.assert_allclose(folds[column], expected[column])
+
+
+def test_process_pool_matches_serial(train_df):
+    X, y = _split(train_df)
+    serial = compare_models(X, y, models=["ridge", "knn"], n_repeats=2, n_jobs=1)
+    pooled = compare_models(X, y, models=["ridge", "knn"], n_repeats=2, n_jobs=2)
+
+    assert len(serial) == 2 * 10
+    scores = [c for c in serial.columns if c.startswith(("test_", "train_"))]
+    pd.testing.assert_frame_equal(serial[scores], pooled[scores])
+
+
+def test_leaderboard_ranks_models(train_df):
+    X, y = _split(train_df)
+    board = leaderboard(compare_models(X, y, n_jobs=1))
+
+    assert sorted(board["model"]) == sorted(MODEL_NAMES)
+    assert board["rank"].tolist() == list(range(1, len(MODEL_NAMES) + 1))
+    assert board["test_neg_mean_squared_error"].is_monotonic_decreasing
+    assert "std_test_neg_mean_squared_error" in board.columns
+    assert "fold" not in board.columns
+    # Every model beats predicting the mean on this strongly linear data
+    assert board["model"].iloc[-1] == "dummy"
+
+
+def test_run_model_comparison_writes_tables(train_df, tmp_path):
+    prefix = tmp_path / "comparison"
+    board = run_model_comparison(
+        train_df, str(prefix), models=["dummy", "ridge"], n_jobs=1, table_format=["csv"]
+    )
+
+    assert board["model"].tolist() == ["ridge", "dummy"]
+    folds = pd.read_csv(f"{prefix}_folds.csv")
+    assert len(folds) == 10
+    assert "test_neg_MSE" in folds.columns
+    saved = pd.read_csv(f"{prefix}_leaderboard.csv")
+    assert saved["model"].tolist() == ["ridge", "dummy"]
+
+
+def test_unknown_model(train_df):
+    X, y = _split(train_df)
+    with pytest.raises(ValueError, match="expected some of"):
+        compare_models(X, y, models=["ridge", "svm"])
@@ -1,7 +1,11 @@
+import hashlib
+import json
 import os
+import threading
 import pandas as pd
 import pytest
 import sys
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
@@ -51,3 +55,83 @@ def test_download_csv_empty_input(tmp_path):
     # Check for same columns, zero rows
     assert list(result_df.columns) == list(input_df.columns)
     assert len(result_df) == 0
+
+
+class _CSVHandler(BaseHTTPRequestHandler):
+    """Serves one CSV body with ETag, conditional and Range support."""
+
+    body = b"a,b\n1,3\n2,4\n"
+    etag = '"v1"'
+    requests = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        type(self).requests.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body, status = self.body, 200
+        byte_range = self.headers.get("Range")
+        if byte_range and self.headers.get("If-Range") == self.etag:
+            start = int(byte_range.split("=")[1].rstrip("-"))
+            body, status = self.body[start:], 206
+        self.send_response(status)
+        self.send_header("ETag", self.etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def csv_server():
+    """Local stand-in for the remote CSV host."""
+    _CSVHandler.requests = []
+    server = HTTPServer(("127.0.0.1", 0), _CSVHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/data.csv"
+    server.shutdown()
+    server.server_close()
+
+
+def test_download_csv_url_is_conditional(csv_server, tmp_path):
+    """A second download of an unchanged URL should get a 304 and keep the file."""
+    output_file = tmp_path / "raw" / "data.csv"
+
+    download_csv(csv_server, str(output_file))
+    download_csv(csv_server, str(output_file))
+
+    assert output_file.read_bytes() == _CSVHandler.body
+    assert _CSVHandler.requests[1]["If-None-Match"] == '"v1"'
+    meta = json.loads((tmp_path / "raw" / "data.csv.meta.json").read_text())
+    assert meta["sha256"] == hashlib.sha256(_CSVHandler.body).hexdigest()
+
+
+def test_download_csv_resumes_partial_download(csv_server, tmp_path):
+    """An interrupted download should continue from its partial file."""
+    output_file = tmp_path / "data.csv"
+    (tmp_path / "data.csv.part").write_bytes(_CSVHandler.body[:5])
+    (tmp_path / "data.csv.part.json").write_text(
+        json.dumps({"url": csv_server, "etag": '"v1"'})
+    )
+
+    download_csv(csv_server, str(output_file))
+
+    assert _CSVHandler.requests[0]["Range"] == "bytes=5-"
+    assert output_file.read_bytes() == _CSVHandler.body
+    assert not (tmp_path / "data.csv.part").exists()
+
+
+def test_download_csv_checksum_mismatch(csv_server, tmp_path):
+    """A wrong SHA-256 should raise ValueError and leave no output file."""
+    output_file = tmp_path / "data.csv"
+
+    with pytest.raises(ValueError, match="SHA-256 mismatch"):
+        download_csv(csv_server, str(output_file), sha256="0" * 64)
+
+    assert not output_file.exists()
+    assert not (tmp_path / "data.csv.part").exists()
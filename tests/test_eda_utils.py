@@ -4,6 +4,7 @@ Tests for scripts/eda.py - Exploratory Data Analysis script
 some of the tests performed in this file are:
 - Test good input: valid data with all required columns creates output file.
 - Test good input: filters training data correctly when train column exists.
+- Test good input: correlations with bootstrap intervals are written.
 - Test bad input: missing train column uses all data with warning.
 - Test bad input: empty dataframe still creates output file.
 - Test bad input: single row dataframe (edge case).
@@ -172,3 +173,49 @@ def test_error_input_missing_columns(tmp_path):
 
     with pytest.raises(KeyError):
         perform_eda(str(input_file), str(output_dir))
+
+
+def test_good_input_binned_kde(sample_data, tmp_path):
+    """Test good input: the binned density mode also creates the output file."""
+    input_file = tmp_path / "test_data.csv"
+    sample_data.to_csv(input_file, index=False)
+
+    output_dir = tmp_path / "output"
+    perform_eda(str(input_file), str(output_dir), kde="binned", gridsize=64)
+
+    assert (output_dir / "eda_summary.png").exists()
+
+
+def test_good_input_aggregated_scatter(sample_data, tmp_path):
+    """Test good input: scatter panels can be aggregated above a row threshold."""
+    input_file = tmp_path / "test_data.csv"
+    sample_data.to_csv(input_file, index=False)
+
+    output_dir = tmp_path / "output"
+    perform_eda(str(input_file), str(output_dir), density_threshold=1)
+    perform_eda(str(input_file), str(output_dir / "hexbin"), scatter="hexbin")
+
+    assert (output_dir / "eda_summary.png").exists()
+    assert (output_dir / "hexbin" / "eda_summary.png").exists()
+
+
+def test_good_input_writes_correlations(sample_data, tmp_path):
+    """Test good input: correlations with bootstrap intervals are written."""
+    from scipy.stats import linregress
+
+    input_file = tmp_path / "test_data.csv"
+    sample_data.to_csv(input_file, index=False)
+
+    output_dir = tmp_path / "output"
+    perform_eda(str(input_file), str(output_dir), n_bootstrap=200)
+
+    correlations = pd.read_csv(output_dir / "eda_correlations.csv")
+    train = sample_data[sample_data["train"] == 1]
+    row = correlations.set_index("variable").loc["sleep_duration"]
+    expected = linregress(train["sleep_duration"], train["stress_level"])
+    assert row["n"] == 3
+    assert row["r"] == pytest.approx(expected.rvalue)
+    assert row["slope"] == pytest.approx(expected.slope)
+    assert {"r_ci_low", "r_ci_high", "slope_ci_low", "slope_ci_high"} <= set(
+        correlations.columns
+    )
@@ -0,0 +1,137 @@
+"""
+Tests for src/feature_utils.py - sparse feature matrix of the full raw schema
+
+some of the tests performed in this file are:
+- Test good input: blood pressure readings are split into two integers.
+- Test good input: the CSR matrix equals a dense one-hot encoding.
+- Test good input: the chunked build does not depend on the chunk size and
+  keeps the split of clean_sleep_data_chunked.
+- Test good input: the matrix round-trips through save/load.
+- Test good input: the sparse model matches a dense fit without densifying.
+- Test bad input: malformed blood pressure and unknown categories raise ValueError.
+"""
+
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from scipy import sparse
+
+from src.clean_utils import clean_sleep_data_chunked
+from src.feature_utils import (
+    CATEGORICAL_FEATURES,
+    NUMERIC_FEATURES,
+    build_feature_matrix,
+    clean_feature_data,
+    encode_features,
+    feature_names,
+    load_feature_matrix,
+    save_feature_matrix,
+    split_blood_pressure,
+)
+from src.model_utils import run_sparse_model_analysis
+from src.synth_utils import write_sleep_data
+
+
+@pytest.fixture(scope="module")
+def raw_file(tmp_path_factory):
+    path = tmp_path_factory.mktemp("raw") / "raw.csv"
+    write_sleep_data(str(path), 1_000, random_state=4)
+    return str(path)
+
+
+def test_split_blood_pressure():
+    bp = pd.Series(["126/83", "140/95", " 118 / 76 "], index=[5, 6, 7])
+    parts = split_blood_pressure(bp)
+
+    assert parts.index.tolist() == [5, 6, 7]
+    assert parts["systolic_bp"].tolist() == [126, 140, 118]
+    assert parts["diastolic_bp"].tolist() == [83, 95, 76]
+    assert (parts.dtypes == "int16").all()
+
+
+def test_encode_matches_dense_one_hot(raw_file):
+    clean = clean_feature_data(pd.read_csv(raw_file))
+    categories = {c: sorted(clean[c].unique()) for c in CATEGORICAL_FEATURES}
+    X = encode_features(clean, categories)
+
+    assert sparse.isspmatrix_csr(X)
+    dense = pd.get_dummies(
+        clean[NUMERIC_FEATURES + CATEGORICAL_FEATURES], prefix_sep="=", dtype=float
+    )
+    assert dense.columns.tolist() == feature_names(categories)
+    np.testing.assert_allclose(X.toarray(), dense.to_numpy(), rtol=1e-6)
+
+
+def test_build_is_chunk_independent(raw_file, tmp_path):
+    whole = build_feature_matrix(raw_file, split="hash", chunksize=10_000)
+    chunked = build_feature_matrix(raw_file, split="hash", chunksize=99)
+
+    assert whole["X"].shape == (1_000, len(whole["feature_names"]))
+    assert (whole["X"] != chunked["X"]).nnz == 0
+    np.testing.assert_array_equal(whole["y"], chunked["y"])
+    np.testing.assert_array_equal(whole["train"], chunked["train"])
+
+    clean_path = tmp_path / "clean.csv"
+    clean_sleep_data_chunked(raw_file, str(clean_path), chunksize=99)
+    clean = pd.read_csv(clean_path)
+    random_split = build_feature_matrix(raw_file, chunksize=99)
+    np.testing.assert_array_equal(random_split["train"], clean["train"] == 1)
+    np.testing.assert_array_equal(random_split["y"], clean["stress_level"])
+
+
+def test_save_and_load(raw_file, tmp_path):
+    features = build_feature_matrix(raw_file, chunksize=300)
+    path = save_feature_matrix(features, str(tmp_path / "out" / "features.npz"))
+    loaded = load_feature_matrix(path)
+
+    assert (loaded["X"] != features["X"]).nnz == 0
+    assert loaded["X"].dtype == np.float32
+    np.testing.assert_array_equal(loaded["y"], features["y"])
+    np.testing.assert_array_equal(loaded["train"], features["train"])
+    assert loaded["feature_names"] == features["feature_names"]
+
+
+def test_sparse_model_matches_dense(raw_file, tmp_path):
+    from sklearn.linear_model import Ridge
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import MaxAbsScaler
+
+    features = build_feature_matrix(raw_file, chunksize=300)
+    pipe = run_sparse_model_analysis(
+        features, str(tmp_path / "sparse"), n_jobs=1, table_format=["csv"]
+    )
+    train = features["train"]
+    X_test = features["X"][~train]
+    dense = make_pipeline(MaxAbsScaler(), Ridge()).fit(
+        features["X"][train].toarray(), features["y"][train]
+    )
+
+    # The scaler kept the matrix sparse
+    assert sparse.issparse(pipe[0].transform(X_test))
+    np.testing.assert_allclose(
+        pipe.predict(X_test), dense.predict(X_test.toarray()), atol=1e-3
+    )
+    metrics = pd.read_csv(tmp_path / "sparse_test_metrics.csv", index_col="Metric")
+    assert metrics.loc["R2 Score", "Value"] > 0.5
+    assert len(pd.read_csv(tmp_path / "sparse_cv_results.csv")) == 5
+
+
+def test_bad_input(raw_file):
+    with pytest.raises(ValueError, match="blood pressure"):
+        split_blood_pressure(pd.Series(["126/83", "high", None]))
+
+    clean = clean_feature_data(pd.read_csv(raw_file))
+    categories = {c: sorted(clean[c].unique()) for c in CATEGORICAL_FEATURES}
+    categories["occupation"] = categories["occupation"][1:]
+    with pytest.raises(ValueError, match="Unknown occupation"):
+        encode_features(clean, categories)
+
+    with pytest.raises(ValueError, match="missing"):
+        clean_feature_data(pd.read_csv(raw_file).drop(columns="Blood Pressure"))
@@ -0,0 +1,112 @@
+"""
+Import-time budgets of the command-line entry points, measured with
+``python -X importtime``. Heavy libraries must only be loaded on the code
+paths that use them: ``--help`` loads none of them, and scoring does not
+load the plotting stack.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from sklearn.compose import make_column_transformer
+from sklearn.linear_model import Ridge
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from src.artifact_utils import build_metadata, save_model_artifact
+from src.io_utils import read_clean_data
+
+SCRIPTS = [
+    "bench_serve.py",
+    "build_features.py",
+    "clean_data.py",
+    "compare_models.py",
+    "download_data.py",
+    "eda.py",
+    "model.py",
+    "score.py",
+    "search.py",
+    "serve.py",
+    "sparse_model.py",
+    "update_model.py",
+]
+
+HEAVY_MODULES = {
+    "joblib",
+    "matplotlib",
+    "numpy",
+    "pandas",
+    "pyarrow",
+    "scipy",
+    "seaborn",
+    "sklearn",
+}
+PLOTTING_MODULES = {"matplotlib", "scienceplots", "seaborn"}
+
+# Cumulative import time budgets, generous enough for slow CI machines
+HELP_BUDGET_MS = 500
+SCORE_BUDGET_MS = 5000
+
+
+def _import_profile(*args):
+    """Run a script under -X importtime; return imported modules and total ms."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = set()
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules.add(name.strip().split(".")[0])
+        # Only top-level entries, whose cumulative times do not overlap
+        if not name.startswith("  "):
+            total_us += int(cumulative)
+    return modules, total_us / 1000
+
+
+@pytest.mark.parametrize("script", SCRIPTS)
+def test_help_import_budget(script):
+    """--help loads no heavy library and stays within the budget."""
+    modules, total_ms = _import_profile(f"scripts/{script}", "--help")
+
+    assert not modules & HEAVY_MODULES
+    assert total_ms < HELP_BUDGET_MS
+
+
+def test_score_import_budget(tmp_path):
+    """Scoring loads the model stack but not the plotting libraries."""
+    df = read_clean_data(str(ROOT_DIR / "data" / "processed" / "sleep_data_clean.csv"))
+    X = df[["sleep_duration", "sleep_quality", "sleep_disorder"]]
+    preprocessor = make_column_transformer(
+        (StandardScaler(), ["sleep_duration"]),
+        (OneHotEncoder(), ["sleep_disorder"]),
+        remainder="passthrough",
+    )
+    model = make_pipeline(preprocessor, Ridge()).fit(X, df["stress_level"])
+    model_file = str(tmp_path / "model.joblib")
+    save_model_artifact(model, model_file, build_metadata(X, "stress_level"))
+
+    modules, total_ms = _import_profile(
+        "scripts/score.py",
+        "--model-file",
+        model_file,
+        "--output-file",
+        str(tmp_path / "predictions.csv"),
+    )
+
+    assert (tmp_path / "predictions.csv").exists()
+    assert not modules & PLOTTING_MODULES
+    assert total_ms < SCORE_BUDGET_MS
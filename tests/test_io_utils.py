@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.io_utils import read_clean_data, read_columns, write_clean_data
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def clean_data():
+    """Provides a small sample dataframe resembling the cleaned sleep data."""
+    return pd.DataFrame(
+        {
+            "person_id": [1, 2, 3, 4, 5],
+            "sleep_duration": [7.5, 6.0, 8.0, 5.5, 7.0],
+            "sleep_quality": [8, 6, 9, 5, 7],
+            "sleep_disorder": [
+                "No Disorder",
+                "Insomnia",
+                "No Disorder",
+                "Sleep Apnea",
+                "No Disorder",
+            ],
+            "stress_level": [4, 7, 3, 8, 5],
+            "train": [1, 1, 0, 1, 0],
+        }
+    )
+
+
+def test_parquet_round_trip_uses_compact_dtypes(clean_data, tmp_path):
+    """Parquet output should use categorical disorders and narrow numerics."""
+    path = tmp_path / "clean.parquet"
+    write_clean_data(clean_data, str(path))
+
+    result = read_clean_data(str(path))
+
+    assert read_columns(str(path)) == list(clean_data.columns)
+    assert isinstance(result["sleep_disorder"].dtype, pd.CategoricalDtype)
+    assert result["sleep_duration"].dtype == "float32"
+    assert result["stress_level"].dtype == "int8"
+    assert result["sleep_disorder"].astype(str).tolist() == (
+        clean_data["sleep_disorder"].tolist()
+    )
+
+
+@pytest.mark.parametrize("filename", ["clean.csv", "clean.parquet"])
+def test_read_clean_data_projects_and_filters(clean_data, tmp_path, filename):
+    """Only requested columns and matching train rows should be returned."""
+    path = tmp_path / filename
+    write_clean_data(clean_data, str(path))
+
+    result = read_clean_data(
+        str(path), columns=["stress_level", "sleep_quality", "missing"], train=1
+    )
+
+    assert list(result.columns) == ["sleep_quality", "stress_level"]
+    assert result["stress_level"].tolist() == [4, 7, 8]
+
+
+def test_read_columns_missing_file(tmp_path):
+    """A missing Parquet file should raise FileNotFoundError."""
+    with pytest.raises(FileNotFoundError):
+        read_columns(str(tmp_path / "missing.parquet"))
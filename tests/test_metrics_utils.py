@@ -0,0 +1,113 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.metrics_utils import (
+    append_metrics_log,
+    markdown_table,
+    read_metrics_log,
+    write_metrics_table,
+)
+
+
+@pytest.fixture
+def cv_df():
+    """Provides a small table of CV results."""
+    return pd.DataFrame(
+        {
+            "fold": [0, 1],
+            "test_r2": [0.612345678, 0.55],
+            "test_neg_MSE": [-0.7, -0.65],
+        }
+    )
+
+
+def test_write_metrics_table_round_trip(cv_df, tmp_path):
+    """CSV and JSON tables read back to the same values at full precision."""
+    prefix = str(tmp_path / "run_cv_results")
+    paths = write_metrics_table(cv_df, prefix)
+
+    assert paths == [f"{prefix}.csv", f"{prefix}.json", f"{prefix}.md"]
+    pd.testing.assert_frame_equal(pd.read_csv(f"{prefix}.csv"), cv_df)
+    with open(f"{prefix}.json") as f:
+        assert json.load(f) == cv_df.to_dict(orient="records")
+
+
+def test_write_metrics_table_selected_formats(cv_df, tmp_path):
+    """Only the requested formats are written."""
+    prefix = str(tmp_path / "run_cv_results")
+    paths = write_metrics_table(cv_df, prefix, formats=["md"])
+
+    assert paths == [f"{prefix}.md"]
+    assert not Path(f"{prefix}.csv").exists()
+
+
+def test_write_metrics_table_unknown_format(cv_df, tmp_path):
+    """An unknown format raises a ValueError."""
+    with pytest.raises(ValueError):
+        write_metrics_table(cv_df, str(tmp_path / "x"), formats=["xlsx"])
+
+
+def test_markdown_table(cv_df):
+    """Markdown tables have a header, alignment row and rounded floats."""
+    lines = markdown_table(cv_df, title="CV").splitlines()
+
+    assert lines[0] == "### CV"
+    assert lines[2] == "| fold | test_r2 | test_neg_MSE |"
+    assert lines[3] == "| ---: | ---: | ---: |"
+    assert lines[4] == "| 0 | 0.6123 | -0.7000 |"
+
+
+def test_metrics_log_append_and_read(tmp_path):
+    """Appended runs are read back as flattened rows."""
+    log = str(tmp_path / "metrics_log.jsonl")
+    append_metrics_log(log, {"params": {"alpha": 1.0}, "metrics": {"r2": 0.5}})
+    append_metrics_log(
+        log, {"params": {"alpha": np.float64(2.0)}, "metrics": {"r2": 0.6}}
+    )
+
+    runs = read_metrics_log(log)
+
+    assert len(runs) == 2
+    assert list(runs["params.alpha"]) == [1.0, 2.0]
+    assert list(runs["metrics.r2"]) == [0.5, 0.6]
+
+
+def test_write_metrics_table_nan_as_null(tmp_path):
+    """Undefined confidence bounds are written as null, as strict JSON."""
+    df = pd.DataFrame(
+        {
+            "Metric": ["MSE", "R2 Score"],
+            "Value": [0.5, np.nan],
+            "CI Low": [np.nan, np.nan],
+            "CI High": [np.inf, 0.9],
+        }
+    )
+    prefix = str(tmp_path / "test_metrics")
+    write_metrics_table(df, prefix, ["json"])
+    log = str(tmp_path / "log.jsonl")
+    append_metrics_log(log, {"metrics": {"test_MSE_ci_low": np.float64("nan")}})
+
+    def strict(text):
+        return json.loads(
+            text, parse_constant=lambda c: pytest.fail(f"non-JSON constant {c}")
+        )
+
+    with open(f"{prefix}.json") as f:
+        records = strict(f.read())
+    assert records[0] == {
+        "Metric": "MSE",
+        "Value": 0.5,
+        "CI Low": None,
+        "CI High": None,
+    }
+    assert records[1]["Value"] is None and records[1]["CI High"] == 0.9
+    with open(log) as f:
+        assert strict(f.read()) == {"metrics": {"test_MSE_ci_low": None}}
@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 import pandas as pd
 import os
 import matplotlib
@@ -11,8 +12,20 @@ ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
+from sklearn.linear_model import Ridge
+from sklearn.model_selection import cross_validate
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
 
-from src.model_utils import save_df_as_png
+from src.model_utils import (
+    DEFAULT_SCORING,
+    deduplicate_rows,
+    fit_weighted,
+    ridge_alpha_path,
+    ridge_path,
+    run_cross_validation,
+    save_df_as_png,
+)
 
 
 @pytest.fixture
@@ -62,3 +75,167 @@ def test_save_df_as_png_io_error(sample_df, capsys):
 
     assert "Error saving table" in captured.out
     assert not os.path.exists(invalid_path)
+
+
+@pytest.fixture
+def regression_data():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({"a": rng.normal(size=60), "b": rng.normal(size=60)})
+    y = pd.Series(2 * X["a"] - X["b"] + rng.normal(scale=0.1, size=60))
+    return X, y
+
+
+# CV engine matches scikit-learn
+def test_run_cross_validation_matches_cross_validate(regression_data):
+    """
+    Test that a single repeat reproduces cross_validate(cv=5) scores.
+    """
+    X, y = regression_data
+    expected = cross_validate(
+        Ridge(), X, y, cv=5, scoring=list(DEFAULT_SCORING), return_train_score=True
+    )
+
+    result = run_cross_validation(Ridge(), X, y)
+
+    assert list(result["fold"]) == [0, 1, 2, 3, 4]
+    assert (result["wall_time"] >= result["fit_time"]).all()
+    for name in DEFAULT_SCORING:
+        np.testing.assert_allclose(result[f"test_{name}"], expected[f"test_{name}"])
+        np.testing.assert_allclose(result[f"train_{name}"], expected[f"train_{name}"])
+
+
+# Parallel and repeated folds
+@pytest.mark.parametrize("backend", ["process", "thread"])
+def test_run_cross_validation_parallel_repeated(regression_data, backend):
+    """
+    Test that parallel runs give the same folds and scores as a serial run.
+    """
+    X, y = regression_data
+    serial = run_cross_validation(Ridge(), X, y, n_splits=3, n_repeats=2)
+    parallel = run_cross_validation(
+        Ridge(), X, y, n_splits=3, n_repeats=2, n_jobs=2, backend=backend
+    )
+
+    assert len(parallel) == 6
+    assert list(parallel["repeat"]) == [0, 0, 0, 1, 1, 1]
+    pd.testing.assert_series_equal(serial["test_r2"], parallel["test_r2"])
+
+
+# Closed-form ridge path matches scikit-learn
+def test_ridge_path_matches_ridge(regression_data):
+    """
+    Test that every alpha on the path gives the same fit as Ridge.
+    """
+    X, y = regression_data
+    alphas = [0.01, 1.0, 100.0]
+
+    coefs, intercepts = ridge_path(X, y, alphas)
+
+    for i, alpha in enumerate(alphas):
+        ridge = Ridge(alpha=alpha).fit(X, y)
+        np.testing.assert_allclose(coefs[:, i], ridge.coef_)
+        np.testing.assert_allclose(intercepts[i], ridge.intercept_)
+
+
+def test_ridge_alpha_path_matches_pipeline_cv(regression_data):
+    """
+    Test that the CV error path agrees with cross-validating the pipeline.
+    """
+    X, y = regression_data
+    preprocessor = StandardScaler()
+    expected = cross_validate(
+        make_pipeline(preprocessor, Ridge(alpha=2.0)),
+        X,
+        y,
+        cv=5,
+        scoring="neg_mean_squared_error",
+    )
+
+    path = ridge_alpha_path(preprocessor, X, y, [2.0, 20.0])
+
+    assert list(path.columns) == [
+        "alpha",
+        "mean_test_MSE",
+        "std_test_MSE",
+        "mean_test_r2",
+    ]
+    np.testing.assert_allclose(
+        path.loc[0, "mean_test_MSE"], -expected["test_score"].mean()
+    )
+
+
+def test_ridge_path_rejects_non_positive_alpha(regression_data):
+    """
+    Test that a zero alpha raises a ValueError.
+    """
+    X, y = regression_data
+
+    with pytest.raises(ValueError, match="strictly positive"):
+        ridge_path(X, y, [0.0, 1.0])
+
+
+@pytest.fixture
+def duplicated_data():
+    rng = np.random.default_rng(1)
+    base = pd.DataFrame(
+        {
+            "sleep_duration": rng.choice([6.0, 7.0, 8.0], size=12),
+            "sleep_quality": rng.choice([5, 7, 9], size=12),
+            "sleep_disorder": rng.choice(["Insomnia", "No Disorder"], size=12),
+            "stress_level": rng.choice([3, 6, 8], size=12),
+        }
+    )
+    # Each profile appears a different number of times
+    return base.loc[np.repeat(np.arange(12), np.arange(1, 13))].reset_index(drop=True)
+
+
+def test_deduplicate_rows_counts(duplicated_data):
+    """Unique rows with weights should stand for every original row."""
+    X = duplicated_data.drop(columns="stress_level")
+    y = duplicated_data["stress_level"]
+    X_unique, y_unique, weights = deduplicate_rows(X, y)
+
+    assert weights.sum() == len(X)
+    assert len(X_unique) == len(duplicated_data.drop_duplicates())
+    assert list(X_unique.columns) == list(X.columns)
+    assert y_unique.name == "stress_level"
+    expanded = X_unique.assign(stress_level=y_unique.to_numpy()).loc[
+        np.repeat(np.arange(len(weights)), weights.astype(int))
+    ]
+    pd.testing.assert_frame_equal(
+        expanded.sort_values(list(expanded.columns)).reset_index(drop=True),
+        duplicated_data.sort_values(list(expanded.columns)).reset_index(drop=True),
+    )
+
+
+def test_fit_weighted_matches_full_fit(duplicated_data):
+    """A pipeline fit on weighted unique rows should equal the fit on all rows."""
+    from sklearn.compose import make_column_transformer
+    from sklearn.preprocessing import OneHotEncoder
+
+    def make_pipe():
+        return make_pipeline(
+            make_column_transformer(
+                (StandardScaler(), ["sleep_duration"]),
+                (OneHotEncoder(), ["sleep_disorder"]),
+                remainder="passthrough",
+            ),
+            Ridge(alpha=1.0),
+        )
+
+    X = duplicated_data.drop(columns="stress_level")
+    y = duplicated_data["stress_level"]
+    full = make_pipe().fit(X, y)
+    weighted = fit_weighted(make_pipe(), *deduplicate_rows(X, y))
+
+    np.testing.assert_allclose(weighted.predict(X), full.predict(X), atol=1e-10)
+
+
+def test_run_cross_validation_sample_weight(regression_data):
+    """Unit weights should give the same fold scores as no weights."""
+    X, y = regression_data
+    weights = np.ones(len(X))
+    result = run_cross_validation(Ridge(), X, y, sample_weight=weights)
+    expected = run_cross_validation(Ridge(), X, y)
+
+    np.testing.assert_allclose(result["test_r2"], expected["test_r2"])
@@ -0,0 +1,142 @@
+"""
+Tests for src/online_utils.py - incremental ridge updates
+
+some of the tests performed in this file are:
+- Test good input: batch updates match a full refit of the ridge pipeline.
+- Test good input: categories first seen in a later batch are added.
+- Test good input: the running scaler statistics match StandardScaler.
+- Test good input: updating a saved model file batch by batch matches a full refit.
+- Test edge case: single-row batches and an empty batch.
+- Test bad input: batches with other columns and non-incremental artifacts raise ValueError.
+"""
+
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from sklearn.linear_model import Ridge
+from sklearn.pipeline import make_pipeline
+
+from src.artifact_utils import build_metadata, load_model_artifact, save_model_artifact
+from src.clean_utils import clean_sleep_data
+from src.model_utils import MODEL_COLUMNS, make_preprocessor
+from src.online_utils import IncrementalRidge, update_model_file
+from src.synth_utils import generate_sleep_data
+
+
+@pytest.fixture(scope="module")
+def clean_df():
+    raw = generate_sleep_data(3_000, random_state=5)
+    return clean_sleep_data(raw, split="hash")
+
+
+def _xy(df):
+    df = df[MODEL_COLUMNS]
+    return df.drop(columns="stress_level"), df["stress_level"]
+
+
+def _full_refit(X, y, alpha=1.0):
+    return make_pipeline(make_preprocessor(), Ridge(alpha=alpha)).fit(X, y)
+
+
+@pytest.mark.parametrize("alpha", [0.01, 1.0, 100.0])
+def test_batches_match_full_refit(clean_df, alpha):
+    X, y = _xy(clean_df)
+    model = IncrementalRidge(alpha=alpha)
+    for part in np.array_split(np.arange(len(X)), 7):
+        model.partial_fit(X.iloc[part], y.iloc[part])
+
+    assert model.n_samples_seen_ == len(X)
+    np.testing.assert_allclose(
+        model.predict(X), _full_refit(X, y, alpha).predict(X), atol=1e-8
+    )
+
+
+def test_late_categories(clean_df):
+    X, y = _xy(clean_df)
+    # Batches sorted by disorder, so each category arrives in a later batch
+    order = np.argsort(X["sleep_disorder"].astype(str).to_numpy(), kind="stable")
+    model = IncrementalRidge()
+    for part in np.array_split(order, 5):
+        model.partial_fit(X.iloc[part], y.iloc[part])
+
+    assert model.categories_["sleep_disorder"] == [
+        "Insomnia",
+        "No Disorder",
+        "Sleep Apnea",
+    ]
+    np.testing.assert_allclose(
+        model.predict(X), _full_refit(X, y).predict(X), atol=1e-8
+    )
+
+
+def test_scaler_statistics(clean_df):
+    X, y = _xy(clean_df)
+    model = IncrementalRidge()
+    for part in np.array_split(np.arange(len(X)), 4):
+        model.partial_fit(X.iloc[part], y.iloc[part])
+
+    scaler = _full_refit(X, y)[0].named_transformers_["standardscaler"]
+    j = list(X.columns).index("sleep_duration")
+    assert model.mean_x_[j] == pytest.approx(scaler.mean_[0])
+    assert model.scale_[j] == pytest.approx(scaler.scale_[0])
+
+
+def test_single_row_and_empty_batches(clean_df):
+    X, y = _xy(clean_df.head(40))
+    model = IncrementalRidge()
+    for i in range(len(X)):
+        model.partial_fit(X.iloc[[i]], y.iloc[[i]])
+    model.partial_fit(X.iloc[:0], y.iloc[:0])
+
+    assert model.n_samples_seen_ == 40
+    np.testing.assert_allclose(
+        model.predict(X), _full_refit(X, y).predict(X), atol=1e-8
+    )
+
+
+def test_update_model_file(clean_df, tmp_path):
+    model_file = str(tmp_path / "online.joblib")
+    days = [clean_df.iloc[part] for part in np.array_split(np.arange(len(clean_df)), 3)]
+    stats = []
+    for i, day in enumerate(days):
+        path = tmp_path / f"day{i}.csv"
+        day.to_csv(path, index=False)
+        stats.append(update_model_file(str(path), model_file, chunksize=250))
+
+    assert stats[0]["batch_MSE"] is None
+    assert stats[1]["batch_MSE"] > 0
+    model, metadata = load_model_artifact(model_file)
+    train = clean_df[clean_df["train"]]
+    assert metadata["n_training_rows"] == len(train)
+    assert [b["rows"] for b in metadata["batches"]] == [s["rows"] for s in stats]
+
+    X, y = _xy(train)
+    np.testing.assert_allclose(
+        model.predict(X), _full_refit(X, y).predict(X), atol=1e-8
+    )
+
+    update_model_file(str(tmp_path / "day2.csv"), model_file, reset=True)
+    assert load_model_artifact(model_file)[0].n_samples_seen_ == stats[2]["rows"]
+
+
+def test_bad_input(clean_df, tmp_path):
+    X, y = _xy(clean_df)
+    model = IncrementalRidge().partial_fit(X, y)
+    with pytest.raises(ValueError, match="Expected columns"):
+        model.partial_fit(X[["sleep_quality", "sleep_duration", "sleep_disorder"]], y)
+
+    model_file = str(tmp_path / "ridge.joblib")
+    save_model_artifact(
+        _full_refit(X, y), model_file, build_metadata(X, "stress_level")
+    )
+    batch = tmp_path / "batch.csv"
+    clean_df.to_csv(batch, index=False)
+    with pytest.raises(ValueError, match="not an IncrementalRidge"):
+        update_model_file(str(batch), model_file)
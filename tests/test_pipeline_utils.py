@@ -0,0 +1,101 @@
+"""
+Tests for src/pipeline_utils.py - single-process pipeline runner
+
+some of the tests performed in this file are:
+- Test good input: the pipeline writes the figures, tables and model.
+- Test good input: the in-memory pipeline gives the same test metrics as the
+  cleaned file read back from disk, concurrently or not.
+- Test good input: intermediate files are only written when requested.
+- Test good input: the group split uses the given group columns.
+- Test error input: a missing raw file raises FileNotFoundError.
+"""
+
+import sys
+import pandas as pd
+import pytest
+from pathlib import Path
+
+# Add project root to path
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.pipeline_utils import run_pipeline, split_model_data
+
+RAW_FILE = ROOT_DIR / "data" / "raw" / "sleep_data_raw.csv"
+
+pytestmark = pytest.mark.skipif(
+    not RAW_FILE.exists(), reason="raw data has not been downloaded"
+)
+
+
+def _run(tmp_path, **kwargs):
+    return run_pipeline(
+        str(RAW_FILE),
+        output_dir=str(tmp_path / "results"),
+        model_options=dict(cv_folds=3),
+        render_jobs=1,
+        **kwargs,
+    )
+
+
+def test_pipeline_writes_outputs(tmp_path):
+    timings = _run(tmp_path)
+
+    results = tmp_path / "results"
+    for name in [
+        "eda_summary.png",
+        "model_analysis_prediction_plots.png",
+        "model_analysis_cv_results.csv",
+        "model_analysis_test_metrics.csv",
+        "model_analysis_model.joblib",
+    ]:
+        assert (results / name).exists(), name
+    assert set(timings) == {"load", "clean", "eda", "model", "render"}
+    # No intermediate files by default
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["results"]
+
+
+@pytest.mark.parametrize("concurrent", [True, False])
+def test_pipeline_matches_file_based_metrics(tmp_path, concurrent):
+    clean_path = tmp_path / "clean.csv"
+    _run(tmp_path, clean_path=str(clean_path), concurrent=concurrent)
+
+    from src.io_utils import read_clean_data
+    from src.model_utils import MODEL_COLUMNS
+
+    clean_df = read_clean_data(str(clean_path))
+    train_df, test_df = split_model_data(clean_df)
+    expected_train = read_clean_data(str(clean_path), columns=MODEL_COLUMNS, train=1)
+    assert len(train_df) == len(expected_train)
+    assert len(test_df) == len(clean_df) - len(expected_train)
+
+    metrics = pd.read_csv(
+        tmp_path / "results" / "model_analysis_test_metrics.csv", index_col="Metric"
+    )["Value"]
+    assert metrics["MSE"] == pytest.approx(0.5500, abs=1e-4)
+    assert metrics["R2 Score"] == pytest.approx(0.7876, abs=1e-4)
+
+
+def test_pipeline_keeps_raw_copy(tmp_path):
+    raw_path = tmp_path / "raw.csv"
+    _run(tmp_path, raw_path=str(raw_path))
+    assert raw_path.read_bytes() == RAW_FILE.read_bytes()
+
+
+def test_pipeline_group_split_matches_clean_data(tmp_path):
+    from src.clean_utils import clean_sleep_data
+
+    clean_path = tmp_path / "clean.csv"
+    columns = ["Gender", "Occupation"]
+    _run(tmp_path, clean_path=str(clean_path), split="group", group_columns=columns)
+
+    expected = clean_sleep_data(
+        pd.read_csv(RAW_FILE), split="group", group_columns=columns
+    )
+    assert pd.read_csv(clean_path)["train"].tolist() == expected["train"].tolist()
+
+
+def test_pipeline_missing_input(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        run_pipeline(str(tmp_path / "missing.csv"), output_dir=str(tmp_path))
@@ -0,0 +1,62 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.plot_utils import aggregate_pairs, density_scatter
+
+
+@pytest.fixture
+def ax():
+    fig, ax = plt.subplots()
+    yield ax
+    plt.close(fig)
+
+
+def test_aggregate_pairs():
+    """Distinct pairs are returned with their counts."""
+    x, y, counts = aggregate_pairs([1, 1, 2, 1], [3, 3, 4, 4])
+
+    assert list(zip(x, y, counts)) == [(1, 3, 2), (1, 4, 1), (2, 4, 1)]
+
+
+def test_auto_mode_depends_on_rows(ax):
+    """Auto mode draws points below the threshold and aggregates above it."""
+    rng = np.random.default_rng(0)
+    x = rng.integers(0, 5, 1000)
+    y = rng.integers(0, 5, 1000)
+
+    assert density_scatter(ax, x, y, threshold=1000) == "points"
+    assert density_scatter(ax, x, y, threshold=999) == "weighted"
+    # Continuous values have too many distinct pairs for weighted markers
+    assert (
+        density_scatter(
+            ax, rng.normal(size=10_000), rng.normal(size=10_000), threshold=10
+        )
+        == "hexbin"
+    )
+
+
+def test_weighted_markers_from_counts(ax):
+    """Pre-aggregated counts give one marker per pair, sized by count."""
+    mode = density_scatter(ax, [1, 2], [3, 4], counts=[10, 1000], threshold=100)
+
+    assert mode == "weighted"
+    sizes = ax.collections[0].get_sizes()
+    assert len(sizes) == 2
+    assert sizes[1] > sizes[0]
+
+
+def test_unknown_mode(ax):
+    """An unknown scatter mode raises a ValueError."""
+    with pytest.raises(ValueError):
+        density_scatter(ax, [1], [2], mode="kde")
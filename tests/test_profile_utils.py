@@ -0,0 +1,214 @@
+"""
+Tests for src/profile_utils.py - timing spans and run traces
+
+some of the tests performed in this file are:
+- Test good input: disabled timers record nothing and return a shared no-op.
+- Test good input: timers and decorated functions record named spans.
+- Test good input: spans of process pool workers are merged into the trace.
+- Test good input: JSON and Chrome traces, cProfile and memory captures.
+- Test good input: memory spans of concurrent threads keep their own peaks.
+- Test good input: SLEEP_PROFILE enables a trace without flags.
+- Test good input: each CV fold is recorded as a span.
+- Test error input: unknown formats and capture modes raise ValueError.
+"""
+
+import json
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src import profile_utils
+from src.profile_utils import (
+    enable_profiling,
+    finish_profiling,
+    profile_run,
+    profiling_enabled,
+    submit,
+    timed,
+    timer,
+    trace_spans,
+    write_trace,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_profiling():
+    """Make sure no trace leaks between tests."""
+    finish_profiling()
+    yield
+    finish_profiling()
+
+
+@timed()
+def _double(x):
+    return 2 * x
+
+
+def _work(x):
+    with timer("work", x=x):
+        return x + 1
+
+
+def _fail():
+    raise ValueError("boom")
+
+
+def test_disabled_timer_records_nothing():
+    assert not profiling_enabled()
+    assert timer("a") is timer("b")
+    with timer("a"):
+        pass
+    assert _double(2) == 4
+    assert trace_spans() == []
+    assert finish_profiling() == []
+
+
+def test_timer_and_decorator_record_spans():
+    enable_profiling()
+    with timer("outer", rows=3):
+        with timer("inner"):
+            _double(1)
+
+    spans = trace_spans()
+    assert [s["name"] for s in spans] == ["outer", "inner", "_double"]
+    outer, inner, _ = spans
+    assert outer["args"] == {"rows": 3}
+    assert outer["start"] <= inner["start"]
+    assert inner["start"] + inner["duration"] <= outer["start"] + outer["duration"]
+
+
+def test_timer_records_span_on_error():
+    enable_profiling()
+    with pytest.raises(ValueError):
+        with timer("failing"):
+            _fail()
+    assert [s["name"] for s in trace_spans()] == ["failing"]
+
+
+def test_submit_merges_worker_spans():
+    enable_profiling()
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        futures = [submit(pool, _work, x) for x in range(3)]
+        assert [f.result() for f in futures] == [1, 2, 3]
+        with pytest.raises(ValueError, match="boom"):
+            submit(pool, _fail).result()
+
+    spans = trace_spans()
+    assert sorted(s["args"]["x"] for s in spans) == [0, 1, 2]
+    assert all(s["name"] == "work" for s in spans)
+
+
+def test_write_trace_formats(tmp_path):
+    enable_profiling()
+    with timer("step", path="a.csv"):
+        pass
+
+    payload = json.loads(Path(write_trace(str(tmp_path / "t.json"))).read_text())
+    assert [s["name"] for s in payload["spans"]] == ["step"]
+    assert payload["spans"][0]["args"] == {"path": "a.csv"}
+
+    chrome = json.loads(
+        Path(write_trace(str(tmp_path / "c.json"), fmt="chrome")).read_text()
+    )
+    (event,) = chrome["traceEvents"]
+    assert event["ph"] == "X"
+    assert event["name"] == "step"
+    assert event["dur"] >= 0
+
+
+def test_profile_run_captures(tmp_path):
+    path = tmp_path / "trace.json"
+    with profile_run(str(path), capture=("cprofile", "memory")):
+        with timer("alloc"):
+            data = [0] * 100_000
+    del data
+
+    assert not profiling_enabled()
+    assert (tmp_path / "trace.prof").exists()
+    spans = json.loads(path.read_text())["spans"]
+    assert [s["name"] for s in spans] == ["run", "alloc"]
+    alloc = spans[1]["args"]
+    assert alloc["memory_delta"] > 0
+    assert alloc["memory_peak"] >= alloc["memory_delta"]
+
+
+def test_memory_spans_of_threads_are_separate():
+    # Thread a's span closes while thread b's is still open; each span must
+    # keep its own peak rather than popping the other thread's
+    enable_profiling(capture=("memory",))
+    a_open, b_open, a_closed = (threading.Event() for _ in range(3))
+
+    def thread_a():
+        with timer("a"):
+            block = bytearray(10_000_000)
+            del block
+            a_open.set()
+            b_open.wait()
+        a_closed.set()
+
+    def thread_b():
+        a_open.wait()
+        with timer("b"):
+            b_open.set()
+            a_closed.wait()
+
+    threads = [threading.Thread(target=f) for f in (thread_a, thread_b)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    peaks = {s["name"]: s["args"]["memory_peak"] for s in trace_spans()}
+    assert peaks["a"] >= 10_000_000
+    assert peaks["b"] < 10_000_000
+
+
+def test_profile_run_reads_environment(tmp_path, monkeypatch):
+    path = tmp_path / "env.json"
+    monkeypatch.setenv(profile_utils.PROFILE_ENV, str(path))
+    monkeypatch.setenv(profile_utils.PROFILE_FORMAT_ENV, "chrome")
+    with profile_run():
+        with timer("step"):
+            pass
+    events = json.loads(path.read_text())["traceEvents"]
+    assert [e["name"] for e in events] == ["run", "step"]
+
+
+def test_profile_run_disabled_without_path(monkeypatch):
+    monkeypatch.delenv(profile_utils.PROFILE_ENV, raising=False)
+    with profile_run():
+        assert not profiling_enabled()
+
+
+def test_cross_validation_records_folds():
+    from src.model_utils import run_cross_validation
+    from sklearn.linear_model import Ridge
+
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(40, 2)), columns=["a", "b"])
+    y = pd.Series(X["a"] + rng.normal(size=40))
+
+    enable_profiling()
+    run_cross_validation(Ridge(), X, y, n_splits=4)
+    names = [s["name"] for s in trace_spans()]
+    assert names.count("cv_fold") == 4
+    assert names[0] == "run_cross_validation"
+
+
+@pytest.mark.parametrize(
+    "fmt, capture", [("xml", ()), ("json", ("gpu",))], ids=["format", "capture"]
+)
+def test_unknown_options(fmt, capture):
+    with pytest.raises(ValueError, match="Unknown"):
+        enable_profiling(fmt=fmt, capture=capture)
+    assert not profiling_enabled()
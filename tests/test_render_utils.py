@@ -0,0 +1,85 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.image as mpimg
+import pandas as pd
+import pytest
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.model_utils import render_table, table_spec
+from src.render_utils import FigureSpec, figure_path, render_figures
+
+
+@pytest.fixture
+def specs(tmp_path):
+    """Two small table figures."""
+    df = pd.DataFrame({"Metric": ["MSE", "R2"], "Value": [0.5, 0.8]})
+    return [table_spec(df, str(tmp_path / f"table_{i}.png")) for i in range(2)]
+
+
+def test_render_figures_in_pool(specs):
+    """Figures rendered by worker processes are all saved."""
+    saved = render_figures(specs, n_jobs=2)
+
+    assert saved == [s.path for s in specs]
+    assert all(Path(p).stat().st_size > 0 for p in saved)
+
+
+def test_render_figures_svg_preview(specs):
+    """SVG previews replace the file extension."""
+    saved = render_figures(specs, fmt="svg")
+
+    assert saved == [figure_path(s.path, "svg") for s in specs]
+    assert Path(saved[0]).read_text().lstrip().startswith("<?xml")
+
+
+def test_render_figures_dpi_override(specs):
+    """A lower DPI gives a smaller image than the spec's default."""
+    full, preview = specs
+    render_figures([full])
+    render_figures([preview], dpi=50)
+
+    assert mpimg.imread(preview.path).shape[0] < mpimg.imread(full.path).shape[0]
+
+
+def test_render_figures_error_does_not_stop_others(specs, capsys):
+    """A figure that cannot be saved is reported and the others are kept."""
+    bad = FigureSpec(
+        render_table,
+        "/non_existent_directory/table.png",
+        specs[0].kwargs,
+        label="Table",
+    )
+    saved = render_figures([bad] + specs)
+
+    assert saved == [s.path for s in specs]
+    assert "Error saving table" in capsys.readouterr().out
+
+
+def _failing_render(**kwargs):
+    raise RuntimeError("drawing failed")
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_render_figures_drawing_error_does_not_stop_others(specs, capsys, n_jobs):
+    """A drawing error is raised only after the other figures are saved."""
+    bad = FigureSpec(_failing_render, specs[0].path, label="Broken")
+    with pytest.raises(RuntimeError, match="drawing failed"):
+        render_figures([bad, specs[1]], n_jobs=n_jobs)
+
+    assert Path(specs[1].path).exists()
+    assert not Path(specs[0].path).exists()
+    out = capsys.readouterr().out
+    assert "Error saving broken" in out and "Table saved to" in out
+
+
+def test_render_figures_unknown_format(specs):
+    """An unknown format raises a ValueError."""
+    with pytest.raises(ValueError):
+        render_figures(specs, fmt="gif")
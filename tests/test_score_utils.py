@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from sklearn.compose import make_column_transformer
+from sklearn.linear_model import Ridge
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from src.artifact_utils import build_metadata
+from src.io_utils import read_clean_data, write_clean_data
+from src.score_utils import score_file
+
+
+@pytest.fixture
+def fitted_model():
+    """Ridge pipeline fitted on the bundled cleaned data, with its metadata."""
+    df = read_clean_data(str(ROOT_DIR / "data" / "processed" / "sleep_data_clean.csv"))
+    X = df[["sleep_duration", "sleep_quality", "sleep_disorder"]]
+    preprocessor = make_column_transformer(
+        (StandardScaler(), ["sleep_duration"]),
+        (OneHotEncoder(), ["sleep_disorder"]),
+        remainder="passthrough",
+    )
+    model = make_pipeline(preprocessor, Ridge()).fit(X, df["stress_level"])
+    return df, model, build_metadata(X, "stress_level")
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+def test_score_file_matches_predict(fitted_model, tmp_path, suffix):
+    """Batched scoring should reproduce predicting the whole frame at once."""
+    df, model, metadata = fitted_model
+    input_path = tmp_path / f"input{suffix}"
+    output_path = tmp_path / f"predictions{suffix}"
+    write_clean_data(df, str(input_path))
+
+    stats = score_file(model, metadata, str(input_path), str(output_path), 50)
+
+    result = read_clean_data(str(output_path))
+    expected = model.predict(df[[f["name"] for f in metadata["features"]]])
+    assert stats["rows"] == len(df)
+    assert stats["rows_per_s"] > 0
+    assert result["person_id"].tolist() == df["person_id"].tolist()
+    np.testing.assert_allclose(result["prediction"], expected, rtol=1e-6)
+
+
+def test_score_file_missing_features(fitted_model, tmp_path):
+    """Inputs without the model's features should raise a ValueError."""
+    _, model, metadata = fitted_model
+    input_path = tmp_path / "input.csv"
+    pd.DataFrame({"person_id": [1]}).to_csv(input_path, index=False)
+
+    with pytest.raises(ValueError, match="missing feature columns"):
+        score_file(model, metadata, str(input_path), str(tmp_path / "out.csv"))
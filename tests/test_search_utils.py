@@ -0,0 +1,169 @@
+"""
+Tests for src/search_utils.py - successive halving search
+
+some of the tests performed in this file are:
+- Test good input: candidates follow the search spaces and the seed.
+- Test good input: candidates, and thus first-round trials, are distinct.
+- Test good input: the halving schedule shrinks candidates and ends on all rows.
+- Test good input: each round keeps the best candidates of the previous one.
+- Test good input: kNN candidates fit on every fold with few CV folds.
+- Test good input: a search resumed from a cut-short trial log matches a full run.
+- Test good input: run_search writes the trials and the best candidate.
+- Test bad input: models without a search space and factors below 2 raise ValueError.
+"""
+
+import json
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.search_utils import (
+    SEARCH_SPACES,
+    halving_schedule,
+    read_trial_log,
+    run_search,
+    sample_candidates,
+    successive_halving,
+)
+
+
+@pytest.fixture(scope="module")
+def train_df():
+    rng = np.random.default_rng(0)
+    n = 200
+    sleep_duration = rng.uniform(5.8, 8.5, n)
+    sleep_disorder = rng.choice(["No Disorder", "Insomnia", "Sleep Apnea"], n)
+    stress_level = np.clip(
+        np.round(20 - 2 * sleep_duration + rng.normal(0, 0.5, n)), 3, 8
+    ).astype(int)
+    return pd.DataFrame(
+        {
+            "sleep_duration": sleep_duration,
+            "sleep_disorder": sleep_disorder,
+            "stress_level": stress_level,
+        }
+    )
+
+
+def _split(df):
+    return df.drop(columns="stress_level"), df["stress_level"]
+
+
+def test_sample_candidates():
+    candidates = sample_candidates(["ridge", "knn"], 20, random_state=1)
+    assert len(candidates) == 40
+    assert sample_candidates(["ridge", "knn"], 20, random_state=1) == candidates
+
+    alphas = [c["params"]["alpha"] for c in candidates if c["model"] == "ridge"]
+    assert all(1e-3 <= a <= 1e3 for a in alphas)
+    knn = [c["params"] for c in candidates if c["model"] == "knn"]
+    assert all(1 <= p["n_neighbors"] <= 30 for p in knn)
+    assert {p["weights"] for p in knn} <= {"uniform", "distance"}
+
+
+def test_candidates_are_distinct(train_df):
+    keys = [
+        json.dumps(c, sort_keys=True)
+        for c in sample_candidates(list(SEARCH_SPACES), 27, random_state=522)
+    ]
+    assert len(keys) == len(set(keys)) == 4 * 27
+    # The kNN space only has 30 x 2 points, each drawn once
+    assert len(sample_candidates(["knn"], 100)) == 60
+
+    X, y = _split(train_df)
+    trials = successive_halving(X, y, models=["knn"], n_candidates=40, n_jobs=1)
+    first = trials[trials["round"] == 0]["params"].map(
+        lambda p: json.dumps(p, sort_keys=True)
+    )
+    assert first.is_unique
+
+
+def test_halving_schedule():
+    assert halving_schedule(27, 1_000_000) == [
+        (27, 37037),
+        (9, 111111),
+        (3, 333333),
+        (1, 1_000_000),
+    ]
+    # Stops once every row is used, even with several candidates left
+    assert halving_schedule(108, 299) == [(108, 50), (36, 150), (12, 299)]
+    assert halving_schedule(1, 100) == [(1, 100)]
+
+
+def test_rounds_keep_best(train_df):
+    X, y = _split(train_df)
+    trials = successive_halving(X, y, models=["ridge"], n_candidates=9, n_jobs=1)
+
+    assert trials.groupby("round").size().tolist() == [9, 3, 1]
+    assert trials["n_rows"].unique().tolist() == [50, 150, 200]
+    first = trials[trials["round"] == 0]
+    best = first.nlargest(3, "mean_test_score")["params"].tolist()
+    assert sorted(map(str, trials[trials["round"] == 1]["params"])) == sorted(
+        map(str, best)
+    )
+
+
+def test_knn_with_few_folds(train_df):
+    X, y = _split(train_df)
+    trials = successive_halving(
+        X, y, models=["knn"], n_candidates=9, n_splits=3, n_jobs=1
+    )
+
+    # The smallest subsample leaves 30 training rows per fold, the most
+    # neighbours a kNN candidate can ask for
+    assert trials["n_rows"].min() == 45
+    assert trials["mean_test_score"].notna().all()
+    assert halving_schedule(9, 200, n_splits=2, min_train_rows=30)[0] == (9, 60)
+
+
+def test_resume_from_log(train_df, tmp_path):
+    X, y = _split(train_df)
+    log = tmp_path / "trials.jsonl"
+    options = dict(models=["ridge", "knn"], n_candidates=6, random_state=3)
+    full = successive_halving(X, y, n_jobs=1, log_path=str(log), **options)
+    assert not full["resumed"].any()
+    assert len(read_trial_log(str(log))) == len(full)
+
+    # Interrupt after 5 trials, in the middle of writing the 6th
+    lines = log.read_text().splitlines(keepends=True)
+    log.write_text("".join(lines[:5]) + lines[5][:20])
+    resumed = successive_halving(X, y, n_jobs=2, log_path=str(log), **options)
+
+    assert resumed["resumed"].sum() == 5
+    columns = ["round", "n_rows", "model", "params", "mean_test_score"]
+    pd.testing.assert_frame_equal(full[columns], resumed[columns])
+
+
+def test_run_search_writes_outputs(train_df, tmp_path):
+    prefix = tmp_path / "search"
+    best = run_search(
+        train_df,
+        str(prefix),
+        models=["ridge"],
+        n_candidates=3,
+        n_jobs=1,
+        table_format=["csv"],
+    )
+
+    assert best["model"] == "ridge"
+    assert best["n_rows"] == len(train_df)
+    with open(f"{prefix}_best.json") as f:
+        assert json.load(f) == best
+    trials = pd.read_csv(f"{prefix}_trials.csv")
+    assert "mean_test_neg_MSE" in trials.columns
+    assert (tmp_path / "search_trials.jsonl").exists()
+
+
+def test_bad_input(train_df):
+    X, y = _split(train_df)
+    with pytest.raises(ValueError, match="expected some of"):
+        successive_halving(X, y, models=["dummy"])
+    with pytest.raises(ValueError, match="factor"):
+        halving_schedule(10, 100, factor=1)
+    assert "dummy" not in SEARCH_SPACES
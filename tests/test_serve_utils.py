@@ -0,0 +1,167 @@
+import http.client
+import json
+import threading
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from sklearn.compose import make_column_transformer
+from sklearn.linear_model import Ridge
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from src.serve_utils import LinearScorer, MicroBatcher, make_server
+
+
+@pytest.fixture
+def fitted_pipeline():
+    """Ridge pipeline with the same preprocessing as scripts/model.py."""
+    X = pd.DataFrame(
+        {
+            "sleep_duration": [7.5, 6.0, 8.0, 5.5, 7.0, 6.5],
+            "sleep_quality": [8, 6, 9, 5, 7, 6],
+            "sleep_disorder": [
+                "No Disorder",
+                "Insomnia",
+                "No Disorder",
+                "Sleep Apnea",
+                "No Disorder",
+                "Insomnia",
+            ],
+        }
+    )
+    y = pd.Series([4, 7, 3, 8, 5, 6])
+    preprocessor = make_column_transformer(
+        (StandardScaler(), ["sleep_duration"]),
+        (OneHotEncoder(), ["sleep_disorder"]),
+        remainder="passthrough",
+    )
+    return X, make_pipeline(preprocessor, Ridge()).fit(X, y)
+
+
+def test_linear_scorer_matches_pipeline(fitted_pipeline):
+    """The compiled scorer should reproduce the pipeline's predictions."""
+    X, pipeline = fitted_pipeline
+    scorer = LinearScorer.from_pipeline(pipeline)
+
+    predictions = scorer.predict_records(X.to_dict("records"))
+
+    np.testing.assert_allclose(predictions, pipeline.predict(X))
+
+
+def test_linear_scorer_unknown_category(fitted_pipeline):
+    """Unseen categories should raise a ValueError."""
+    X, pipeline = fitted_pipeline
+    record = dict(X.iloc[0], sleep_disorder="Narcolepsy")
+
+    with pytest.raises(ValueError, match="Unknown categories"):
+        LinearScorer.from_pipeline(pipeline).predict_records([record])
+
+
+def test_micro_batcher_coalesces_requests():
+    """Requests submitted together should be served in fewer batches."""
+    batcher = MicroBatcher(lambda recs: [r * 2 for r in recs], max_latency_ms=50)
+    futures = [batcher.submit([i]) for i in range(20)]
+
+    results = [f.result(timeout=5) for f in futures]
+    batcher.close()
+
+    assert results == [[i * 2] for i in range(20)]
+    assert batcher.batches < 20
+
+
+def test_server_round_trip(fitted_pipeline):
+    """Concurrent HTTP requests should get the pipeline's predictions."""
+    X, pipeline = fitted_pipeline
+    server = make_server(LinearScorer.from_pipeline(pipeline), port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def post(record):
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_port)
+        conn.request("POST", "/predict", body=json.dumps({"instances": [record]}))
+        response = conn.getresponse()
+        payload = json.loads(response.read())
+        conn.close()
+        return response.status, payload
+
+    try:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            responses = list(pool.map(post, X.to_dict("records")))
+        bad_status, _ = post({"sleep_duration": 7.0})
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.batcher.close()
+
+    predictions = [payload["predictions"][0] for _, payload in responses]
+    assert all(status == 200 for status, _ in responses)
+    np.testing.assert_allclose(predictions, pipeline.predict(X))
+    assert bad_status == 400
+
+
+def test_micro_batcher_survives_bad_request():
+    """A request that breaks batching should fail alone, not the worker."""
+    batcher = MicroBatcher(lambda recs: [r * 2 for r in recs])
+    bad = batcher.submit(5)
+
+    with pytest.raises(TypeError):
+        bad.result(timeout=5)
+    assert batcher.submit([3]).result(timeout=5) == [6]
+    batcher.close()
+
+
+def test_server_rejects_malformed_payloads(fitted_pipeline):
+    """Malformed payloads should get a 400 and leave the server serving."""
+    X, pipeline = fitted_pipeline
+    server = make_server(LinearScorer.from_pipeline(pipeline), port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def post(payload):
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+        conn.request("POST", "/predict", body=json.dumps(payload))
+        response = conn.getresponse()
+        body = json.loads(response.read())
+        conn.close()
+        return response.status, body
+
+    def post_raw(body, length):
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+        conn.putrequest("POST", "/predict")
+        conn.putheader("Content-Length", str(length))
+        conn.endheaders(body)
+        response = conn.getresponse()
+        response.read()
+        conn.close()
+        return response.status
+
+    missing = dict(X.iloc[0], sleep_quality=None)
+    huge = json.dumps({"instances": [dict(X.iloc[0].to_dict(), sleep_quality=0)]})
+    huge = huge.replace('"sleep_quality": 0', '"sleep_quality": 1' + "0" * 400)
+    try:
+        statuses = [
+            post(payload)[0]
+            for payload in [
+                {"instances": 5},
+                {"instances": None},
+                {"instances": [1, 2]},
+                {"instances": [missing]},
+            ]
+        ]
+        statuses.append(post_raw(huge.encode(), len(huge)))
+        statuses.append(post_raw(b"{}", -1))
+        status, body = post({"instances": [X.iloc[0].to_dict()]})
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.batcher.close()
+
+    assert statuses == [400] * 6
+    assert status == 200
+    np.testing.assert_allclose(body["predictions"], pipeline.predict(X.iloc[:1]))
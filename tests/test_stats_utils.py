@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+from pathlib import Path
+from scipy import stats
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.stats_utils import (
+    SleepStats,
+    binned_kde,
+    evaluate_kde,
+    kde_from_counts,
+)
+
+BUNDLED_DATA = ROOT_DIR / "data" / "processed" / "sleep_data_clean.csv"
+
+
+@pytest.fixture
+def clean_df():
+    """Provides a cleaned-looking dataframe with repeated values."""
+    rng = np.random.default_rng(0)
+    n = 200
+    return pd.DataFrame(
+        {
+            "sleep_duration": rng.choice([5.5, 6.0, 6.5, 7.0, 7.5, 8.0], n),
+            "sleep_quality": rng.integers(4, 10, n),
+            "sleep_disorder": rng.choice(["No Disorder", "Insomnia", "Sleep Apnea"], n),
+            "stress_level": rng.integers(3, 9, n),
+        }
+    )
+
+
+def test_merge_matches_whole_frame(clean_df):
+    """Statistics merged across chunks equal those of the whole frame."""
+    whole = SleepStats.from_frame(clean_df)
+    merged = SleepStats()
+    for start in range(0, len(clean_df), 37):
+        merged.update(clean_df.iloc[start : start + 37])
+
+    assert merged.n == whole.n
+    np.testing.assert_allclose(merged.mean, whole.mean)
+    np.testing.assert_allclose(merged.comoment, whole.comoment)
+    pd.testing.assert_series_equal(
+        merged.pair_counts["sleep_duration"].sort_index(),
+        whole.pair_counts["sleep_duration"].sort_index(),
+    )
+    pd.testing.assert_series_equal(
+        merged.stress_histogram("Insomnia").sort_index(),
+        whole.stress_histogram("Insomnia").sort_index(),
+    )
+    assert merged.disorders() == list(clean_df["sleep_disorder"].unique())
+
+
+def test_linregress_matches_scipy(clean_df):
+    """Regression from the co-moments matches scipy.stats.linregress."""
+    result = SleepStats.from_frame(clean_df).linregress("sleep_quality", "stress_level")
+    expected = stats.linregress(clean_df["sleep_quality"], clean_df["stress_level"])
+
+    assert result.slope == pytest.approx(expected.slope)
+    assert result.intercept == pytest.approx(expected.intercept)
+    assert result.rvalue == pytest.approx(expected.rvalue)
+    assert result.pvalue == pytest.approx(expected.pvalue)
+    assert result.stderr == pytest.approx(expected.stderr)
+
+
+def test_linregress_constant_x():
+    """A constant regressor raises a ValueError."""
+    df = pd.DataFrame(
+        {
+            "sleep_duration": [7.0, 7.0, 7.0],
+            "sleep_quality": [6, 7, 8],
+            "sleep_disorder": ["Insomnia"] * 3,
+            "stress_level": [3, 4, 5],
+        }
+    )
+    with pytest.raises(ValueError):
+        SleepStats.from_frame(df).linregress("sleep_duration", "stress_level")
+
+
+def test_kde_from_counts_matches_gaussian_kde(clean_df):
+    """The weighted KDE of distinct values equals gaussian_kde on all rows."""
+    hist = clean_df["stress_level"].value_counts().sort_index()
+    grid = np.linspace(2, 10, 50)
+
+    result = kde_from_counts(hist.index, hist.to_numpy(), grid)
+    expected = stats.gaussian_kde(clean_df["stress_level"])(grid)
+
+    np.testing.assert_allclose(result, expected, rtol=1e-10)
+
+
+@pytest.mark.parametrize("gridsize", [100, 200, 400])
+def test_binned_kde_accuracy_on_bundled_data(gridsize):
+    """The binned KDE of the bundled stress levels is close to the exact one."""
+    stress = pd.read_csv(BUNDLED_DATA)["stress_level"]
+    hist = stress.value_counts().sort_index()
+    grid = np.linspace(hist.index.min() - 1, hist.index.max() + 1, gridsize)
+
+    exact = kde_from_counts(hist.index, hist.to_numpy(), grid)
+    binned = binned_kde(hist.index, hist.to_numpy(), grid)
+
+    # The binning error decreases with the square of the grid spacing
+    step = grid[1] - grid[0]
+    assert np.abs(binned - exact).max() / exact.max() < step**2
+    assert binned.sum() * step == pytest.approx(exact.sum() * step, rel=1e-3)
+
+
+def test_binned_kde_bad_grid():
+    """Binned KDE rejects uneven grids and grids not covering the data."""
+    with pytest.raises(ValueError):
+        binned_kde([1, 2], [3, 4], [0.0, 1.0, 3.0])
+    with pytest.raises(ValueError):
+        binned_kde([1, 5], [3, 4], np.linspace(0, 3, 10))
+
+
+def test_evaluate_kde_unknown_method():
+    """An unknown KDE method raises a ValueError."""
+    with pytest.raises(ValueError):
+        evaluate_kde([1, 2], [3, 4], np.linspace(0, 3, 10), method="fft")
@@ -0,0 +1,102 @@
+"""
+Tests for src/synth_utils.py - synthetic raw data generator
+
+some of the tests performed in this file are:
+- Test good input: generated data has the columns and dtypes of the raw file.
+- Test good input: values stay within the ranges and categories of the raw file.
+- Test good input: the same seed gives the same data.
+- Test good input: the generated data goes through clean_sleep_data.
+- Test good input: the chunked writer writes every row once, with one header.
+- Test edge case: zero rows.
+"""
+
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+
+# Add project root to path
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.clean_utils import clean_sleep_data
+from src.synth_utils import RAW_COLUMNS, generate_sleep_data, write_sleep_data
+
+RAW_FILE = ROOT_DIR / "data" / "raw" / "sleep_data_raw.csv"
+
+
+@pytest.fixture(scope="module")
+def synthetic():
+    return generate_sleep_data(20_000, random_state=1)
+
+
+def test_schema(synthetic):
+    assert list(synthetic.columns) == RAW_COLUMNS
+    assert len(synthetic) == 20_000
+    assert synthetic["Person ID"].tolist() == list(range(1, 20_001))
+    if RAW_FILE.exists():
+        raw = pd.read_csv(RAW_FILE)
+        assert list(raw.columns) == RAW_COLUMNS
+        assert synthetic.dtypes.equals(raw.dtypes)
+
+
+def test_values_match_raw_ranges(synthetic):
+    assert set(synthetic["Gender"]) == {"Male", "Female"}
+    assert set(synthetic["Stress Level"]) <= set(range(3, 9))
+    assert set(synthetic["Quality of Sleep"]) <= set(range(4, 10))
+    assert synthetic["Sleep Duration"].between(5.8, 8.5).all()
+    assert synthetic["Daily Steps"].between(3000, 10000).all()
+    assert (synthetic["Daily Steps"] % 100 == 0).all()
+    assert set(synthetic["Sleep Disorder"].dropna()) == {"Insomnia", "Sleep Apnea"}
+    assert synthetic["Sleep Disorder"].isna().mean() == pytest.approx(0.585, abs=0.02)
+
+    pressure = synthetic["Blood Pressure"].str.split("/", expand=True).astype(int)
+    assert pressure[0].between(115, 142).all()
+    assert pressure[1].between(75, 95).all()
+
+
+def test_relationships(synthetic):
+    corr = synthetic[["Sleep Duration", "Quality of Sleep", "Stress Level"]].corr()
+    assert corr.loc["Stress Level", "Sleep Duration"] < -0.7
+    assert corr.loc["Stress Level", "Quality of Sleep"] < -0.7
+
+    # Sleep apnea and insomnia are concentrated in overweight and obese people
+    disorder = synthetic["Sleep Disorder"].notna().groupby(synthetic["BMI Category"])
+    assert disorder.mean()["Overweight"] > 0.8
+    assert disorder.mean()["Normal"] < 0.1
+
+
+def test_seed_is_reproducible():
+    pd.testing.assert_frame_equal(
+        generate_sleep_data(100, random_state=3),
+        generate_sleep_data(100, random_state=3),
+    )
+    assert not generate_sleep_data(100, random_state=3).equals(
+        generate_sleep_data(100, random_state=4)
+    )
+
+
+def test_cleans_like_raw_data(synthetic):
+    clean = clean_sleep_data(synthetic)
+    assert len(clean) == len(synthetic)
+    assert set(clean["sleep_disorder"]) == {"No Disorder", "Insomnia", "Sleep Apnea"}
+    assert clean["train"].mean() == pytest.approx(0.8, abs=0.01)
+
+
+def test_write_sleep_data_chunks(tmp_path):
+    path = tmp_path / "raw.csv"
+    assert write_sleep_data(str(path), 2_500, chunksize=1_000) == 2_500
+
+    df = pd.read_csv(path)
+    assert list(df.columns) == RAW_COLUMNS
+    assert len(df) == 2_500
+    np.testing.assert_array_equal(df["Person ID"], np.arange(1, 2_501))
+
+
+def test_zero_rows(tmp_path):
+    assert len(generate_sleep_data(0)) == 0
+    path = tmp_path / "empty.csv"
+    assert write_sleep_data(str(path), 0) == 0
+    assert list(pd.read_csv(path).columns) == RAW_COLUMNS